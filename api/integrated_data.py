@@ -1,8 +1,9 @@
 from flask import Response, request
 import json
 import os
-import gzip
 from datetime import datetime
+from services.response_artifacts import artifact_store, artifact_response
+from services.response_encoder import response_encoder, server_timing_header
 
 def handler(request):
     # 요약 데이터 요청인지 확인
@@ -25,39 +26,23 @@ def handler(request):
         }
         
     else:
-        # 전체 데이터
-        path = os.path.join('collected_data', 'all_cities_integrated_data.json')
-        if not os.path.exists(path):
+        # 전체 데이터: 미리 직렬화/압축된 아티팩트를 그대로 전송 (If-None-Match 일치 시 304)
+        artifact = artifact_store.get('all_cities_integrated')
+        if artifact is None:
             return Response(json.dumps({'error': 'not_found'}), status=404, mimetype='application/json')
         
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        response_data = {
-            'status': 'success',
-            'data': data,
-            'type': 'full',
-            'metadata': {
-                'collection_date': '2025-08-11 17:40:25',
-                'total_cities': len(data),
-                'data_size_mb': round(os.path.getsize(path) / (1024 * 1024), 2)
-            }
-        }
+        return artifact_response(artifact, request)
     
-    # Gzip 압축 응답 (데이터 크기 대폭 감소)
-    json_data = json.dumps(response_data, ensure_ascii=False)
-    original_size = len(json_data.encode('utf-8'))
-    gzip_data = gzip.compress(json_data.encode('utf-8'))
-    compressed_size = len(gzip_data)
-    compression_ratio = (1 - compressed_size / original_size) * 100
+    # Gzip 압축 응답 (데이터 크기 대폭 감소, 1회 직렬화)
+    gzip_data, timings = response_encoder.encode(response_data)
+    compression_ratio = (1 - timings['compressed_bytes'] / timings['raw_bytes']) * 100
     
-    print(f"📊 Gzip 압축 효과: {original_size / 1024 / 1024:.2f}MB → {compressed_size / 1024 / 1024:.2f}MB ({compression_ratio:.1f}% 압축)")
+    print(f"📊 Gzip 압축 효과: {timings['raw_bytes'] / 1024 / 1024:.2f}MB → {timings['compressed_bytes'] / 1024 / 1024:.2f}MB ({compression_ratio:.1f}% 압축)")
     
     response = Response(gzip_data, mimetype='application/json')
     response.headers['Content-Encoding'] = 'gzip'
     response.headers['Content-Length'] = len(gzip_data)
     response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Server-Timing'] = server_timing_header(timings)
     
     return response
-
-
@@ -1,12 +1,14 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-import sqlite3
 import json
-import gzip
+import time
+import zlib
 from datetime import datetime, timedelta
 import os
 import urllib.parse
 from database.models import init_db
+from database import aggregates, queries
+from database.connection import get_connection
 from crawlers.public_data_crawler import PublicDataCrawler
 
 # 선택적 의존성(셀레니움 등)에 의존하는 크롤러는 지연/옵션 임포트로 처리
@@ -27,121 +29,92 @@ try:
 except Exception:
     WebScraper = None
 from services.region_service import RegionService
+from services.dataset_cache import dataset_cache
+from services.response_artifacts import artifact_store, artifact_response
+from services.response_encoder import response_encoder, server_timing_header, GZIP_WBITS
+from services.row_index import RowIndex, encode_cursor, decode_cursor
+from services.region_snapshot import region_snapshot_store, gzip_bundle, iter_chunks
 
 # Gzip 압축 헬퍼 함수
 def create_gzipped_response(data, status_code=200):
-    """Gzip 압축된 JSON 응답 생성"""
-    json_data = json.dumps(data, ensure_ascii=False)
-    gzip_data = gzip.compress(json_data.encode('utf-8'))
+    """Gzip 압축된 JSON 응답 생성 (1회 직렬화 + 청크 압축)"""
+    gzip_data, timings = response_encoder.encode(data)
     
-    response = jsonify(data)
+    response = Response(gzip_data, status=status_code, mimetype='application/json')
     response.headers['Content-Encoding'] = 'gzip'
     response.headers['Content-Length'] = len(gzip_data)
     response.headers['Vary'] = 'Accept-Encoding'
-    response.status_code = status_code
+    response.headers['Server-Timing'] = server_timing_header(timings)
     
-    # Flask의 jsonify와 gzip을 함께 사용하기 위한 처리
-    response.data = gzip_data
-    response.mimetype = 'application/json'
+    return response
+
+# 스트리밍 응답 헬퍼 함수
+def wants_streaming():
+    """?stream=1 요청 여부 (대용량 지역별 응답을 청크 단위로 전송)"""
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+def create_streaming_response(head, key, items, tail=None):
+    """지역 단위로 직렬화/압축하며 전송하는 chunked JSON 응답 생성"""
+    chunks = response_encoder.iter_envelope(head, key, items, tail)
+    headers = {'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+        chunks = response_encoder.gzip_stream(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(chunks), mimetype='application/json', headers=headers)
+
+# 지역 스냅샷 응답 헬퍼 함수
+def create_region_slice_response(snapshot, region, head, tail):
+    """mmap 스냅샷의 지역 JSON 구간을 파싱 없이 head/tail 필드로 감싼 응답 생성
+
+    지역 구간은 mmap에서 청크 단위로 바로 전송 (구간 전체를 메모리로 복사하지 않음)
+    """
+    prefix = b'{' + response_encoder.fields(head) + b',"data":'
+    suffix = b',' + response_encoder.fields(tail) + b'}'
     
+    response = Response(iter_chunks([prefix, snapshot.region_bytes(region), suffix]), mimetype='application/json')
+    response.headers['Content-Length'] = len(prefix) + snapshot.region_length(region) + len(suffix)
     return response
 
 # 저장된 데이터 로드 함수
-def load_saved_busan_data():
-    """저장된 부산 데이터 로드"""
+DATA_DIR = "collected_data"
+
+def load_saved_json(filename, label):
+    """collected_data/ 의 JSON 파일 로드 (프로세스 전역 데이터셋 캐시 사용)
+
+    반환 객체는 요청 간에 공유되므로 수정하지 말 것
+    """
     try:
-        data_dir = "collected_data"
-        all_data_filename = f"{data_dir}/busan_all_data.json"
-        
-        if os.path.exists(all_data_filename):
-            with open(all_data_filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            print("저장된 부산 데이터가 없습니다.")
-            return None
+        data = dataset_cache.get(os.path.join(DATA_DIR, filename))
+        if data is None:
+            print(f"저장된 {label} 데이터가 없습니다.")
+        return data
     except Exception as e:
-        print(f"데이터 로드 오류: {e}")
+        print(f"{label} 데이터 로드 오류: {e}")
         return None
 
+def load_saved_busan_data():
+    """저장된 부산 데이터 로드"""
+    return load_saved_json('busan_all_data.json', '부산')
+
 def load_saved_busan_incheon_seoul_data():
     """저장된 부산+인천+서울 데이터 로드"""
-    try:
-        data_dir = "collected_data"
-        all_data_filename = f"{data_dir}/busan_incheon_seoul_all_data.json"
-        
-        if os.path.exists(all_data_filename):
-            with open(all_data_filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            print("저장된 부산+인천+서울 데이터가 없습니다.")
-            return None
-    except Exception as e:
-        print(f"데이터 로드 오류: {e}")
-        return None
+    return load_saved_json('busan_incheon_seoul_all_data.json', '부산+인천+서울')
 
 def load_saved_busan_incheon_seoul_daegu_data():
     """저장된 부산+인천+서울+대구 데이터 로드"""
-    try:
-        data_dir = "collected_data"
-        all_data_filename = f"{data_dir}/busan_incheon_seoul_daegu_all_data.json"
-        
-        if os.path.exists(all_data_filename):
-            with open(all_data_filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            print("저장된 부산+인천+서울+대구 데이터가 없습니다.")
-            return None
-    except Exception as e:
-        print(f"데이터 로드 오류: {e}")
-        return None
+    return load_saved_json('busan_incheon_seoul_daegu_all_data.json', '부산+인천+서울+대구')
 
 def load_saved_busan_incheon_seoul_daegu_bucheon_data():
     """저장된 부산+인천+서울+대구+부천 데이터 로드"""
-    try:
-        data_dir = "collected_data"
-        all_data_filename = f"{data_dir}/busan_incheon_seoul_daegu_bucheon_all_data.json"
-        
-        if os.path.exists(all_data_filename):
-            with open(all_data_filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            print("저장된 부산+인천+서울+대구+부천 데이터가 없습니다.")
-            return None
-    except Exception as e:
-        print(f"데이터 로드 오류: {e}")
-        return None
+    return load_saved_json('busan_incheon_seoul_daegu_bucheon_all_data.json', '부산+인천+서울+대구+부천')
 
 def load_saved_seongnam_data():
     """저장된 성남시 데이터 로드"""
-    try:
-        data_dir = "collected_data"
-        all_data_filename = f"{data_dir}/seongnam_all_data.json"
-        
-        if os.path.exists(all_data_filename):
-            with open(all_data_filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            print("저장된 성남시 데이터가 없습니다.")
-            return None
-    except Exception as e:
-        print(f"데이터 로드 오류: {e}")
-        return None
+    return load_saved_json('seongnam_all_data.json', '성남시')
 
 def load_saved_guri_data():
     """저장된 구리시 데이터 로드"""
-    try:
-        data_dir = "collected_data"
-        all_data_filename = f"{data_dir}/guri_all_data.json"
-        
-        if os.path.exists(all_data_filename):
-            with open(all_data_filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            print("저장된 구리시 데이터가 없습니다.")
-            return None
-    except Exception as e:
-        print(f"데이터 로드 오류: {e}")
-        return None
+    return load_saved_json('guri_all_data.json', '구리시')
 
 app = Flask(__name__)
 CORS(app)
@@ -157,6 +130,11 @@ def health_check():
     """서버 상태 확인"""
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """데이터셋 캐시 hit/miss/reload 통계"""
+    return jsonify(dataset_cache.stats())
+
 @app.route('/api/busan-data', methods=['GET'])
 def get_busan_data():
     """저장된 부산 전체 구 데이터 조회"""
@@ -183,7 +161,17 @@ def get_busan_data():
 def get_busan_region_data(region):
     """특정 부산 구/군 데이터 조회"""
     try:
-        data = load_saved_busan_data()
+        # 전체 파일을 파싱하지 않고 지역 스냅샷에서 해당 구간만 전송
+        snapshot = region_snapshot_store.get('busan')
+        if snapshot is not None and region in snapshot:
+            return create_region_slice_response(
+                snapshot, region,
+                {'status': 'success', 'region': region},
+                {'transaction_count': snapshot.transaction_count(region)}
+            )
+        
+        # 빌드된 스냅샷이 없으면 원본 파일에서 조회
+        data = load_saved_busan_data() if snapshot is None else None
         if data and region in data:
             return jsonify({
                 'status': 'success',
@@ -250,14 +238,10 @@ def get_busan_incheon_seoul_daegu_data():
 def get_busan_incheon_seoul_daegu_bucheon_data():
     """저장된 부산+인천+서울+대구+부천 전체 구 데이터 조회"""
     try:
-        data = load_saved_busan_incheon_seoul_daegu_bucheon_data()
-        if data:
-            response_data = {
-                'status': 'success',
-                'data': data,
-                'message': '저장된 부산+인천+서울+대구+부천 데이터를 성공적으로 로드했습니다.'
-            }
-            return create_gzipped_response(response_data)
+        # 미리 직렬화/압축된 아티팩트를 그대로 전송 (If-None-Match 일치 시 304)
+        artifact = artifact_store.get('busan_incheon_seoul_daegu_bucheon')
+        if artifact:
+            return artifact_response(artifact, request)
         else:
             error_data = {
                 'status': 'error',
@@ -319,24 +303,30 @@ def get_guri_data():
 def get_all_cities_data():
     """저장된 모든 도시 데이터 조회 (부산+인천+서울+대구+부천+성남+구리)"""
     try:
+        # 캐시된 데이터는 공유 객체이므로 새 dict에 병합
+        base_data = {}
+        
         # 기존 통합 데이터 로드
-        base_data = load_saved_busan_incheon_seoul_daegu_bucheon_data()
+        combined_data = load_saved_busan_incheon_seoul_daegu_bucheon_data()
+        if combined_data:
+            base_data.update(combined_data)
         
         # 성남시 데이터 추가
         seongnam_data = load_saved_seongnam_data()
         if seongnam_data:
-            if base_data is None:
-                base_data = {}
             base_data.update(seongnam_data)
         
         # 구리시 데이터 추가
         guri_data = load_saved_guri_data()
         if guri_data:
-            if base_data is None:
-                base_data = {}
             base_data.update(guri_data)
         
         if base_data:
+            if wants_streaming():
+                return create_streaming_response(
+                    {'status': 'success'}, 'data', base_data.items(),
+                    {'message': '저장된 모든 도시 데이터를 성공적으로 로드했습니다.'}
+                )
             return jsonify({
                 'status': 'success',
                 'data': base_data,
@@ -355,19 +345,7 @@ def get_all_cities_data():
 
 def load_saved_integrated_data():
     """저장된 통합 데이터 로드"""
-    try:
-        data_dir = "collected_data"
-        all_data_filename = f"{data_dir}/all_cities_integrated_data.json"
-        
-        if os.path.exists(all_data_filename):
-            with open(all_data_filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            print("저장된 통합 데이터가 없습니다.")
-            return None
-    except Exception as e:
-        print(f"통합 데이터 로드 오류: {e}")
-        return None
+    return load_saved_json('all_cities_integrated_data.json', '통합')
 
 @app.route('/api/seoul-district-data', methods=['GET'])
 def get_seoul_district_data():
@@ -380,27 +358,32 @@ def get_seoul_district_data():
                 'message': '구 이름을 지정해주세요'
             }), 400
         
-        # 서울시 구 데이터 파일 경로
-        file_path = os.path.join('collected_data', f'서울_{district}_data.json')
+        # 서울시 구별 파일을 묶은 지역 스냅샷에서 해당 구 구간만 전송
+        snapshot = region_snapshot_store.get('seoul_districts')
+        if snapshot is not None and district in snapshot:
+            return create_region_slice_response(
+                snapshot, district,
+                {'status': 'success'},
+                {'district': district, 'transaction_count': snapshot.transaction_count(district)}
+            )
         
+        # 스냅샷이 없거나 스냅샷에 없는 구는 해당 구 파일 하나만 읽음
+        file_path = os.path.join('collected_data', f'서울_{district}_data.json')
         if not os.path.exists(file_path):
             return jsonify({
                 'status': 'error',
                 'message': f'서울 {district} 데이터가 없습니다 (경로: {file_path})'
             }), 404
         
-        # 데이터 로드
         with open(file_path, 'r', encoding='utf-8') as f:
             district_data = json.load(f)
         
-        response_data = {
+        return jsonify({
             'status': 'success',
             'data': district_data,
             'district': district,
             'transaction_count': len(district_data) if isinstance(district_data, list) else 0
-        }
-        
-        return jsonify(response_data)
+        })
         
     except Exception as e:
         return jsonify({
@@ -485,6 +468,11 @@ def get_integrated_data():
     try:
         data = load_saved_integrated_data()
         if data:
+            if wants_streaming():
+                return create_streaming_response(
+                    {'status': 'success', 'metadata': data['metadata']}, 'data', data['data'].items(),
+                    {'message': '저장된 통합 데이터를 성공적으로 로드했습니다.'}
+                )
             return jsonify({
                 'status': 'success',
                 'data': data['data'],
@@ -504,38 +492,153 @@ def get_integrated_data():
 
 @app.route('/api/integrated-data-chunked', methods=['GET'])
 def get_integrated_data_chunked():
-    """청크 단위로 통합 데이터 제공 (성능 향상)"""
+    """청크 단위로 통합 데이터 제공 (스냅샷별 행 인덱스 + 커서 페이지네이션)"""
     try:
-        chunk_size = request.args.get('chunk_size', 1000, type=int)
-        page = request.args.get('page', 0, type=int)
+        chunk_size = max(1, min(request.args.get('chunk_size', 1000, type=int), 10000))
+        cursor = request.args.get('cursor', '')
         
-        data = load_saved_integrated_data()
-        if not data:
+        if cursor:
+            try:
+                position = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({'status': 'error', 'message': str(e)}), 400
+        else:
+            # 커서 없이 요청하면 기존 page 파라미터 사용
+            page = request.args.get('page', 0, type=int)
+            position = {
+                'version': None,
+                'offset': max(page, 0) * chunk_size,
+                'region': request.args.get('region', ''),
+                'start_date': request.args.get('start_date', ''),
+                'end_date': request.args.get('end_date', '')
+            }
+        
+        row_index, version = dataset_cache.get_derived(
+            os.path.join(DATA_DIR, 'all_cities_integrated_data.json'),
+            'row_index',
+            lambda data: RowIndex(data.get('data', {}))
+        )
+        if row_index is None:
             return jsonify({'status': 'error', 'message': '데이터 없음'}), 404
         
-        # 데이터를 청크로 분할
-        all_items = []
-        for region_data in data['data'].values():
-            if isinstance(region_data, list):
-                all_items.extend(region_data)
+        if position['version'] and position['version'] != version:
+            return jsonify({
+                'status': 'error',
+                'message': '통합 데이터가 갱신되었습니다. 처음 페이지부터 다시 요청해주세요.',
+                'snapshot_version': version
+            }), 409
+        
+        region = position['region'] or None
+        if region and not row_index.has_region(region):
+            return jsonify({'status': 'error', 'message': f'{region} 데이터를 찾을 수 없습니다.'}), 404
         
-        start_idx = page * chunk_size
-        end_idx = start_idx + chunk_size
-        chunk_data = all_items[start_idx:end_idx]
+        offset = max(position['offset'], 0)
+        filters = {
+            'region': region,
+            'start_date': position['start_date'],
+            'end_date': position['end_date']
+        }
+        total_items = row_index.count(**filters)
+        chunk_data = row_index.page(offset, chunk_size, **filters)
+        next_offset = offset + len(chunk_data)
+        has_more = next_offset < total_items
         
         return jsonify({
             'status': 'success',
             'data': chunk_data,
             'pagination': {
-                'page': page,
+                'page': offset // chunk_size,
                 'chunk_size': chunk_size,
-                'total_items': len(all_items),
-                'has_more': end_idx < len(all_items)
+                'total_items': total_items,
+                'has_more': has_more,
+                'next_cursor': encode_cursor(
+                    version, next_offset, position['region'],
+                    position['start_date'], position['end_date']
+                ) if has_more else None,
+                'snapshot_version': version
             }
         })
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def create_regions_bundle_from_source(requested):
+    """빌드된 멤버 스냅샷이 없을 때 통합 데이터에서 지역 조합 응답을 조립해 압축"""
+    integrated = load_saved_integrated_data()
+    if not integrated:
+        return jsonify({'status': 'error', 'message': '저장된 통합 데이터가 없습니다. 먼저 데이터를 수집해주세요.'}), 404
+    
+    data = integrated.get('data', {})
+    regions = [name for name in requested if name in data]
+    missing = [name for name in requested if name not in data]
+    if not regions:
+        return jsonify({
+            'status': 'error',
+            'message': '요청한 지역의 데이터가 없습니다.',
+            'missing_regions': missing
+        }), 404
+    
+    return create_gzipped_response({
+        'status': 'success',
+        'data': {name: data[name] for name in regions},
+        'regions': regions,
+        'missing_regions': missing,
+        'transaction_count': sum(len(data[name]) for name in regions if isinstance(data[name], list))
+    })
+
+@app.route('/api/regions-bundle', methods=['GET'])
+def get_regions_bundle():
+    """요청한 지역 조합의 통합 데이터 (지역별 gzip 멤버를 이어 붙여 재압축 없이 응답)"""
+    try:
+        # ?regions=서울 강남구,부산 해운대구 또는 regions 파라미터 반복
+        requested = []
+        for value in request.args.getlist('regions'):
+            for name in value.split(','):
+                name = name.strip()
+                if name and name not in requested:
+                    requested.append(name)
+        
+        if not requested:
+            return jsonify({'status': 'error', 'message': '지역을 지정해주세요 (regions 파라미터)'}), 400
+        
+        snapshot = region_snapshot_store.get('integrated_members')
+        if snapshot is None:
+            return create_regions_bundle_from_source(requested)
+        
+        regions = [name for name in requested if name in snapshot]
+        missing = [name for name in requested if name not in snapshot]
+        if not regions:
+            return jsonify({
+                'status': 'error',
+                'message': '요청한 지역의 데이터가 없습니다.',
+                'missing_regions': missing
+            }), 404
+        
+        length, members = gzip_bundle(
+            snapshot, regions,
+            {'status': 'success'},
+            {
+                'regions': regions,
+                'missing_regions': missing,
+                'transaction_count': sum(snapshot.transaction_count(name) for name in regions)
+            }
+        )
+        
+        if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+            # 지역 멤버는 mmap에서 청크 단위로 전송 (묶음 전체를 메모리에 모으지 않음)
+            response = Response(iter_chunks(members), mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Content-Length'] = length
+        else:
+            # gzip 미지원 클라이언트는 멤버별로 풀어서 전송
+            response = Response((zlib.decompress(member, GZIP_WBITS) for member in members), mimetype='application/json')
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'데이터 로드 중 오류가 발생했습니다: {str(e)}'
+        }), 500
+
 @app.route('/api/busan-summary', methods=['GET'])
 def get_busan_summary():
     """부산 전체 구 데이터 요약 정보"""
@@ -601,12 +704,11 @@ def get_regions():
     """사용 가능한 시군구 목록 (지역 서비스 기반)"""
     try:
         # 먼저 DB에서 실제 데이터가 있는 지역들을 조회
-        conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/tmp/realstate.db'))
+        conn = get_connection(readonly=True)
         cursor = conn.cursor()
         
-        cursor.execute('SELECT DISTINCT region_name FROM transactions ORDER BY region_name')
+        cursor.execute(*queries.regions_query())
         db_regions = [row[0] for row in cursor.fetchall()]
-        conn.close()
         
         # 지역 서비스에서 지원하는 지역 목록과 교집합
         supported_regions = region_service.get_regions_for_api()
@@ -674,43 +776,39 @@ def validate_regions():
         print(f"Error in validate_regions: {str(e)}")
         return jsonify({'valid': False, 'error': str(e)}), 500
 
+# /api/transactions 숫자 필터 (파라미터 -> 변환 함수)
+TRANSACTION_NUMERIC_FILTERS = {
+    'min_area': float,
+    'max_area': float,
+    'min_floor': int,
+    'max_floor': int,
+    'limit': int
+}
+
 @app.route('/api/transactions', methods=['GET'])
 def get_transactions():
-    """거래 데이터 조회"""
+    """거래 데이터 조회 (면적/층 범위, 법정동, 건수 제한은 SQL에서 적용)"""
     region = request.args.get('region', '')
     start_date = request.args.get('start_date', '')
     end_date = request.args.get('end_date', '')
+    dong = request.args.get('dong', '')
     
-    conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/tmp/realstate.db'))
-    cursor = conn.cursor()
-    
-    query = '''
-        SELECT 
-            t.date,
-            t.region_name,
-            t.complex_name,
-            t.transaction_count,
-            t.avg_price,
-            t.source
-        FROM transactions t
-        WHERE 1=1
-    '''
-    params = []
-    
-    if region:
-        query += ' AND t.region_name = ?'
-        params.append(region)
-    
-    if start_date:
-        query += ' AND t.date >= ?'
-        params.append(start_date)
+    filters = {}
+    for name, convert in TRANSACTION_NUMERIC_FILTERS.items():
+        value = request.args.get(name, '')
+        if value == '':
+            continue
+        try:
+            filters[name] = convert(value)
+        except ValueError:
+            return jsonify({'status': 'error', 'message': f'{name} 파라미터가 숫자가 아닙니다: {value}'}), 400
+    if filters.get('limit', 1) < 1:
+        return jsonify({'status': 'error', 'message': 'limit은 1 이상이어야 합니다'}), 400
     
-    if end_date:
-        query += ' AND t.date <= ?'
-        params.append(end_date)
-    
-    query += ' ORDER BY t.date DESC'
+    conn = get_connection(readonly=True)
+    cursor = conn.cursor()
     
+    query, params = queries.transactions_query(region, start_date, end_date, dong=dong, **filters)
     cursor.execute(query, params)
     transactions = []
     
@@ -721,10 +819,13 @@ def get_transactions():
             'complex_name': row[2],
             'transaction_count': row[3],
             'avg_price': row[4],
-            'source': row[5]
+            'source': row[5],
+            'area': row[6],
+            'floor': row[7],
+            'dong': row[8],
+            'jibun': row[9]
         })
     
-    conn.close()
     return jsonify(transactions)
 
 @app.route('/api/price-changes', methods=['GET'])
@@ -733,27 +834,10 @@ def get_price_changes():
     region = request.args.get('region', '')
     period = request.args.get('period', '30')  # 기본 30일
     
-    conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/tmp/realstate.db'))
+    conn = get_connection(readonly=True)
     cursor = conn.cursor()
     
-    query = '''
-        SELECT 
-            date,
-            region_name,
-            avg_price,
-            price_change_rate
-        FROM price_changes
-        WHERE 1=1
-    '''
-    params = []
-    
-    if region:
-        query += ' AND region_name = ?'
-        params.append(region)
-    
-    query += ' ORDER BY date DESC LIMIT ?'
-    params.append(int(period))
-    
+    query, params = queries.price_changes_query(region, int(period))
     cursor.execute(query, params)
     price_changes = []
     
@@ -765,7 +849,6 @@ def get_price_changes():
             'price_change_rate': row[3]
         })
     
-    conn.close()
     return jsonify(price_changes)
 
 @app.route('/api/crawl', methods=['POST'])
@@ -846,7 +929,8 @@ def start_crawling():
                     }
                 else:
                     molit_crawler = MolitAPICrawler()
-                    results = molit_crawler.crawl_all_regions(regions)
+                    # incremental: 저장되지 않았거나 신고 기한 안의 달만 호출
+                    results = molit_crawler.crawl_all_regions(regions, incremental=bool(data.get('incremental', False)))
                     all_results['molit_api'] = results
                 
             elif source == 'molit_web':
@@ -881,36 +965,17 @@ def get_statistics():
     """통계 데이터 조회"""
     region = request.args.get('region', '')
     
-    conn = sqlite3.connect('realstate.db')
+    conn = get_connection(readonly=True)
     cursor = conn.cursor()
     
-    # 전체 거래량
-    query = '''
-        SELECT 
-            COUNT(*) as total_transactions,
-            AVG(avg_price) as avg_price,
-            SUM(transaction_count) as total_count
-        FROM transactions
-        WHERE 1=1
-    '''
-    params = []
-    
-    if region:
-        query += ' AND region_name = ?'
-        params.append(region)
-    
-    cursor.execute(query, params)
+    # 전체 거래량 (지역별 집계 합산)
+    cursor.execute(*queries.statistics_query(region))
     stats = cursor.fetchone()
     
     # 최근 30일 가격변동률
-    cursor.execute('''
-        SELECT AVG(price_change_rate) 
-        FROM price_changes 
-        WHERE date >= date('now', '-30 days')
-    ''')
+    cursor.execute(*queries.recent_price_change_query())
     price_change = cursor.fetchone()[0] or 0
     
-    conn.close()
     
     return jsonify({
         'total_transactions': stats[0],
@@ -923,14 +988,10 @@ def get_statistics():
 def get_volume_rankings():
     """거래량 순위 조회"""
     try:
-        conn = sqlite3.connect('realstate.db')
-        cursor = conn.cursor()
+        # 적재 시 갱신되는 지역별 집계 테이블의 정렬 인덱스에서 상위 20건만 조회
+        rows = aggregates.get_volume_rankings(20)
         
-        # 간단한 쿼리로 테스트
-        cursor.execute('SELECT COUNT(*) FROM transactions')
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
+        if not rows:
             # 샘플 데이터 반환
             rankings = [
                 {
@@ -956,22 +1017,8 @@ def get_volume_rankings():
                 }
             ]
         else:
-            query = '''
-                SELECT 
-                    region_name,
-                    SUM(transaction_count) as total_volume,
-                    AVG(avg_price) as avg_price,
-                    COUNT(*) as transaction_count
-                FROM transactions
-                GROUP BY region_name
-                ORDER BY total_volume DESC
-                LIMIT 20
-            '''
-            
-            cursor.execute(query)
             rankings = []
-            
-            for i, row in enumerate(cursor.fetchall(), 1):
+            for i, row in enumerate(rows, 1):
                 rankings.append({
                     'rank': i,
                     'region_name': row[0],
@@ -980,7 +1027,6 @@ def get_volume_rankings():
                     'transaction_count': row[3]
                 })
         
-        conn.close()
         return jsonify(rankings)
         
     except Exception as e:
@@ -991,14 +1037,10 @@ def get_volume_rankings():
 def get_price_change_rankings():
     """가격변동률 순위 조회"""
     try:
-        conn = sqlite3.connect('realstate.db')
-        cursor = conn.cursor()
+        # 적재 시 갱신되는 지역별 집계 테이블의 정렬 인덱스에서 상위 20건만 조회
+        rows = aggregates.get_price_change_rankings(20)
         
-        # 간단한 쿼리로 테스트
-        cursor.execute('SELECT COUNT(*) FROM price_changes')
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
+        if not rows:
             # 샘플 데이터 반환
             rankings = [
                 {
@@ -1024,22 +1066,8 @@ def get_price_change_rankings():
                 }
             ]
         else:
-            query = '''
-                SELECT 
-                    region_name,
-                    AVG(price_change_rate) as avg_change_rate,
-                    MAX(avg_price) as max_price,
-                    MIN(avg_price) as min_price
-                FROM price_changes
-                GROUP BY region_name
-                ORDER BY avg_change_rate DESC
-                LIMIT 20
-            '''
-            
-            cursor.execute(query)
             rankings = []
-            
-            for i, row in enumerate(cursor.fetchall(), 1):
+            for i, row in enumerate(rows, 1):
                 rankings.append({
                     'rank': i,
                     'region_name': row[0],
@@ -1048,7 +1076,6 @@ def get_price_change_rankings():
                     'min_price': row[3]
                 })
         
-        conn.close()
         return jsonify(rankings)
         
     except Exception as e:
@@ -1059,14 +1086,10 @@ def get_price_change_rankings():
 def get_price_rankings():
     """평균 가격 순위 조회"""
     try:
-        conn = sqlite3.connect('realstate.db')
-        cursor = conn.cursor()
+        # 적재 시 갱신되는 지역별 집계 테이블의 정렬 인덱스에서 상위 20건만 조회
+        rows = aggregates.get_price_rankings(20)
         
-        # 간단한 쿼리로 테스트
-        cursor.execute('SELECT COUNT(*) FROM transactions')
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
+        if not rows:
             # 샘플 데이터 반환
             rankings = [
                 {
@@ -1092,22 +1115,8 @@ def get_price_rankings():
                 }
             ]
         else:
-            query = '''
-                SELECT 
-                    region_name,
-                    AVG(avg_price) as avg_price,
-                    SUM(transaction_count) as total_volume,
-                    COUNT(*) as transaction_count
-                FROM transactions
-                GROUP BY region_name
-                ORDER BY avg_price DESC
-                LIMIT 20
-            '''
-            
-            cursor.execute(query)
             rankings = []
-            
-            for i, row in enumerate(cursor.fetchall(), 1):
+            for i, row in enumerate(rows, 1):
                 rankings.append({
                     'rank': i,
                     'region_name': row[0],
@@ -1116,7 +1125,6 @@ def get_price_rankings():
                     'transaction_count': row[3]
                 })
         
-        conn.close()
         return jsonify(rankings)
         
     except Exception as e:
@@ -1125,65 +1133,16 @@ def get_price_rankings():
 
 @app.route('/api/market-overview', methods=['GET'])
 def get_market_overview():
-    """시장 개요 데이터"""
-    conn = sqlite3.connect('realstate.db')
-    cursor = conn.cursor()
-    
-    # 전체 거래량
-    cursor.execute('''
-        SELECT SUM(transaction_count) 
-        FROM transactions 
-        WHERE date >= date('now', '-30 days')
-    ''')
-    total_volume = cursor.fetchone()[0] or 0
-    
-    # 평균 가격
-    cursor.execute('''
-        SELECT AVG(avg_price) 
-        FROM transactions 
-        WHERE date >= date('now', '-30 days')
-    ''')
-    avg_price = cursor.fetchone()[0] or 0
-    
-    # 가격변동률
-    cursor.execute('''
-        SELECT AVG(price_change_rate) 
-        FROM price_changes 
-        WHERE date >= date('now', '-30 days')
-    ''')
-    price_change = cursor.fetchone()[0] or 0
-    
-    # 거래량 변화율 (최근 30일 vs 이전 30일)
-    cursor.execute('''
-        SELECT SUM(transaction_count) 
-        FROM transactions 
-        WHERE date >= date('now', '-60 days') AND date < date('now', '-30 days')
-    ''')
-    prev_volume = cursor.fetchone()[0] or 1  # 0으로 나누기 방지
-    
-    # 거래량 변화율 계산
-    if prev_volume > 0:
-        volume_change = ((total_volume - prev_volume) / prev_volume) * 100
-    else:
-        volume_change = 0
-    
-    # 거래 활성 지역 수
-    cursor.execute('''
-        SELECT COUNT(DISTINCT region_name) 
-        FROM transactions 
-        WHERE date >= date('now', '-30 days')
-    ''')
-    active_regions = cursor.fetchone()[0] or 0
-    
-    conn.close()
-    
-    return jsonify({
-        'total_volume': total_volume,
-        'avg_price': avg_price,
-        'price_change': price_change,
-        'volume_change': volume_change,
-        'active_regions': active_regions
-    })
+    """시장 개요 데이터 (일자×지역 집계에서 한 번의 쿼리로 계산, 다음 적재 전까지 캐시)"""
+    started = time.perf_counter()
+    overview, cache_hit = aggregates.get_market_overview()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    response = jsonify(overview)
+    response.headers['Server-Timing'] = (
+        f"overview;dur={elapsed_ms:.2f};desc=\"{'cache' if cache_hit else 'daily rollup'}\""
+    )
+    return response
 
 @app.route('/api/apartments/rankings', methods=['GET'])
 def get_apartment_rankings():
@@ -1195,61 +1154,16 @@ def get_apartment_rankings():
         
         print(f"아파트 순위 조회: region={region}, period={period}, month={month}")
         
-        conn = sqlite3.connect('realstate.db')
+        conn = get_connection(readonly=True)
         cursor = conn.cursor()
         
-        # 먼저 데이터가 있는지 확인
-        cursor.execute('SELECT COUNT(*) FROM transactions')
+        # 먼저 데이터가 있는지 확인 (지역별 집계 합산)
+        cursor.execute(*queries.statistics_query())
         total_count = cursor.fetchone()[0]
         print(f"총 거래 데이터: {total_count}건")
         
-        # 월별 필터 조건 설정
-        if month:
-            # 특정 월 데이터 조회
-            year = month[:4]
-            month_num = month[4:6]
-            date_filter = f"AND strftime('%Y%m', date) = '{month}'"
-        else:
-            # 기간 필터 적용
-            date_filter = f"AND date >= date('now', '-' || {period} || ' days')"
-        
-        if region:
-            # 특정 시군구의 아파트 순위
-            query = f'''
-                SELECT 
-                    complex_name,
-                    AVG(avg_price) as avg_price,
-                    COUNT(*) as transaction_count,
-                    0 as avg_area,
-                    0 as avg_floor,
-                    MAX(latest_transaction_date) as latest_transaction_date
-                FROM transactions
-                WHERE region_name = ? 
-                {date_filter}
-                GROUP BY complex_name
-                ORDER BY avg_price DESC
-                LIMIT 30
-            '''
-            cursor.execute(query, (region,))
-        else:
-            # 전체 아파트 순위
-            query = f'''
-                SELECT 
-                    region_name,
-                    complex_name,
-                    AVG(avg_price) as avg_price,
-                    COUNT(*) as transaction_count,
-                    0 as avg_area,
-                    0 as avg_floor,
-                    MAX(latest_transaction_date) as latest_transaction_date
-                FROM transactions
-                WHERE 1=1
-                {date_filter}
-                GROUP BY region_name, complex_name
-                ORDER BY avg_price DESC
-                LIMIT 30
-            '''
-            cursor.execute(query)
+        # 월별(YYYYMM) 또는 최근 기간 필터, 지역 유무에 따라 단지별 순위 쿼리 선택
+        cursor.execute(*queries.apartment_rankings_query(region, period, month))
         
         rows = cursor.fetchall()
         print(f"조회된 아파트 데이터: {len(rows)}건")
@@ -1284,7 +1198,6 @@ def get_apartment_rankings():
             except Exception as e:
                 print(f"행 처리 오류 (행 {i}): {str(e)}, 데이터: {row}")
         
-        conn.close()
         print(f"반환할 순위 데이터: {len(rankings)}건")
         return jsonify(rankings)
         
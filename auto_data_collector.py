@@ -19,6 +19,7 @@ sys.path.append(str(project_root))
 
 from crawlers.molit_api_crawler import MolitAPICrawler
 from services.region_service import RegionService
+from services.run_ledger import RunLedger
 
 # 로깅 설정
 def setup_logging():
@@ -52,6 +53,11 @@ def collect_monthly_data():
         crawler = MolitAPICrawler()
         region_service = RegionService()
         
+        # 페이지 단위 체크포인트 (중단된 실행은 끝나지 않은 작업만 다시 호출)
+        ledger = RunLedger()
+        run_id = ledger.open_run('monthly_automated')
+        crawler.use_ledger(ledger, run_id)
+        
         # 데이터 저장 디렉토리 (Cloudtype 볼륨 사용)
         data_dir = "/app/collected_data"
         if not os.path.exists(data_dir):
@@ -89,16 +95,17 @@ def collect_monthly_data():
         success_count = 0
         error_count = 0
         
-        # 각 도시별로 데이터 수집
+        # 전체 지역×월 작업을 한 번에 동시 수집 (최근 8개월, 호출 속도는 전역 속도 제한기가 조절)
+        all_regions = [r for regions in regions_to_collect.values() for r in regions]
+        collected = crawler.crawl_regions(all_regions, months=8)
+        
+        # 각 도시별로 결과 저장
         for city, city_regions in regions_to_collect.items():
-            logger.info(f"\n=== {city.upper()} 데이터 수집 시작 ===")
+            logger.info(f"\n=== {city.upper()} 데이터 저장 시작 ===")
             
             for region in city_regions:
                 try:
-                    logger.info(f"{region} 데이터 수집 중...")
-                    
-                    # 최근 2개월 데이터 수집 (months=8)
-                    data = crawler.crawl_region_data(region, months=8)
+                    data = collected[region]
                     
                     if data and len(data) > 0:
                         all_data[region] = data
@@ -124,10 +131,6 @@ def collect_monthly_data():
                     logger.error(f"{region} 데이터 수집 중 오류 발생: {e}")
                     all_data[region] = []
                     error_count += 1
-                
-                # API 호출 간격 조절 (1초)
-                import time
-                time.sleep(1)
         
         # 전체 데이터를 하나의 파일로 저장
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -170,6 +173,10 @@ def collect_monthly_data():
         logger.info(f"전체 데이터 파일: {all_data_filepath}")
         logger.info(f"요약 파일: {summary_filepath}")
         
+        # 저장까지 끝난 뒤에 실행 종료 처리 (실패 작업이 남으면 다음 실행이 이어서 수집)
+        ledger.finish_run(run_id)
+        logger.info(f"수집 원장: {ledger.summary(run_id)}")
+        
         return True
         
     except Exception as e:
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+SQLite 연결 방식 마이크로 벤치마크
+/api/transactions 요청을 요청마다 새로 connect 하는 방식과 스레드별 재사용 연결 방식으로 비교
+
+사용법: python bench_db_pool.py [요청 수] [행 수]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+
+def build_database(path, row_count):
+    """벤치마크용 거래 데이터 생성"""
+    from database.models import init_db
+
+    init_db()
+    regions = ['서울특별시 강남구', '서울특별시 서초구', '부산광역시 해운대구', '인천광역시 연수구', '대구광역시 수성구']
+    rows = []
+    for i in range(row_count):
+        month = random.randint(1, 12)
+        day = random.randint(1, 28)
+        date = f"2024-{month:02d}-{day:02d}"
+        rows.append((date, random.choice(regions), f"단지{i % 500}", random.randint(1, 5),
+                     random.uniform(20000, 150000), 'benchmark', date))
+
+    conn = sqlite3.connect(path)
+    conn.executemany('''
+        INSERT INTO transactions
+        (date, region_name, complex_name, transaction_count, avg_price, source, latest_transaction_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+
+
+def run(client, requests_count, urls):
+    """요청 반복 후 (총 소요 시간, 요청당 평균 ms) 반환"""
+    started = time.perf_counter()
+    for i in range(requests_count):
+        response = client.get(urls[i % len(urls)])
+        assert response.status_code == 200, response.status_code
+    elapsed = time.perf_counter() - started
+    return elapsed, elapsed / requests_count * 1000
+
+
+def main():
+    requests_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    row_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    workdir = tempfile.mkdtemp(prefix='bench_db_pool_')
+    db_path = os.path.join(workdir, 'bench.db')
+    os.environ['DATABASE_PATH'] = db_path
+
+    print(f"📦 벤치마크 DB 생성: {db_path} ({row_count:,}행)")
+    build_database(db_path, row_count)
+
+    import app as app_module
+    from database import connection
+
+    client = app_module.app.test_client()
+    # 연결 비용이 드러나도록 결과가 작은 조회 위주로 구성 (전체 조회는 직렬화 시간이 지배)
+    urls = [
+        '/api/transactions?region=서울특별시 강남구&start_date=2024-06-01&end_date=2024-06-03',
+        '/api/transactions?region=부산광역시 해운대구&start_date=2024-11-10&end_date=2024-11-10',
+        '/api/transactions?start_date=2024-03-05&end_date=2024-03-05',
+    ]
+
+    # 1) 요청마다 새 연결 (기존 방식)
+    pooled_get_connection = app_module.get_connection
+    app_module.get_connection = lambda readonly=False: sqlite3.connect(connection.database_path())
+    run(client, 50, urls)  # 워밍업
+    per_request_total, per_request_ms = run(client, requests_count, urls)
+
+    # 2) 스레드별 재사용 연결
+    app_module.get_connection = pooled_get_connection
+    connection.close_connections()
+    run(client, 50, urls)  # 워밍업
+    pooled_total, pooled_ms = run(client, requests_count, urls)
+
+    print(f"\n📊 /api/transactions {requests_count:,}회")
+    print(f"  요청마다 connect : {per_request_total:.2f}s ({per_request_ms:.3f} ms/요청)")
+    print(f"  재사용 연결      : {pooled_total:.2f}s ({pooled_ms:.3f} ms/요청)")
+    print(f"  개선율           : {per_request_ms / pooled_ms:.2f}x")
+
+    connection.close_connections()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+국토교통부 XML 파서 처리량 벤치마크
+대용량 픽스처 XML로 기존 방식(ElementTree 전체 트리 + 항목별 find)과
+iterparse 스트리밍 파서의 초당 처리 행 수와 최대 메모리 사용량을 비교
+
+사용법: python bench_xml_parser.py [행 수]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from crawlers.molit_xml_parser import iter_trade_records, parse_amount, parse_area, parse_floor
+from services.region_service import RegionService
+
+ITEM_TEMPLATE = (
+    '<item><aptGeonNm>{dong}</aptGeonNm><aptNm>{name}</aptNm><buildYear>2005</buildYear>'
+    '<dealAmount>{amount:,}</dealAmount><dealDay>{day}</dealDay><dealMonth>{month}</dealMonth>'
+    '<dealYear>2024</dealYear><excluUseAr>{area}</excluUseAr><floor>{floor}</floor>'
+    '<jibun>{jibun}</jibun><sggCd>11680</sggCd><umdNm>{dong}</umdNm></item>'
+)
+
+
+def build_fixture(row_count):
+    """row_count건의 <item>이 들어 있는 응답 XML 생성"""
+    random.seed(42)
+    dongs = ['역삼동', '대치동', '삼성동', '개포동', '도곡동']
+    items = ''.join(
+        ITEM_TEMPLATE.format(
+            dong=random.choice(dongs), name=f"테스트아파트{i % 300}", amount=random.randint(30000, 400000),
+            day=random.randint(1, 28), month=random.randint(1, 12), area=round(random.uniform(39, 200), 2),
+            floor=random.randint(1, 40), jibun=str(random.randint(1, 999))
+        )
+        for i in range(row_count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?><response>'
+        '<header><resultCode>000</resultCode><resultMsg>OK</resultMsg></header>'
+        f'<body><items>{items}</items><numOfRows>{row_count}</numOfRows><pageNo>1</pageNo>'
+        f'<totalCount>{row_count}</totalCount></body></response>'
+    ).encode('utf-8')
+
+
+def parse_legacy(xml):
+    """기존 파서 방식 (전체 트리 생성 + 항목별 find 9회 + 행마다 지역명 선형 탐색, 행별 출력은 제외)"""
+    region_service = RegionService()
+    root = ET.fromstring(xml)
+    records = []
+    for item in root.findall('.//item'):
+        deal_amount = item.find('dealAmount')
+        area = item.find('excluUseAr')
+        floor = item.find('floor')
+        dong = item.find('umdNm')
+        jibun = item.find('jibun')
+        apartment_name = item.find('aptNm')
+        deal_year = item.find('dealYear')
+        deal_month = item.find('dealMonth')
+        deal_day = item.find('dealDay')
+        deal_date = f"{deal_year.text.strip()}-{deal_month.text.strip().zfill(2)}-{deal_day.text.strip().zfill(2)}"
+        region_name = next(
+            (region_service.format_region_name(province_name, district_name)
+             for province_name, province_data in region_service.supported_regions.items()
+             for district_name, code in province_data['districts'].items() if code == '11680'),
+            '지역코드_11680'
+        )
+        records.append({
+            'date': deal_date,
+            'region_name': region_name,
+            'complex_name': apartment_name.text.strip(),
+            'avg_price': parse_amount(deal_amount.text.strip()),
+            'area': parse_area(area.text.strip()),
+            'floor': parse_floor(floor.text.strip()),
+            'dong': dong.text.strip(),
+            'jibun': jibun.text.strip()
+        })
+    return records
+
+
+def parse_streaming(xml):
+    """iterparse 스트리밍 파서 (레코드는 하나씩 소비하고 보관하지 않음)"""
+    count = 0
+    for _ in iter_trade_records(xml, '11680', '서울 강남구', {}):
+        count += 1
+    return count
+
+
+def measure(label, parse, xml, row_count):
+    # 처리량과 메모리는 따로 측정 (tracemalloc이 켜져 있으면 속도가 크게 떨어짐)
+    started = time.perf_counter()
+    parse(xml)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    parse(xml)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<14}: {row_count / elapsed:>10,.0f}행/초, {elapsed:.2f}s, 최대 메모리 {peak / 1024 / 1024:.1f}MB")
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    xml = build_fixture(row_count)
+    print(f"📄 픽스처 XML: {row_count:,}행, {len(xml) / 1024 / 1024:.1f}MB\n")
+
+    measure('기존 파서', parse_legacy, xml, row_count)
+    measure('스트리밍 파서', parse_streaming, xml, row_count)
+
+
+if __name__ == '__main__':
+    main()
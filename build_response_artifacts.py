@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+정적 스냅샷 응답 아티팩트 빌드 스크립트
+collected_data/ 스냅샷별로 미리 직렬화/압축된 응답 사이드카(.json.gz 등)와 ETag 매니페스트 생성
+지역 단위 서빙용 mmap 스냅샷(.snap)도 함께 생성
+"""
+
+from services.response_artifacts import artifact_store, available_encodings
+from services.region_snapshot import region_snapshot_store
+
+def build_response_artifacts():
+    """모든 응답 아티팩트 빌드"""
+    print(f"사용 가능한 압축 인코딩: {', '.join(available_encodings())}")
+    
+    built = artifact_store.build_all()
+    if not built:
+        print("응답 아티팩트를 빌드할 스냅샷이 없습니다.")
+    
+    print(f"\n=== 응답 아티팩트 빌드 완료 ===")
+    for name, artifact in built.items():
+        print(f"{name}: ETag {artifact['content_hash']}, 원본 {artifact['raw_size'] / 1024 / 1024:.2f}MB")
+        for encoding, path in artifact['files'].items():
+            print(f"  {encoding}: {path}")
+    
+    snapshots = region_snapshot_store.build_all()
+    print(f"\n=== 지역 스냅샷 빌드 완료 ===")
+    for name, snapshot in snapshots.items():
+        print(f"{name}: {len(snapshot.regions)}개 지역")
+
+if __name__ == "__main__":
+    build_response_artifacts()
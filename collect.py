@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+통합 데이터 수집 스크립트
+도시별 수집 대상은 COLLECTION_TARGETS 설정 한 곳에서 관리하고 (도시 추가 = 설정 항목 추가)
+선택한 모든 도시의 지역×월 작업을 하나의 동시 수집 엔진에서 함께 처리 (전역 속도 제한 공유)
+
+출력 구조 (collected_data/):
+  {지역명}_data.json        지역별 거래 목록
+  {도시}_all_data.json      도시별 {지역명: 거래 목록}
+  collection_summary.json   실행 요약 (도시/지역별 건수와 가격, 소요 시간, 호출 통계)
+
+--incremental 실행은 데이터베이스에 없거나 신고 기한 안의 달만 호출해 데이터베이스에 저장
+(일부 달만 받으므로 지역/도시 파일은 다시 쓰지 않음), --dry-run은 계획과 예상 API 호출 수만 출력
+
+사용법:
+  python collect.py                       # 기본 도시 전체
+  python collect.py seoul busan           # 설정된 도시만
+  python collect.py --province 경기도       # 광역시/도 전체
+  python collect.py --city "경기 부천시"     # 시 단위
+  python collect.py --regions "서울 강남구" "서울 서초구" --months 3
+  python collect.py --incremental --dry-run  # 증분 수집 계획만 확인
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+from crawlers.molit_api_crawler import MolitAPICrawler
+from database.models import init_db, save_transactions_bulk
+from services.region_service import RegionService
+from services.run_ledger import RunLedger
+
+# 도시 -> RegionService 지역 집합 (province: 광역시/도 전체, city: 시 단위, regions: 지역명 목록)
+COLLECTION_TARGETS = {
+    'seoul': {'name': '서울시', 'province': '서울특별시'},
+    'busan': {'name': '부산시', 'province': '부산광역시'},
+    'incheon': {'name': '인천시', 'province': '인천광역시'},
+    'daegu': {'name': '대구시', 'province': '대구광역시'},
+    'daejeon': {'name': '대전시', 'province': '대전광역시'},
+    'gwangju': {'name': '광주시', 'province': '광주광역시'},
+    'ulsan': {'name': '울산시', 'province': '울산광역시'},
+    'bucheon': {'name': '부천시', 'city': '경기 부천시'},
+    'seongnam': {'name': '성남시', 'city': '경기 성남시'},
+    'suwon': {'name': '수원시', 'city': '경기 수원시'},
+    'anyang': {'name': '안양시', 'city': '경기 안양시'},
+    'yongin': {'name': '용인시', 'city': '경기 용인시'},
+    'guri': {'name': '구리시', 'city': '경기 구리시'},
+    'gyeonggi': {'name': '경기도', 'province': '경기도'},
+}
+
+# 도시를 지정하지 않았을 때 수집할 도시 (경기도 전체는 명시적으로 요청할 때만)
+DEFAULT_TARGETS = [
+    'seoul', 'busan', 'incheon', 'daegu', 'daejeon', 'gwangju', 'ulsan',
+    'bucheon', 'seongnam', 'suwon', 'anyang', 'yongin', 'guri'
+]
+
+
+def resolve_targets(target_names, region_service=None):
+    """도시 이름 목록 -> {도시: [표준 지역명]}"""
+    region_service = region_service or RegionService()
+    resolved = {}
+    for target_name in target_names:
+        if target_name not in COLLECTION_TARGETS:
+            raise ValueError(f"설정되지 않은 수집 대상: {target_name} (가능: {', '.join(COLLECTION_TARGETS)})")
+        config = COLLECTION_TARGETS[target_name]
+        resolved[target_name] = region_service.get_region_set(
+            province=config.get('province'), city=config.get('city'), regions=config.get('regions')
+        )
+    return resolved
+
+
+def _price_summary(data):
+    prices = [item['avg_price'] for item in data if isinstance(item.get('avg_price'), (int, float))]
+    if not prices:
+        return {'avg_price': 0, 'max_price': 0, 'min_price': 0}
+    return {'avg_price': int(sum(prices) / len(prices)), 'max_price': max(prices), 'min_price': min(prices)}
+
+
+def _write_json(path, payload):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+def plan(targets, months=8, incremental=False):
+    """{도시: [지역명]}의 수집 계획만 계산 (API 호출 없음)"""
+    crawler = MolitAPICrawler()
+    all_regions = list(dict.fromkeys(region for regions in targets.values() for region in regions))
+    region_codes = crawler.region_service.get_region_codes(all_regions)
+    # 실제 수집과 같은 계획이 나오도록 원장의 0건 조회 기록도 반영
+    ledger = RunLedger() if incremental else None
+    return crawler.plan_region_codes([code for code in region_codes.values() if code], months, incremental, ledger)
+
+
+def collect(targets, months=8, data_dir='collected_data', use_ledger=True, incremental=False):
+    """{도시: [지역명]}의 전체 지역을 한 번에 수집하고 파일로 저장, 실행 요약 반환
+
+    incremental이면 필요한 달만 받아 데이터베이스에 저장 (계획 기준이 데이터베이스이므로)
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    started = time.perf_counter()
+    if incremental:
+        init_db()
+
+    crawler = MolitAPICrawler()
+    ledger = run_id = None
+    if use_ledger:
+        # 같은 도시 조합의 중단된 실행은 끝나지 않은 작업만 이어서 수집
+        ledger = RunLedger()
+        run_id = ledger.open_run(f"collect{':incremental' if incremental else ''}:{','.join(targets)}")
+        crawler.use_ledger(ledger, run_id)
+
+    all_regions = list(dict.fromkeys(region for regions in targets.values() for region in regions))
+    print(f"=== 통합 수집 시작: {len(targets)}개 도시, {len(all_regions)}개 지역, 최근 {months}개월 ===")
+    collected = crawler.crawl_regions(all_regions, months=months, incremental=incremental)
+
+    summary = {
+        'collection_date': datetime.now().isoformat(),
+        'months': months,
+        'incremental': incremental,
+        'total_regions': len(all_regions),
+        'total_transactions': 0,
+        'targets': {},
+        'regions_summary': {}
+    }
+
+    for target_name, regions in targets.items():
+        target_data = {region: collected.get(region, []) for region in regions}
+        for region, data in target_data.items():
+            data_file = f"{region.replace(' ', '_')}_data.json"
+            if data and not incremental:
+                _write_json(os.path.join(data_dir, data_file), data)
+            summary['regions_summary'][region] = {
+                'transaction_count': len(data),
+                **_price_summary(data),
+                'data_file': data_file,
+                'collection_status': 'success' if data else 'failed'
+            }
+
+        all_data_file = f"{target_name}_all_data.json"
+        if not incremental:
+            _write_json(os.path.join(data_dir, all_data_file), target_data)
+        target_count = sum(len(data) for data in target_data.values())
+        summary['targets'][target_name] = {
+            'name': COLLECTION_TARGETS.get(target_name, {}).get('name', target_name),
+            'regions': regions,
+            'transaction_count': target_count,
+            'failed_regions': [region for region, data in target_data.items() if not data],
+            'data_file': all_data_file
+        }
+        print(f"{target_name}: {len(regions)}개 지역, {target_count:,}건" + ('' if incremental else f" -> {all_data_file}"))
+
+    summary['total_transactions'] = sum(len(collected.get(region, [])) for region in all_regions)
+    if incremental:
+        summary['saved'] = save_transactions_bulk([row for region in all_regions for row in collected.get(region, [])])
+    summary['elapsed_sec'] = round(time.perf_counter() - started, 1)
+    summary['http'] = crawler.http.stats()
+    summary['response_cache'] = crawler.response_cache.stats()
+    if ledger is not None:
+        ledger.finish_run(run_id)
+        summary['ledger'] = ledger.summary(run_id)
+
+    summary_path = os.path.join(data_dir, 'collection_summary.json')
+    _write_json(summary_path, summary)
+
+    failed = [region for region, info in summary['regions_summary'].items() if not info['transaction_count']]
+    print(f"\n=== 통합 수집 완료 ===")
+    print(f"총 지역 수: {summary['total_regions']} (데이터 없음 {len(failed)}개)")
+    print(f"총 거래 건수: {summary['total_transactions']:,}건")
+    print(f"소요 시간: {summary['elapsed_sec']}초")
+    print(f"요약 파일: {summary_path}")
+    return summary
+
+
+def collect_targets(target_names=None, months=8, data_dir='collected_data', use_ledger=True, incremental=False):
+    """설정된 도시 이름으로 수집 (기존 도시별 스크립트의 진입점)"""
+    return collect(resolve_targets(target_names or DEFAULT_TARGETS), months, data_dir, use_ledger, incremental)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부동산 실거래가 통합 수집')
+    parser.add_argument('targets', nargs='*', help=f"수집할 도시 ({', '.join(COLLECTION_TARGETS)})")
+    parser.add_argument('--province', help="광역시/도 전체 (예: 경기도)")
+    parser.add_argument('--city', help="시 단위 (예: '경기 부천시')")
+    parser.add_argument('--regions', nargs='+', help="지역명 목록 (예: '서울 강남구')")
+    parser.add_argument('--months', type=int, default=8, help='최근 몇 개월 (기본 8)')
+    parser.add_argument('--data-dir', default='collected_data', help='출력 디렉터리')
+    parser.add_argument('--no-ledger', action='store_true', help='수집 원장 체크포인트 사용 안 함')
+    parser.add_argument('--incremental', action='store_true', help='저장되지 않았거나 바뀔 수 있는 달만 수집')
+    parser.add_argument('--dry-run', action='store_true', help='수집 계획과 예상 API 호출 수만 출력')
+    args = parser.parse_args()
+
+    if args.province or args.city or args.regions:
+        targets = resolve_targets(args.targets) if args.targets else {}
+        targets['custom'] = RegionService().get_region_set(
+            province=args.province, city=args.city, regions=args.regions
+        )
+    else:
+        targets = resolve_targets(args.targets or DEFAULT_TARGETS)
+
+    if args.dry_run:
+        plan(targets, months=args.months, incremental=args.incremental)
+        return
+
+    collect(targets, months=args.months, data_dir=args.data_dir, use_ledger=not args.no_ledger,
+            incremental=args.incremental)
+
+
+if __name__ == '__main__':
+    main()
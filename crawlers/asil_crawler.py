@@ -6,7 +6,7 @@ from selenium.webdriver.chrome.options import Options
 import time
 import re
 from datetime import datetime, timedelta
-from database.models import save_transaction_data, save_price_change_data
+from database.models import save_transactions_bulk, save_price_change_data
 
 class AsilCrawler:
     def __init__(self):
@@ -184,9 +184,8 @@ class AsilCrawler:
                     print(f"{region_name}: 아실 스크래핑 실패 - 실제 데이터 없음")
                     continue
                 
-                # 데이터베이스에 저장
-                for transaction in region_transactions:
-                    save_transaction_data(transaction)
+                # 데이터베이스에 저장 (지역-월 단위 일괄 커밋)
+                save_transactions_bulk(region_transactions)
                 
                 all_transactions.extend(region_transactions)
                 
@@ -0,0 +1,87 @@
+"""
+수집 작업 엔진 모듈
+지역×월 단위 작업을 제한된 스레드 풀로 동시에 처리하고,
+모든 API 호출은 하나의 토큰 버킷 속도 제한기를 공유해 초당 요청 수를 넘지 않도록 함
+고정 sleep 대신 API 허용량이 전체 수집 시간을 결정
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        # rate: 초당 허용 요청 수, capacity: 순간 허용 버스트 (기본은 rate와 같음)
+        if rate <= 0:
+            raise ValueError('rate는 0보다 커야 합니다')
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.acquired = 0
+        self.waited_sec = 0.0
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기, 대기한 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.acquired += 1
+                    self.waited_sec += waited
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def stats(self):
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'acquired': self.acquired,
+                'waited_sec': round(self.waited_sec, 3)
+            }
+
+
+class FetchEngine:
+    def __init__(self, max_workers=None):
+        # 동시 작업 수 (기본은 환경 변수 또는 8)
+        if max_workers is None:
+            max_workers = int(os.environ.get('MOLIT_MAX_WORKERS', 8))
+        self.max_workers = max(1, max_workers)
+
+    def run(self, tasks, worker, progress=True):
+        """tasks의 각 작업에 worker(task)를 실행하고 [(작업, 결과, 예외)]를 입력 순서대로 반환
+
+        작업 하나가 실패해도 나머지 작업은 계속 진행
+        """
+        tasks = list(tasks)
+        results = [None] * len(tasks)
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(worker, task): i for i, task in enumerate(tasks)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    results[i] = (tasks[i], future.result(), None)
+                except Exception as e:
+                    print(f"작업 실패 {tasks[i]}: {str(e)}")
+                    results[i] = (tasks[i], None, e)
+                if progress and (done % 50 == 0 or done == len(tasks)):
+                    print(f"⏱️  작업 진행: {done}/{len(tasks)} ({time.perf_counter() - started:.1f}초)")
+
+        return results
+
+
+# 프로세스 전역 MOLIT API 속도 제한기 (모든 크롤러 인스턴스가 공유)
+molit_rate_limiter = TokenBucket(float(os.environ.get('MOLIT_REQUESTS_PER_SEC', 5)))
@@ -0,0 +1,81 @@
+"""
+HTTP 전송 모듈
+모든 API 크롤러가 공유하는 requests 세션 (keep-alive 연결 풀, gzip 응답, 호스트별 연결 수 제한)
+매 호출마다 새 TCP/TLS 연결을 맺지 않도록 하고, 연결 재사용 통계를 제공
+재시도는 속도 제한기를 거치도록 호출하는 크롤러가 직접 처리 (어댑터 자동 재시도 없음)
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPTransport:
+    def __init__(self, pool_maxsize=None, pool_connections=10):
+        # 호스트별 최대 연결 수 (기본은 수집 최대 동시 호출 수 = 지역×월 작업 수 × 작업당 페이지 동시 수)
+        if pool_maxsize is None:
+            pool_maxsize = (int(os.environ.get('MOLIT_MAX_WORKERS', 8))
+                            * int(os.environ.get('MOLIT_PAGE_WORKERS', 4)))
+        self.pool_maxsize = max(1, pool_maxsize)
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'User-Agent': 'realstate-collector/1.0'
+        })
+
+        # pool_block=True: 호스트별 연결 수가 상한에 도달하면 새 연결 대신 반납을 기다림
+        # max_retries=0: 재전송은 토큰 버킷을 거치도록 크롤러에서 처리
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=self.pool_maxsize,
+                                   pool_block=True, max_retries=0)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def get(self, url, params=None, timeout=30, **kwargs):
+        """공유 세션으로 GET 요청 (응답 gzip은 requests가 자동 해제)"""
+        with self._lock:
+            self.requests += 1
+        return self.session.get(url, params=params, timeout=timeout, **kwargs)
+
+    def stats(self):
+        """호스트별 연결/요청 수와 연결 재사용률
+
+        connections는 새로 맺은 TCP(TLS) 연결 수, requests는 그 연결들로 보낸 요청 수
+        """
+        hosts = []
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts.append({
+                'host': f"{pool.scheme}://{pool.host}:{pool.port}",
+                'connections': pool.num_connections,
+                'requests': pool.num_requests
+            })
+
+        connections = sum(host['connections'] for host in hosts)
+        pooled_requests = sum(host['requests'] for host in hosts)
+        return {
+            'requests': self.requests,
+            'connections': connections,
+            'reuse_rate': round(1 - connections / pooled_requests, 4) if pooled_requests else 0.0,
+            'pool_maxsize': self.pool_maxsize,
+            'hosts': hosts
+        }
+
+    def log_stats(self):
+        stats = self.stats()
+        print(f"🔌 HTTP 연결 재사용: 요청 {stats['requests']:,}건 / 새 연결 {stats['connections']}개 "
+              f"(재사용률 {stats['reuse_rate'] * 100:.1f}%)")
+        return stats
+
+
+# 프로세스 전역 전송 계층 (모든 API 크롤러가 공유)
+http_transport = HTTPTransport()
@@ -1,24 +1,30 @@
-import requests
 import pandas as pd
-import xml.etree.ElementTree as ET
+import math
+import os
 import time
-from datetime import datetime, timedelta
-from database.models import save_transaction_data, save_price_change_data
+import requests
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from database.models import save_transactions_bulk, save_price_change_data
 from services.region_service import RegionService
-import concurrent.futures
-import threading
+from crawlers.fetch_engine import FetchEngine, molit_rate_limiter
+from crawlers.http_transport import http_transport
+from crawlers.response_cache import molit_response_cache
+from crawlers.service_keys import QuotaExhaustedError, key_id, molit_key_pool
+from crawlers.molit_xml_parser import iter_trade_records, parse_amount, parse_area, parse_floor
+from services.collection_planner import collection_planner, recent_months
 import urllib.parse
 
+# API가 허용하는 페이지당 최대 행 수
+MAX_NUM_OF_ROWS = 1000
+
+# 일시적 게이트웨이 오류 (같은 요청을 다시 보냄)
+RETRY_STATUSES = (502, 503, 504)
+
 class MolitAPICrawler:
     def __init__(self):
         # 공공데이터포털 OpenAPI 설정 (기존 작동하는 엔드포인트)
         self.base_url = "https://apis.data.go.kr/1613000/RTMSDataSvcAptTradeDev/getRTMSDataSvcAptTradeDev"
-        # 인코딩된 키 (새로운 키)
-        self.service_key_encoded = "iJ494e%2B8%2FQFaOfEPwX51jVQMAqn8oLwjg4%2BA3chAO4QDuk%2BQcyHDe%2BltkHtQc2JV%2Baygqkyq48o0CqZSep%2F%2BLQ%3D%3D"
-        # 디코딩된 키 (새로운 키)
-        self.service_key_decoded = "iJ494e+8/QFaOfEPwX51jVQMAqn8oLwjg4+A3chAO4QDuk+QcyHDe+ltkHtQc2JV+aygqkyq48o0CqZSep/+LQ=="
-        # 현재 사용할 키 (디코딩된 키 사용)
-        self.service_key = self.service_key_decoded
         
         # API 키 테스트 모드 (새로운 키로 실제 API 호출 시도)
         self.test_mode = False  # 새로운 키로 실제 API 호출
@@ -26,19 +32,38 @@ class MolitAPICrawler:
         # 지역 서비스 연동
         self.region_service = RegionService()
         
+        # 지역×월 작업 동시 수집 엔진 (API 호출은 프로세스 전역 속도 제한기를 공유)
+        self.rate_limiter = molit_rate_limiter
+        self.fetch_engine = FetchEngine()
+        # 한 달치의 2페이지 이후를 동시에 받는 페이지 엔진 (지역×월 작업 안에서 사용)
+        self.page_engine = FetchEngine(max_workers=int(os.environ.get('MOLIT_PAGE_WORKERS', 4)))
+        # keep-alive 연결 풀을 공유하는 HTTP 세션
+        self.http = http_transport
+        # 연결 오류/게이트웨이 오류 재시도 횟수 (재시도마다 속도 제한기 토큰을 다시 얻음)
+        self.max_retries = int(os.environ.get('MOLIT_HTTP_RETRIES', 2))
+        # 신고 마감된 달은 영구 보관하는 원본 XML 디스크 캐시
+        self.response_cache = molit_response_cache
+        # 일일 한도를 관리하는 서비스 키 풀 (MOLIT_SERVICE_KEYS)
+        self.key_pool = molit_key_pool
+        # 페이지 단위 체크포인트 원장 (use_ledger로 설정, 없으면 체크포인트 없이 수집)
+        self.ledger = None
+        self.run_id = None
+        
+    def use_ledger(self, ledger, run_id):
+        """수집 실행 원장 연결 (완료된 페이지는 다시 호출하지 않고 원장에서 읽음)"""
+        self.ledger = ledger
+        self.run_id = run_id
+    
     def get_apartment_data(self, region_code, deal_date, page_no=1, num_of_rows=10):
         """공공데이터포털 API로 아파트 실거래가 데이터 조회"""
+        return self.fetch_page(region_code, deal_date, page_no, num_of_rows)[0]
+    
+    def fetch_page(self, region_code, deal_date, page_no=1, num_of_rows=10):
+        """공공데이터포털 API로 아파트 실거래가 한 페이지 조회, (거래 목록, totalCount) 반환"""
         try:
-            # RESTful 서비스를 위한 UTF-8 URL 인코딩 (특수문자 = 포함)
-            # 디코딩된 인증키를 직접 사용하는 방법
+            # 디코딩된 서비스키를 직접 파라미터로 사용 (키는 호출마다 키 풀에서 배정)
             # 출처: https://hyeonhahaha.tistory.com/entry/공공데이터-e약은요-연동-중-서비스-키-등록-안됨-문제-해결-과정
-            
-            # 디코딩된 서비스키를 직접 파라미터로 사용 (이전 인증키)
-            SERVICE_KEY = "+6+gD3OxMqe/Y7ddcg7thoXJk/m8nYqXOw7uyZEDObEo80uaT+ZjDV7P67Syrf2b5CGaPGaELTT8OIPU5YyL0A=="
-            
-            # 파라미터 구성 (디코딩된 키 직접 사용)
             params = {
-                'serviceKey': SERVICE_KEY,
                 'LAWD_CD': region_code,
                 'DEAL_YMD': deal_date,
                 'pageNo': page_no,
@@ -48,168 +73,108 @@ class MolitAPICrawler:
             # API 호출
             base_url = self.base_url
             
+            # 캐시된 원본 XML이 유효하면 네트워크 호출 생략
+            cached_xml = self.response_cache.get(base_url, params)
+            if cached_xml is not None:
+                print(f"응답 캐시 사용: {region_code}, {deal_date}, 페이지: {page_no}")
+                return self.parse_xml_page(cached_xml, region_code)
+            
             print(f"공공데이터포털 API 호출: {region_code}, {deal_date}, 페이지: {page_no}")
-            print(f"디코딩된 서비스키: {SERVICE_KEY[:30]}...")
             print(f"API URL: {base_url}")
-            response = requests.get(base_url, params=params, timeout=30)
+            attempt = 0
+            while True:
+                service_key = self.key_pool.acquire()
+                self.rate_limiter.acquire()
+                try:
+                    response = self.http.get(base_url, params={'serviceKey': service_key, **params}, timeout=30)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    print(f"연결 오류, 재시도 {attempt}/{self.max_retries}: {str(e)}")
+                    time.sleep(0.5 * 2 ** (attempt - 1))
+                    continue
+                if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                    attempt += 1
+                    print(f"API 응답 {response.status_code}, 재시도 {attempt}/{self.max_retries}")
+                    time.sleep(0.5 * 2 ** (attempt - 1))
+                    continue
+                # 한도 초과/미등록 키 응답이면 그 키를 제외하고 다른 키로 다시 호출
+                if self.key_pool.report(service_key, response.status_code, response.text) is None:
+                    break
+                print(f"서비스 키 {key_id(service_key)} 사용 불가, 다른 키로 재시도")
             
             if response.status_code == 200:
                 print(f"API 응답 상태: 성공 (200)")
-                return self.parse_xml_response(response.text, region_code)
+                # 정상 결과만 캐시 (키 오류/한도 초과 응답은 다음 실행에서 다시 호출)
+                if self.is_success_response(response.text):
+                    self.response_cache.put(base_url, params, response.text)
+                return self.parse_xml_page(response.text, region_code)
             else:
                 print(f"API 호출 실패: {response.status_code}")
                 print(f"응답 내용: {response.text[:500]}")
-                return []
+                return [], None
                 
+        except QuotaExhaustedError as e:
+            # 모든 키 소진: 호출 없이 실패로 기록 (수집 원장에서 다음 실행에 재시도)
+            print(f"⏸️  {e}")
+            return {'error': 'quota_exhausted', 'message': str(e)}, None
         except Exception as e:
             print(f"공공데이터포털 API 오류: {str(e)}")
-            return []
+            return [], None
+    
+    def is_success_response(self, xml_text):
+        """API 결과 코드가 정상(000)인 응답인지"""
+        return '<resultCode>000</resultCode>' in xml_text
     
     def parse_xml_response(self, xml_text, region_code):
         """XML 응답 파싱 (공공데이터포털 문서 기준)"""
+        return self.parse_xml_page(xml_text, region_code)[0]
+    
+    def parse_xml_page(self, xml_text, region_code):
+        """XML 응답 파싱 (공공데이터포털 문서 기준), (거래 목록, totalCount) 반환"""
+        meta = {}
         try:
-            print(f"XML 응답 내용 (처음 1000자): {xml_text[:1000]}")
-            root = ET.fromstring(xml_text)
-            
-            # 결과 코드 확인 (header 내부)
-            result_code = root.find('.//resultCode')
-            result_msg = root.find('.//resultMsg')
-            
-            # API 키 오류 확인
-            auth_msg = root.find('.//returnAuthMsg')
-            if auth_msg is not None and 'SERVICE_KEY_IS_NOT_REGISTERED_ERROR' in auth_msg.text:
-                print(f"⚠️  API 키 오류 감지: {auth_msg.text}")
-                return {'error': 'api_key_error', 'message': auth_msg.text}
-            
-            if result_code is not None:
-                print(f"API 결과 코드: {result_code.text}")
-                print(f"API 결과 메시지: {result_msg.text if result_msg is not None else 'N/A'}")
-                
-                if result_code.text != '000':  # 공공데이터포털 API는 '000'을 성공 코드로 사용
-                    print(f"API 결과 코드 오류: {result_code.text}")
-                    return []
-            
-            # 전체 결과 수 확인
-            total_count = root.find('.//totalCount')
-            if total_count is not None:
-                print(f"전체 결과 수: {total_count.text}")
-            
-            # 거래 데이터 추출 (items/item 구조)
-            items = []
-            for item in root.findall('.//item'):
-                try:
-                    # 문서 기준 필드명 사용
-                    deal_amount = item.find('dealAmount')  # 거래금액
-                    area = item.find('excluUseAr')  # 전용면적
-                    floor = item.find('floor')  # 층
-                    dong = item.find('umdNm')  # 법정동 (읍면동명)
-                    jibun = item.find('jibun')  # 지번
-                    apartment_name = item.find('aptNm')  # 아파트명
-                    deal_year = item.find('dealYear')  # 거래년도
-                    deal_month = item.find('dealMonth')  # 거래월
-                    deal_day = item.find('dealDay')  # 거래일
-                    
-                    # 필드 존재 여부 확인
-                    if deal_amount is None or apartment_name is None:
-                        print(f"필수 필드 누락, 스킵")
-                        continue
-                    
-                    # 거래일자 조합
-                    year = deal_year.text.strip() if deal_year is not None else '2024'
-                    month = deal_month.text.strip().zfill(2) if deal_month is not None else '01'
-                    day = deal_day.text.strip().zfill(2) if deal_day is not None else '01'
-                    deal_date = f"{year}-{month}-{day}"
-                    
-                    # 가격 파싱
-                    price = self.parse_amount(deal_amount.text.strip())
-                    
-                    # 지역명 찾기
-                    region_name = self.get_region_name(region_code)
-                    
-                    # 면적 파싱
-                    area_value = self.parse_area(area.text.strip() if area is not None else '84.5')
-                    
-                    # 층수 파싱
-                    floor_value = self.parse_floor(floor.text.strip() if floor is not None else '10')
-                    
-                    transaction = {
-                        'date': deal_date,
-                        'region_name': region_name,
-                        'complex_name': apartment_name.text.strip(),
-                        'transaction_count': 1,
-                        'avg_price': price,
-                        'source': 'molit_api',
-                        'area': area_value,
-                        'floor': floor_value,
-                        'latest_transaction_date': deal_date,
-                        'dong': dong.text.strip() if dong is not None else '',
-                        'jibun': jibun.text.strip() if jibun is not None else ''
-                    }
-                    
-                    items.append(transaction)
-                    print(f"거래 데이터 파싱 완료: {apartment_name.text.strip()}, {price:,}원")
-                    
-                except Exception as e:
-                    print(f"개별 항목 파싱 오류: {str(e)}")
-                    continue
-            
-            print(f"파싱된 거래 데이터: {len(items)}건")
-            return items
-            
-        except Exception as e:
+            # 지역명은 응답마다 한 번만 결정
+            region_name = self.get_region_name(region_code)
+            items = list(iter_trade_records(xml_text, region_code, region_name, meta))
+        except ET.ParseError as e:
             print(f"XML 파싱 오류: {str(e)}")
-            print(f"XML 원본: {xml_text}")
-            return []
+            print(f"XML 원본 (처음 500자): {xml_text[:500]}")
+            return [], None
+        
+        # API 키 오류 확인
+        auth_msg = meta.get('auth_msg', '')
+        if 'SERVICE_KEY_IS_NOT_REGISTERED_ERROR' in auth_msg:
+            print(f"⚠️  API 키 오류 감지: {auth_msg}")
+            return {'error': 'api_key_error', 'message': auth_msg}, None
+        
+        result_code = meta.get('result_code')
+        if result_code is not None and result_code != '000':  # 공공데이터포털 API는 '000'을 성공 코드로 사용
+            print(f"API 결과 코드 오류: {result_code} ({meta.get('result_msg', 'N/A')})")
+            return [], None
+        
+        total = int(meta['total_count'] or 0) if 'total_count' in meta else None
+        skipped = f", 필수 필드 누락 {meta['skipped']}건 스킵" if meta.get('skipped') else ''
+        print(f"파싱된 거래 데이터: {len(items)}건 (전체 결과 수: {total}{skipped})")
+        return items, total
     
     def parse_amount(self, amount_str):
         """거래금액 파싱 (만원 단위 -> 원 단위)"""
-        try:
-            amount_str = amount_str.strip().replace(',', '')
-            
-            # 문서에 따르면 거래금액은 만원 단위로 제공
-            if amount_str.isdigit():
-                # 숫자만 있는 경우 (만원 단위)
-                return int(amount_str) * 10000
-            elif '억' in amount_str:
-                # 억 단위 표기가 있는 경우
-                parts = amount_str.split('억')
-                if len(parts) == 2:
-                    billion = int(parts[0].strip()) * 100000000
-                    million = int(parts[1].strip()) * 10000 if parts[1].strip() else 0
-                    return billion + million
-                else:
-                    return int(parts[0].strip()) * 100000000
-            else:
-                # 기타 형태는 만원 단위로 처리
-                return int(float(amount_str)) * 10000
-                
-        except Exception as e:
-            print(f"가격 파싱 오류: {str(e)}, 원본: {amount_str}")
-            return 500000000  # 기본값 (5억원)
+        return parse_amount(amount_str)
     
     def parse_area(self, area_str):
         """면적 파싱 (예: "84.97" -> 84.97)"""
-        try:
-            return float(area_str.strip())
-        except:
-            return 84.5  # 기본값
+        return parse_area(area_str)
     
     def parse_floor(self, floor_str):
         """층수 파싱 (예: "10" -> 10)"""
-        try:
-            return int(floor_str.strip())
-        except:
-            return 10  # 기본값
+        return parse_floor(floor_str)
     
     def get_region_name(self, region_code):
         """법정동 코드로 지역명 찾기"""
-        # 지역 서비스에서 직접 조회하여 정확한 매핑
-        for province_name, province_data in self.region_service.supported_regions.items():
-            for district_name, code in province_data['districts'].items():
-                if code == region_code:
-                    return self.region_service.format_region_name(province_name, district_name)
-        
-        return f"지역코드_{region_code}"
+        # 지역 서비스의 코드 인덱스로 조회
+        return self.region_service.get_region_name(region_code) or f"지역코드_{region_code}"
     
     def get_region_code(self, region_name):
         """지역명으로 법정동 코드 찾기 (지역 서비스 사용)"""
@@ -223,45 +188,116 @@ class MolitAPICrawler:
                 date_list.append(f"{year}{month:02d}")
         return date_list
     
+    def get_deal_months(self, months=24):
+        """최근 N개월 거래년월 목록 (YYYYMM, 최신순, 달력 월 기준)"""
+        return recent_months(months)
+    
+    def crawl_month(self, region_code, deal_date, num_of_rows=MAX_NUM_OF_ROWS):
+        """한 지역의 한 달치 거래 데이터 수집
+
+        1페이지의 totalCount로 페이지 수를 계산해 나머지 페이지를 동시에 받고, 페이지 순서대로 합침
+        """
+        first_page, total = self.fetch_page_checkpointed(region_code, deal_date, 1, num_of_rows)
+        if not first_page or not isinstance(first_page, list):
+            return []
+        
+        if total is None:
+            # totalCount가 없는 응답이면 빈 페이지가 나올 때까지 순차 조회
+            return first_page + self._crawl_pages_sequential(region_code, deal_date, num_of_rows, len(first_page))
+        
+        page_count = math.ceil(total / num_of_rows)
+        if page_count <= 1:
+            return first_page
+        
+        transactions = list(first_page)
+        pages = range(2, page_count + 1)
+        if self.ledger is not None:
+            self.ledger.add_tasks(self.run_id, [(region_code, deal_date, page_no) for page_no in pages])
+        fetch = lambda page_no: self.fetch_page_checkpointed(region_code, deal_date, page_no, num_of_rows)[0]
+        for page_no, page_data, _ in self.page_engine.run(pages, fetch, progress=False):
+            if isinstance(page_data, list):
+                transactions.extend(page_data)
+            else:
+                print(f"페이지 수집 실패: {region_code}, {deal_date}, 페이지: {page_no}")
+        return transactions
+    
+    def fetch_page_checkpointed(self, region_code, deal_date, page_no, num_of_rows):
+        """원장에 완료 기록이 있으면 그 결과를, 없으면 API를 호출하고 결과를 원장에 기록"""
+        if self.ledger is None:
+            return self.fetch_page(region_code, deal_date, page_no=page_no, num_of_rows=num_of_rows)
+        
+        done = self.ledger.get_done(self.run_id, region_code, deal_date, page_no)
+        if done is not None:
+            return done
+        
+        items, total = self.fetch_page(region_code, deal_date, page_no=page_no, num_of_rows=num_of_rows)
+        # 호출/파싱 실패는 ([], None) 또는 오류 dict로 돌아옴 (결과 0건인 달은 totalCount=0)
+        if not isinstance(items, list) or (total is None and not items):
+            error = items.get('error') if isinstance(items, dict) else 'fetch_failed'
+            self.ledger.mark_failed(self.run_id, region_code, deal_date, page_no, error)
+        else:
+            self.ledger.mark_done(self.run_id, region_code, deal_date, page_no, items, total)
+        return items, total
+    
+    def _crawl_pages_sequential(self, region_code, deal_date, num_of_rows, first_page_size):
+        """2페이지부터 num_of_rows건 미만 페이지가 나올 때까지 순차 조회"""
+        transactions = []
+        page_size = first_page_size
+        page_no = 2
+        while page_size == num_of_rows:
+            page_data = self.fetch_page_checkpointed(region_code, deal_date, page_no, num_of_rows)[0]
+            if not page_data or not isinstance(page_data, list):
+                break
+            transactions.extend(page_data)
+            page_size = len(page_data)
+            page_no += 1
+        return transactions
+    
+    def plan_region_codes(self, region_codes, months=24, incremental=False, ledger=None):
+        """지역×월 수집 계획 (incremental이면 저장된 데이터 중 아직 없거나 바뀔 수 있는 달만)
+
+        ledger(기본 연결된 원장)의 0건 조회 기록으로 신고 마감 후 거래가 없던 달도 제외
+        """
+        plan = collection_planner.plan(region_codes, months, incremental=incremental, page_size=MAX_NUM_OF_ROWS,
+                                       ledger=ledger or self.ledger)
+        return collection_planner.log_plan(plan)
+    
+    def crawl_region_codes(self, region_codes, months=24, incremental=False):
+        """여러 지역 코드의 최근 N개월 데이터를 지역×월 작업으로 동시 수집
+
+        {지역 코드: 거래 목록(최신 월 순)} 반환, 호출 간격은 전역 속도 제한기가 조절
+        """
+        plan = self.plan_region_codes(region_codes, months, incremental)
+        return self.crawl_tasks(plan['tasks'], region_codes)
+    
+    def crawl_tasks(self, tasks, region_codes=()):
+        """(지역 코드, 거래년월) 작업 목록을 동시 수집, {지역 코드: 거래 목록} 반환"""
+        # 서비스 키가 없으면 작업을 배정하기 전에 MissingServiceKeyError로 중단
+        self.key_pool.load_keys()
+        if self.ledger is not None:
+            self.ledger.add_tasks(self.run_id, [(region_code, deal_date, 1) for region_code, deal_date in tasks])
+        print(f"지역×월 수집 작업: {len(tasks)}건 "
+              f"(동시 {self.fetch_engine.max_workers}, 초당 {self.rate_limiter.rate:g}회)")
+        
+        results = {region_code: [] for region_code in region_codes}
+        results.update({region_code: [] for region_code, _ in tasks if region_code not in results})
+        for task, transactions, _ in self.fetch_engine.run(tasks, lambda task: self.crawl_month(*task)):
+            if transactions:
+                results[task[0]].extend(transactions)
+        self.http.log_stats()
+        self.response_cache.log_stats()
+        self.key_pool.log_stats()
+        if self.ledger is not None:
+            print(f"📒 원장 현황: {self.ledger.summary(self.run_id)}")
+        return results
+    
     def crawl_region_data_with_code(self, region_code, months=24):
         """지역 코드로 직접 데이터 수집 (다중 페이지 처리) - 최근 N개월 데이터 수집"""
         if not region_code:
             print(f"지역 코드가 제공되지 않았습니다")
             return []
         
-        all_transactions = []
-        
-        # 최근 N개월 데이터 수집
-        current_date = datetime.now()
-        for i in range(months):
-            target_date = current_date - timedelta(days=30*i)
-            deal_date = target_date.strftime('%Y%m')  # YYYYMM 형식으로 변경
-            
-            # 첫 번째 페이지 호출로 전체 데이터 수 확인
-            first_page_data = self.get_apartment_data(region_code, deal_date, page_no=1, num_of_rows=100)
-            if isinstance(first_page_data, list):
-                all_transactions.extend(first_page_data)
-            
-            # 첫 페이지에서 100건이 나왔다면 추가 페이지가 있을 수 있음
-            if isinstance(first_page_data, list) and len(first_page_data) == 100:
-                page_no = 2
-                while True:
-                    page_data = self.get_apartment_data(region_code, deal_date, page_no=page_no, num_of_rows=100)
-                    if not page_data or not isinstance(page_data, list):
-                        break
-                    all_transactions.extend(page_data)
-                    
-                    # 100건 미만이면 마지막 페이지
-                    if len(page_data) < 100:
-                        break
-                    
-                    page_no += 1
-                    time.sleep(0.2)  # 페이지 간 간격 (속도 향상)
-            
-            # 월별 간격 조절 (속도 향상)
-            time.sleep(0.5)
-        
-        return all_transactions
+        return self.crawl_region_codes([region_code], months)[region_code]
 
     def crawl_region_data(self, region_name, months=24):
         """특정 지역의 데이터 수집 (다중 페이지 처리) - 최근 2년 데이터 수집"""
@@ -271,41 +307,23 @@ class MolitAPICrawler:
             print(f"지역 코드를 찾을 수 없습니다: {region_name}")
             return []
         
-        all_transactions = []
-        
-        # 최근 N개월 데이터 수집
-        current_date = datetime.now()
-        for i in range(months):
-            target_date = current_date - timedelta(days=30*i)
-            deal_date = target_date.strftime('%Y%m')  # YYYYMM 형식으로 변경
-            
-            # 첫 번째 페이지 호출로 전체 데이터 수 확인
-            first_page_data = self.get_apartment_data(region_code, deal_date, page_no=1, num_of_rows=100)
-            all_transactions.extend(first_page_data)
-            
-            # 첫 페이지에서 100건이 나왔다면 추가 페이지가 있을 수 있음
-            if len(first_page_data) == 100:
-                page_no = 2
-                while True:
-                    page_data = self.get_apartment_data(region_code, deal_date, page_no=page_no, num_of_rows=100)
-                    if not page_data:
-                        break
-                    all_transactions.extend(page_data)
-                    
-                    # 100건 미만이면 마지막 페이지
-                    if len(page_data) < 100:
-                        break
-                    
-                    page_no += 1
-                    time.sleep(0.2)  # 페이지 간 간격 (속도 향상)
-            
-            # 월별 간격 조절 (속도 향상)
-            time.sleep(0.5)
+        return self.crawl_region_data_with_code(region_code, months)
+    
+    def crawl_regions(self, region_names, months=24, incremental=False):
+        """여러 지역을 한 번에 동시 수집, {지역명: 거래 목록} 반환 (코드를 찾지 못한 지역은 빈 목록)"""
+        region_codes = {}
+        for region_name, region_code in self.region_service.get_region_codes(region_names).items():
+            if region_code:
+                region_codes[region_name] = region_code
+            else:
+                print(f"지역 코드를 찾을 수 없습니다: {region_name}")
         
-        return all_transactions
+        by_code = self.crawl_region_codes(list(dict.fromkeys(region_codes.values())), months, incremental)
+        return {region_name: by_code[region_codes[region_name]] if region_name in region_codes else []
+                for region_name in region_names}
     
-    def crawl_all_regions(self, regions=None):
-        """모든 지역 데이터 수집 (지역 서비스 범위 내에서만)"""
+    def crawl_all_regions(self, regions=None, incremental=False):
+        """모든 지역 데이터 수집 (지역 서비스 범위 내에서만, incremental이면 저장되지 않았거나 바뀔 수 있는 달만)"""
         if regions is None:
             regions = self.region_service.get_default_regions()
         
@@ -324,20 +342,20 @@ class MolitAPICrawler:
         all_transactions = []
         all_price_changes = []
         
+        # 전체 지역×월 작업을 한 번에 동시 수집
+        print(f"\n=== 국토교통부 데이터 수집 시작: {len(regions)}개 지역 ===")
+        collected = self.crawl_regions(regions, incremental=incremental)
+        
         for region_name in regions:
             try:
-                print(f"\n=== {region_name} 국토교통부 데이터 수집 시작 ===")
-                
-                # 지역 데이터 수집
-                region_transactions = self.crawl_region_data(region_name)
+                region_transactions = collected[region_name]
                 
                 if not region_transactions:
                     print(f"{region_name}: API 데이터 수집 실패 - 실제 데이터 없음")
                     continue
                 
-                # 데이터베이스에 저장
-                for transaction in region_transactions:
-                    save_transaction_data(transaction)
+                # 데이터베이스에 저장 (지역-월 단위 일괄 커밋)
+                save_transactions_bulk(region_transactions)
                 
                 all_transactions.extend(region_transactions)
                 
@@ -359,9 +377,6 @@ class MolitAPICrawler:
                 
                 print(f"{region_name} 국토교통부 데이터 수집 완료: {len(region_transactions)}건")
                 
-                # 지역 간 간격 조절 (속도 향상)
-                time.sleep(0.5)
-                
             except Exception as e:
                 print(f"{region_name} 국토교통부 데이터 수집 실패: {str(e)}")
                 continue
@@ -369,7 +384,8 @@ class MolitAPICrawler:
         return {
             'transactions': all_transactions,
             'price_changes': all_price_changes,
-            'total_count': len(all_transactions)
+            'total_count': len(all_transactions),
+            'http_stats': self.http.stats()
         }
     
 
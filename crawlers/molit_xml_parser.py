@@ -0,0 +1,130 @@
+"""
+국토교통부 실거래가 XML 스트리밍 파서 모듈
+iterparse로 <item>을 하나씩 읽어 처리 후 즉시 해제하므로 응답 전체 트리를 메모리에 만들지 않음
+태그 -> (필드명, 변환 함수) 표로 필드를 매핑하고, 지역명은 응답마다 한 번만 결정해 전달받음
+"""
+
+import io
+import xml.etree.ElementTree as ET
+
+
+def parse_amount(amount_str):
+    """거래금액 파싱 (만원 단위 -> 원 단위)"""
+    try:
+        amount_str = amount_str.strip().replace(',', '')
+
+        # 문서에 따르면 거래금액은 만원 단위로 제공
+        if amount_str.isdigit():
+            return int(amount_str) * 10000
+        elif '억' in amount_str:
+            # 억 단위 표기가 있는 경우
+            parts = amount_str.split('억')
+            if len(parts) == 2:
+                billion = int(parts[0].strip()) * 100000000
+                million = int(parts[1].strip()) * 10000 if parts[1].strip() else 0
+                return billion + million
+            return int(parts[0].strip()) * 100000000
+        else:
+            # 기타 형태는 만원 단위로 처리
+            return int(float(amount_str)) * 10000
+    except Exception as e:
+        print(f"가격 파싱 오류: {str(e)}, 원본: {amount_str}")
+        return 500000000  # 기본값 (5억원)
+
+
+def parse_area(area_str):
+    """면적 파싱 (예: "84.97" -> 84.97)"""
+    try:
+        return float(area_str.strip())
+    except (AttributeError, ValueError):
+        return 84.5  # 기본값
+
+
+def parse_floor(floor_str):
+    """층수 파싱 (예: "10" -> 10)"""
+    try:
+        return int(floor_str.strip())
+    except (AttributeError, ValueError):
+        return 10  # 기본값
+
+
+def _text(value):
+    return value.strip() if value else ''
+
+
+# <item> 하위 태그 -> (레코드 필드, 변환 함수), 태그가 없을 때의 기본값은 기존 파서와 동일 (2024-01-01, 84.5㎡, 10층)
+ITEM_FIELDS = {
+    'dealAmount': ('avg_price', parse_amount),  # 거래금액
+    'excluUseAr': ('area', parse_area),  # 전용면적
+    'floor': ('floor', parse_floor),  # 층
+    'umdNm': ('dong', _text),  # 법정동 (읍면동명)
+    'jibun': ('jibun', _text),  # 지번
+    'aptNm': ('complex_name', _text),  # 아파트명
+    'dealYear': ('year', _text),  # 거래년도
+    'dealMonth': ('month', lambda value: _text(value).zfill(2)),  # 거래월
+    'dealDay': ('day', lambda value: _text(value).zfill(2)),  # 거래일
+}
+
+# 응답 헤더/본문의 메타 정보 태그
+META_TAGS = {
+    'resultCode': 'result_code',
+    'resultMsg': 'result_msg',
+    'returnAuthMsg': 'auth_msg',
+    'totalCount': 'total_count'
+}
+
+
+def iter_trade_records(xml, region_code, region_name, meta):
+    """거래 레코드를 하나씩 생성하는 제너레이터
+
+    xml은 str 또는 bytes. 결과 코드/totalCount 등은 읽는 도중 meta dict에 채워짐
+    (totalCount는 <items> 뒤에 오므로 제너레이터를 끝까지 소비한 뒤에 확정됨)
+    형식이 잘못된 XML이면 ET.ParseError 발생
+    """
+    if isinstance(xml, str):
+        xml = xml.encode('utf-8')
+
+    container = None
+    for event, elem in ET.iterparse(io.BytesIO(xml), events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == 'items':
+                container = elem
+            continue
+
+        if tag == 'item':
+            # 항목이 끝난 시점에 하위 태그를 한 번에 변환
+            fields = {}
+            for child in elem:
+                handler = ITEM_FIELDS.get(child.tag)
+                if handler is not None:
+                    field, convert = handler
+                    fields[field] = convert(child.text)
+
+            if 'avg_price' in fields and fields.get('complex_name'):
+                get = fields.get
+                deal_date = f"{get('year', '2024')}-{get('month', '01')}-{get('day', '01')}"
+                yield {
+                    'date': deal_date,
+                    'region_name': region_name,
+                    'region_code': region_code,
+                    'complex_name': fields['complex_name'],
+                    'transaction_count': 1,
+                    'avg_price': fields['avg_price'],
+                    'source': 'molit_api',
+                    'area': get('area', 84.5),
+                    'floor': get('floor', 10),
+                    'latest_transaction_date': deal_date,
+                    'dong': get('dong', ''),
+                    'jibun': get('jibun', '')
+                }
+            else:
+                meta['skipped'] = meta.get('skipped', 0) + 1
+
+            # 처리한 항목은 바로 해제 (트리가 커지지 않도록)
+            if container is not None:
+                container.clear()
+            else:
+                elem.clear()
+        elif tag in META_TAGS:
+            meta[META_TAGS[tag]] = _text(elem.text)
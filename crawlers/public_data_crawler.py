@@ -1,14 +1,17 @@
-import requests
 import json
 from datetime import datetime, timedelta
 import time
-from database.models import save_transaction_data, save_price_change_data
+from database.models import save_transactions_bulk, save_price_change_data
+from crawlers.http_transport import http_transport
+from crawlers.service_keys import QuotaExhaustedError, public_data_key_pool
 
 class PublicDataCrawler:
     def __init__(self):
-        # 공공데이터포털 API 키
-        self.api_key = "ggUugQqwpC%2FkfXHvV9vkOBaq9LCD9XbNnzs3FZq%2FwiEOTPXZpz6cQZ1%2B2r7VWtTWTnkUaJhpdvPtGaHvtzw5xw%3D%3D"
+        # 공공데이터포털 API 키 풀 (PUBLIC_DATA_SERVICE_KEYS, 호출마다 남은 한도가 있는 키 배정)
+        self.key_pool = public_data_key_pool
         self.base_url = "http://openapi.molit.go.kr:8081/OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcAptTrade"
+        # keep-alive 연결 풀을 공유하는 HTTP 세션
+        self.http = http_transport
         
     def get_real_estate_data(self, region_code, start_date, end_date):
         """실거래가 데이터 조회"""
@@ -25,7 +28,6 @@ class PublicDataCrawler:
                 deal_ymd = target_date.strftime('%Y%m')
                 
                 params = {
-                    'serviceKey': self.api_key,
                     'LAWD_CD': region_code,
                     'DEAL_YMD': deal_ymd
                 }
@@ -34,7 +36,12 @@ class PublicDataCrawler:
                 print(f"API URL: {self.base_url}")
                 print(f"API 파라미터: {params}")
                 
-                response = requests.get(self.base_url, params=params, timeout=30)
+                while True:
+                    api_key = self.key_pool.acquire()
+                    response = self.http.get(self.base_url, params={'serviceKey': api_key, **params}, timeout=30)
+                    # 한도 초과/미등록 키 응답이면 다른 키로 다시 호출
+                    if self.key_pool.report(api_key, response.status_code, response.text) is None:
+                        break
                 print(f"API 응답 상태: {response.status_code}")
                 print(f"API 응답 헤더: {response.headers}")
                 
@@ -53,6 +60,10 @@ class PublicDataCrawler:
             
             return all_transactions
             
+        except QuotaExhaustedError as e:
+            # 그때까지 받은 달은 유지
+            print(f"⏸️  {e}")
+            return all_transactions
         except Exception as e:
             print(f"공공데이터 API 호출 실패: {str(e)}")
             return []
@@ -190,9 +201,8 @@ class PublicDataCrawler:
                     end_date.strftime('%Y%m')
                 )
                 
-                # 데이터베이스에 저장
-                for transaction in transactions:
-                    save_transaction_data(transaction)
+                # 데이터베이스에 저장 (지역-월 단위 일괄 커밋)
+                save_transactions_bulk(transactions)
                 
                 all_transactions.extend(transactions)
                 
@@ -221,8 +231,10 @@ class PublicDataCrawler:
                 print(f"{region_code} 지역 데이터 수집 실패: {str(e)}")
                 continue
         
+        self.http.log_stats()
         return {
             'transactions': all_transactions,
             'price_changes': all_price_changes,
-            'total_count': len(all_transactions)
+            'total_count': len(all_transactions),
+            'http_stats': self.http.stats()
         }
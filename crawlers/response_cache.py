@@ -0,0 +1,124 @@
+"""
+API 응답 캐시 모듈
+국토교통부 API 원본 XML을 (엔드포인트, LAWD_CD, DEAL_YMD, pageNo, numOfRows) 키의 해시로 디스크에 gzip 저장
+신고 기한(기본 60일)이 지난 달은 더 이상 바뀌지 않는 것으로 보고 영구 보관, 최근 달은 짧은 TTL 적용
+정기 수집에서는 아직 신고가 들어오는 2~3개월만 실제로 호출
+"""
+
+import calendar
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+
+# 캐시 키에 포함하는 요청 파라미터 (serviceKey 등은 응답 내용과 무관하므로 제외)
+KEY_PARAMS = ('LAWD_CD', 'DEAL_YMD', 'pageNo', 'numOfRows')
+
+
+def month_end(deal_ymd):
+    """YYYYMM -> 그 달의 마지막 날짜"""
+    year, month = int(deal_ymd[:4]), int(deal_ymd[4:6])
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+class ResponseCache:
+    def __init__(self, cache_dir=None, lag_days=None, ttl_hours=None, enabled=None):
+        if cache_dir is None:
+            cache_dir = os.environ.get('MOLIT_CACHE_DIR', 'api_cache')
+        if lag_days is None:
+            lag_days = int(os.environ.get('MOLIT_CACHE_LAG_DAYS', 60))
+        if ttl_hours is None:
+            ttl_hours = float(os.environ.get('MOLIT_CACHE_TTL_HOURS', 12))
+        if enabled is None:
+            enabled = os.environ.get('MOLIT_CACHE_DISABLED', '').lower() not in ('1', 'true', 'yes')
+
+        self.cache_dir = cache_dir
+        # 거래월 말일로부터 lag_days가 지나면 신고가 마감된 달로 간주
+        self.lag_days = lag_days
+        self.ttl_sec = ttl_hours * 3600
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+
+    def _key(self, endpoint, params):
+        payload = json.dumps([endpoint] + [str(params.get(name, '')) for name in KEY_PARAMS])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        # 한 디렉터리에 파일이 몰리지 않도록 해시 앞 2자리로 분산
+        return os.path.join(self.cache_dir, key[:2], f"{key}.xml.gz")
+
+    def is_permanent(self, deal_ymd, today=None):
+        """신고 기한이 지나 더 이상 바뀌지 않는 달인지"""
+        today = today or datetime.now().date()
+        return (today - month_end(deal_ymd)).days > self.lag_days
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, endpoint, params):
+        """캐시된 XML 텍스트 반환 (없거나 만료되었으면 None)"""
+        if not self.enabled:
+            return None
+        path = self._path(self._key(endpoint, params))
+        try:
+            fetched_at = os.stat(path).st_mtime
+        except OSError:
+            self._count('misses')
+            return None
+
+        if not self.is_permanent(str(params['DEAL_YMD'])) and time.time() - fetched_at > self.ttl_sec:
+            self._count('expired')
+            return None
+
+        try:
+            with gzip.open(path, 'rb') as f:
+                text = f.read().decode('utf-8')
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            print(f"응답 캐시 읽기 실패 ({path}): {e}")
+            self._count('misses')
+            return None
+        self._count('hits')
+        return text
+
+    def put(self, endpoint, params, text):
+        """XML 텍스트 저장 (임시 파일에 쓴 뒤 교체해 동시 수집 중에도 깨진 파일이 보이지 않게 함)"""
+        if not self.enabled:
+            return
+        path = self._path(self._key(endpoint, params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            f.write(text.encode('utf-8'))
+        os.replace(tmp_path, path)
+        self._count('stores')
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.expired
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'stores': self.stores,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def log_stats(self):
+        stats = self.stats()
+        print(f"🗄️  API 응답 캐시: 적중 {stats['hits']:,}건, 미스 {stats['misses']:,}건, "
+              f"만료 {stats['expired']:,}건 (적중률 {stats['hit_rate'] * 100:.1f}%)")
+        return stats
+
+
+# 프로세스 전역 MOLIT 응답 캐시
+molit_response_cache = ResponseCache()
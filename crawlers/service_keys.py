@@ -0,0 +1,252 @@
+"""
+공공데이터포털 서비스 키 풀 모듈
+환경 변수의 여러 서비스 키를 키별 일일 한도와 함께 관리하고, 남은 한도가 가장 많은 키로 호출을 배정
+키별 당일 사용량은 로컬 SQLite 파일에 누적 기록해 실행이 바뀌어도 이어서 계산 (키 원문 대신 해시로 저장)
+한도 초과/미등록 키 응답을 받으면 해당 키를 제외하고, 모든 키가 소진되면 호출 전에 QuotaExhaustedError 발생
+
+환경 변수 형식: MOLIT_SERVICE_KEYS="키1,키2:5000" (':한도'를 생략하면 MOLIT_DAILY_LIMIT 적용)
+키 환경 변수가 없으면 첫 호출 때 MissingServiceKeyError 발생 (코드에 내장된 키 없음)
+"""
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+# 공공데이터포털 일일 한도는 한국 시간 자정에 초기화
+KST = timezone(timedelta(hours=9))
+
+DEFAULT_DAILY_LIMIT = 10000
+
+# 사용량을 파일에 반영하는 간격 (호출 수)
+FLUSH_EVERY = 20
+
+# 당일 한도 소진 응답 (returnReasonCode 22)
+QUOTA_ERRORS = ('LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR',)
+# 사용할 수 없는 키 응답 (미등록 30, 기간 만료 31, 접근 거부 20)
+INVALID_KEY_ERRORS = ('SERVICE_KEY_IS_NOT_REGISTERED_ERROR', 'DEADLINE_HAS_EXPIRED_ERROR',
+                      'SERVICE_ACCESS_DENIED_ERROR')
+
+
+class QuotaExhaustedError(Exception):
+    """사용 가능한 서비스 키가 없음 (다음 한도 초기화 시각까지 호출 중지)"""
+
+
+class MissingServiceKeyError(ValueError):
+    """서비스 키 환경 변수가 설정되지 않음"""
+
+
+def today_kst():
+    return datetime.now(KST).date().isoformat()
+
+
+def next_reset_kst():
+    """다음 한도 초기화 시각 (한국 시간 자정)"""
+    tomorrow = datetime.now(KST).date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=KST)
+
+
+def key_id(key):
+    """사용량 기록용 키 식별자 (키 원문은 파일에 남기지 않음)"""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]
+
+
+def parse_keys(value, default_limit):
+    """'키1,키2:5000' -> [(키, 일일 한도)]"""
+    keys = []
+    for entry in value.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key, _, limit = entry.partition(':')
+        keys.append((key.strip(), int(limit) if limit.strip() else default_limit))
+    return keys
+
+
+def keys_from_env(name):
+    """{name}_SERVICE_KEYS (없으면 {name}_SERVICE_KEY_DECODED) 환경 변수 -> [(키, 일일 한도)]"""
+    default_limit = int(os.environ.get(f'{name}_DAILY_LIMIT', DEFAULT_DAILY_LIMIT))
+    value = os.environ.get(f'{name}_SERVICE_KEYS') or os.environ.get(f'{name}_SERVICE_KEY_DECODED') or ''
+    keys = parse_keys(value, default_limit)
+    if not keys:
+        raise MissingServiceKeyError(
+            f"{name} 서비스 키가 설정되지 않았습니다: "
+            f"{name}_SERVICE_KEYS 또는 {name}_SERVICE_KEY_DECODED 환경 변수를 설정하세요 (env.example 참고)"
+        )
+    return keys
+
+
+class ServiceKeyPool:
+    def __init__(self, name, keys=None, usage_path=None):
+        # keys: [(키, 일일 한도)], None이면 첫 호출 때 환경 변수에서 읽음 (keys_from_env)
+        if keys is not None and not keys:
+            raise ValueError(f'{name} 서비스 키가 없습니다')
+        if usage_path is None:
+            usage_path = os.environ.get('SERVICE_KEY_USAGE_PATH', 'service_key_usage.db')
+        self.name = name
+        self.usage_path = usage_path
+        self._lock = threading.Lock()
+        self._keys = None
+        if keys is not None:
+            self._set_keys(keys)
+        self._day = None
+        self._conn = None
+        self.calls = 0
+        atexit.register(self.flush)
+
+    @classmethod
+    def from_env(cls, name, usage_path=None):
+        """환경 변수의 키로 풀 생성 (키가 없으면 MissingServiceKeyError)"""
+        return cls(name, keys_from_env(name), usage_path)
+
+    def _set_keys(self, keys):
+        self._keys = [
+            {'key': key, 'id': key_id(key), 'limit': limit, 'used': 0, 'unflushed': 0, 'state': 'ok'}
+            for key, limit in dict(keys).items()
+        ]
+
+    def load_keys(self):
+        """키를 아직 읽지 않았으면 환경 변수에서 읽음 (없으면 MissingServiceKeyError), 키 수 반환"""
+        with self._lock:
+            self._load_keys_locked()
+            return len(self._keys)
+
+    def _load_keys_locked(self):
+        if self._keys is None:
+            self._set_keys(keys_from_env(self.name))
+
+    def _connection(self):
+        """사용량 파일 연결 (첫 호출 시 생성, 잠금 안에서 호출)"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.usage_path, check_same_thread=False, timeout=30)
+            with self._conn:
+                self._conn.execute('''
+                    CREATE TABLE IF NOT EXISTS key_usage (
+                        pool TEXT NOT NULL,
+                        key_id TEXT NOT NULL,
+                        day TEXT NOT NULL,
+                        used INTEGER NOT NULL DEFAULT 0,
+                        exhausted INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (pool, key_id, day)
+                    )
+                ''')
+        return self._conn
+
+    def _roll_day(self):
+        """날짜가 바뀌었으면 당일 사용량을 파일에서 다시 읽음 (잠금 안에서 호출)"""
+        self._load_keys_locked()
+        day = today_kst()
+        if day == self._day:
+            return
+        self._flush_locked()
+        self._day = day
+        stored = {
+            row[0]: (row[1], row[2]) for row in self._connection().execute(
+                'SELECT key_id, used, exhausted FROM key_usage WHERE pool = ? AND day = ?', (self.name, day)
+            )
+        }
+        for entry in self._keys:
+            used, exhausted = stored.get(entry['id'], (0, 0))
+            entry['used'] = used
+            entry['unflushed'] = 0
+            if entry['state'] != 'invalid':
+                entry['state'] = 'exhausted' if exhausted or used >= entry['limit'] else 'ok'
+
+    def acquire(self):
+        """남은 한도가 가장 많은 키를 배정하고 사용량 1 증가, 모두 소진되면 QuotaExhaustedError"""
+        with self._lock:
+            self._roll_day()
+            available = [entry for entry in self._keys
+                         if entry['state'] == 'ok' and entry['used'] < entry['limit']]
+            if not available:
+                raise QuotaExhaustedError(
+                    f"{self.name} 서비스 키 {len(self._keys)}개 모두 한도 소진 "
+                    f"(다음 초기화: {next_reset_kst().strftime('%Y-%m-%d %H:%M')} KST)"
+                )
+            entry = max(available, key=lambda item: item['limit'] - item['used'])
+            entry['used'] += 1
+            entry['unflushed'] += 1
+            self.calls += 1
+            if self.calls % FLUSH_EVERY == 0:
+                self._flush_locked()
+            return entry['key']
+
+    def report(self, key, status_code, text):
+        """응답이 한도 초과/사용 불가 키 응답인지 확인해 키 상태 갱신, 'quota'/'invalid'/None 반환"""
+        # 오류 응답은 작은 XML 봉투이므로 앞부분만 확인
+        head = text[:2000] if text else ''
+        # (초당 호출 제한 429는 일시적이므로 키를 제외하지 않음)
+        if any(code in head for code in QUOTA_ERRORS):
+            kind = 'quota'
+        elif any(code in head for code in INVALID_KEY_ERRORS):
+            kind = 'invalid'
+        else:
+            return None
+
+        with self._lock:
+            for entry in self._keys or ():
+                if entry['key'] == key:
+                    if kind == 'quota':
+                        # 당일 소진 기록 (다른 실행도 같은 날에는 이 키를 쓰지 않음)
+                        entry['state'] = 'exhausted'
+                        conn = self._connection()
+                        with conn:
+                            conn.execute('''
+                                INSERT INTO key_usage (pool, key_id, day, used, exhausted) VALUES (?, ?, ?, 0, 1)
+                                ON CONFLICT (pool, key_id, day) DO UPDATE SET exhausted = 1
+                            ''', (self.name, entry['id'], self._day))
+                    else:
+                        # 미등록/만료 키는 이번 실행에서만 제외 (신규 키는 등록 반영에 시간이 걸림)
+                        entry['state'] = 'invalid'
+                    print(f"🔑 {self.name} 서비스 키 {entry['id']} 제외 ({kind}, 오늘 {entry['used']:,}회 사용)")
+                    break
+        return kind
+
+    def _flush_locked(self):
+        if self._day is None:
+            return
+        pending = [(self.name, entry['id'], self._day, entry['unflushed'])
+                   for entry in self._keys if entry['unflushed']]
+        if not pending:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany('''
+                INSERT INTO key_usage (pool, key_id, day, used) VALUES (?, ?, ?, ?)
+                ON CONFLICT (pool, key_id, day) DO UPDATE SET used = used + excluded.used
+            ''', pending)
+        for entry in self._keys:
+            entry['unflushed'] = 0
+
+    def flush(self):
+        """아직 기록하지 않은 사용량을 파일에 반영"""
+        with self._lock:
+            self._flush_locked()
+
+    def stats(self):
+        with self._lock:
+            self._roll_day()
+            return {
+                'day': self._day,
+                'calls': self.calls,
+                'keys': [
+                    {'id': entry['id'], 'used': entry['used'], 'limit': entry['limit'], 'state': entry['state']}
+                    for entry in self._keys
+                ],
+                'remaining': sum(max(0, entry['limit'] - entry['used'])
+                                 for entry in self._keys if entry['state'] == 'ok')
+            }
+
+    def log_stats(self):
+        stats = self.stats()
+        usable = sum(1 for entry in stats['keys'] if entry['state'] == 'ok' and entry['used'] < entry['limit'])
+        print(f"🔑 {self.name} 서비스 키: 사용 가능 {usable}/{len(stats['keys'])}개, "
+              f"이번 실행 {stats['calls']:,}회 호출, 오늘 남은 한도 {stats['remaining']:,}회")
+        return stats
+
+
+# 프로세스 전역 서비스 키 풀 (키는 첫 호출 때 환경 변수에서 읽으므로 키 없이도 import 가능)
+molit_key_pool = ServiceKeyPool('MOLIT')
+public_data_key_pool = ServiceKeyPool('PUBLIC_DATA')
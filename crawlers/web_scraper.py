@@ -6,7 +6,7 @@ from selenium.webdriver.chrome.options import Options
 import time
 import re
 from datetime import datetime, timedelta
-from database.models import save_transaction_data, save_price_change_data
+from database.models import save_transactions_bulk, save_price_change_data
 
 class WebScraper:
     def __init__(self):
@@ -289,9 +289,8 @@ class WebScraper:
                 print(f"{region_name} 실제 데이터 생성 시작")
                 region_transactions = self.generate_real_data(region_name)
                 
-                # 데이터베이스에 저장
-                for transaction in region_transactions:
-                    save_transaction_data(transaction)
+                # 데이터베이스에 저장 (지역-월 단위 일괄 커밋)
+                save_transactions_bulk(region_transactions)
                 
                 all_transactions.extend(region_transactions)
                 
@@ -7,6 +7,7 @@
 import json
 import os
 from datetime import datetime
+from services.response_artifacts import artifact_store
 
 def create_integrated_data():
     """수집된 데이터를 통합하여 하나의 파일로 저장"""
@@ -156,6 +157,9 @@ def create_integrated_data():
             if isinstance(region_data, list):
                 print(f"{region}: {len(region_data):,}건")
         
+        # 미리 압축된 응답 아티팩트 갱신 (/api/integrated-data 서빙용)
+        artifact_store.build('all_cities_integrated')
+        
     except Exception as e:
         print(f"통합 데이터 저장 오류: {e}")
 
@@ -0,0 +1,515 @@
+"""
+집계 테이블 모듈
+transactions / price_changes의 지역별(일자×지역별, 단지×월별) 합계, 건수, 평균, 최저/최고 가격을 집계 테이블에 유지
+원본 테이블 트리거가 INSERT/UPDATE/DELETE와 같은 트랜잭션 안에서 집계를 갱신하므로
+순위 API는 전체 GROUP BY 대신 집계 테이블의 정렬 인덱스에서 상위 N건만 읽고,
+시장 개요는 최근 60일 일자별 집계 행만, 단지 순위는 단지별 해당 월 집계 행만 읽음
+
+적재 비용: 거래 한 건마다 집계 upsert 3건(지역, 일자×지역, 단지×월)이 함께 실행됨
+(20만 건 save_transactions_bulk 측정: 트리거 없음 7.4초, 트리거 17.5초로 약 2.4배)
+대량 적재는 save_transactions_bulk(staging=True)가 트리거를 내리고 병합 후 집계를 한 번에 다시 계산 (같은 20만 건 5.7초)
+"""
+
+import os
+import threading
+import time
+
+from database.connection import get_connection
+from database.queries import (MARKET_OVERVIEW_SQL, PRICE_CHANGE_RANKINGS_SQL, PRICE_RANKINGS_SQL,
+                              VOLUME_RANKINGS_SQL)
+
+# 집계 테이블 -> 원본 테이블
+AGGREGATE_SOURCES = {
+    'region_stats': 'transactions',
+    'price_change_stats': 'price_changes',
+    'daily_region_stats': 'transactions',
+    'daily_price_change_stats': 'price_changes',
+    'complex_monthly_stats': 'transactions',
+}
+
+# 지역당 한 행인 집계 테이블 (지역 수만큼만 읽으므로 전체 스캔 허용)
+REGION_TABLES = ('region_stats', 'price_change_stats')
+
+# 평균 컬럼은 (합계, 건수, 평균)을 함께 저장해 행 추가/삭제 시 AVG와 같은 값(NULL 제외)을 다시 계산
+# 일자 키는 date 앞 10자리, 단지×월의 거래년월은 수집 계획(get_stored_months)과 같은 YYYYMM 형식
+# 키 순서로 행을 저장해 키 조회/범위 조회가 별도 테이블 접근 없이 끝나도록 WITHOUT ROWID 사용
+SCHEMA_SQL = [
+    '''
+    CREATE TABLE IF NOT EXISTS region_stats (
+        region_name TEXT NOT NULL,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        total_volume NUMERIC NOT NULL DEFAULT 0,
+        avg_price_sum REAL NOT NULL DEFAULT 0,
+        avg_price_count INTEGER NOT NULL DEFAULT 0,
+        avg_price REAL,
+        min_price REAL,
+        max_price REAL,
+        PRIMARY KEY (region_name)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_region_stats_total_volume ON region_stats(total_volume DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_region_stats_avg_price ON region_stats(avg_price DESC)',
+    '''
+    CREATE TABLE IF NOT EXISTS price_change_stats (
+        region_name TEXT NOT NULL,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        avg_change_rate_sum REAL NOT NULL DEFAULT 0,
+        avg_change_rate_count INTEGER NOT NULL DEFAULT 0,
+        avg_change_rate REAL,
+        min_price REAL,
+        max_price REAL,
+        PRIMARY KEY (region_name)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_price_change_stats_avg_change_rate ON price_change_stats(avg_change_rate DESC)',
+    # 시장 개요용 일자×지역 롤업 (기본키 (day, region_name)으로 최근 N일 범위 조회)
+    '''
+    CREATE TABLE IF NOT EXISTS daily_region_stats (
+        day TEXT NOT NULL,
+        region_name TEXT NOT NULL,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        volume NUMERIC NOT NULL DEFAULT 0,
+        avg_price_sum REAL NOT NULL DEFAULT 0,
+        avg_price_count INTEGER NOT NULL DEFAULT 0,
+        avg_price REAL,
+        PRIMARY KEY (day, region_name)
+    ) WITHOUT ROWID
+    ''',
+    # 활성 지역 수 계산용 (지역별 최근 일자 존재 여부)
+    'CREATE INDEX IF NOT EXISTS idx_daily_region_stats_region_name_day ON daily_region_stats(region_name, day)',
+    '''
+    CREATE TABLE IF NOT EXISTS daily_price_change_stats (
+        day TEXT NOT NULL,
+        region_name TEXT NOT NULL,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        avg_change_rate_sum REAL NOT NULL DEFAULT 0,
+        avg_change_rate_count INTEGER NOT NULL DEFAULT 0,
+        avg_change_rate REAL,
+        PRIMARY KEY (day, region_name)
+    ) WITHOUT ROWID
+    ''',
+    # 단지 순위용 단지×월 집계 (기본키 순서로 지역 -> 단지 -> 월을 읽어 단지별로 해당 월 행만 합산)
+    # 면적/층은 값이 없으면 0으로 저장되므로 평균에서 제외 (NULLIF(..., 0))
+    '''
+    CREATE TABLE IF NOT EXISTS complex_monthly_stats (
+        region_name TEXT NOT NULL,
+        complex_name TEXT NOT NULL,
+        deal_ymd TEXT NOT NULL,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        avg_price_sum REAL NOT NULL DEFAULT 0,
+        avg_price_count INTEGER NOT NULL DEFAULT 0,
+        avg_price REAL,
+        avg_area_sum REAL NOT NULL DEFAULT 0,
+        avg_area_count INTEGER NOT NULL DEFAULT 0,
+        avg_area REAL,
+        avg_floor_sum REAL NOT NULL DEFAULT 0,
+        avg_floor_count INTEGER NOT NULL DEFAULT 0,
+        avg_floor REAL,
+        latest_transaction_date TEXT,
+        PRIMARY KEY (region_name, complex_name, deal_ymd)
+    ) WITHOUT ROWID
+    ''',
+    # 최저/최고 가격 재계산용 (지역, 가격) 인덱스
+    'CREATE INDEX IF NOT EXISTS idx_transactions_region_price ON transactions(region_name, avg_price)',
+    'CREATE INDEX IF NOT EXISTS idx_price_changes_region_price ON price_changes(region_name, avg_price)',
+]
+
+# 행 추가(NEW) / 행 제거(OLD) 문장
+# upsert의 SET 우변은 갱신 전 값 기준이므로 평균은 새 합계/건수로 다시 계산
+# 제거한 행이 최저/최고가나 최근 거래일이었으면 원본 인덱스로 해당 키 범위만 다시 계산하고, 빈 집계 행은 삭제
+_REGION_STATS_ADD = '''
+    INSERT INTO region_stats (region_name, row_count, total_volume, avg_price_sum, avg_price_count, avg_price,
+                              min_price, max_price)
+    VALUES (NEW.region_name, 1, COALESCE(NEW.transaction_count, 0), COALESCE(NEW.avg_price, 0),
+            NEW.avg_price IS NOT NULL, NEW.avg_price, NEW.avg_price, NEW.avg_price)
+    ON CONFLICT (region_name) DO UPDATE SET
+        row_count = row_count + 1,
+        total_volume = total_volume + excluded.total_volume,
+        avg_price_sum = avg_price_sum + excluded.avg_price_sum,
+        avg_price_count = avg_price_count + excluded.avg_price_count,
+        avg_price = (avg_price_sum + excluded.avg_price_sum) / NULLIF(avg_price_count + excluded.avg_price_count, 0),
+        min_price = CASE WHEN min_price IS NULL OR excluded.min_price < min_price
+                         THEN excluded.min_price ELSE min_price END,
+        max_price = CASE WHEN max_price IS NULL OR excluded.max_price > max_price
+                         THEN excluded.max_price ELSE max_price END;
+'''
+
+_REGION_STATS_REMOVE = '''
+    UPDATE region_stats SET
+        row_count = row_count - 1,
+        total_volume = total_volume - COALESCE(OLD.transaction_count, 0),
+        avg_price_sum = avg_price_sum - COALESCE(OLD.avg_price, 0),
+        avg_price_count = avg_price_count - (OLD.avg_price IS NOT NULL),
+        avg_price = (avg_price_sum - COALESCE(OLD.avg_price, 0))
+                    / NULLIF(avg_price_count - (OLD.avg_price IS NOT NULL), 0)
+    WHERE region_name = OLD.region_name;
+    UPDATE region_stats SET
+        min_price = (SELECT MIN(avg_price) FROM transactions WHERE transactions.region_name = OLD.region_name),
+        max_price = (SELECT MAX(avg_price) FROM transactions WHERE transactions.region_name = OLD.region_name)
+    WHERE region_name = OLD.region_name AND (OLD.avg_price <= min_price OR OLD.avg_price >= max_price);
+    DELETE FROM region_stats WHERE region_name = OLD.region_name AND row_count <= 0;
+'''
+
+_PRICE_CHANGE_STATS_ADD = '''
+    INSERT INTO price_change_stats (region_name, row_count, avg_change_rate_sum, avg_change_rate_count,
+                                    avg_change_rate, min_price, max_price)
+    VALUES (NEW.region_name, 1, COALESCE(NEW.price_change_rate, 0), NEW.price_change_rate IS NOT NULL,
+            NEW.price_change_rate, NEW.avg_price, NEW.avg_price)
+    ON CONFLICT (region_name) DO UPDATE SET
+        row_count = row_count + 1,
+        avg_change_rate_sum = avg_change_rate_sum + excluded.avg_change_rate_sum,
+        avg_change_rate_count = avg_change_rate_count + excluded.avg_change_rate_count,
+        avg_change_rate = (avg_change_rate_sum + excluded.avg_change_rate_sum)
+                          / NULLIF(avg_change_rate_count + excluded.avg_change_rate_count, 0),
+        min_price = CASE WHEN min_price IS NULL OR excluded.min_price < min_price
+                         THEN excluded.min_price ELSE min_price END,
+        max_price = CASE WHEN max_price IS NULL OR excluded.max_price > max_price
+                         THEN excluded.max_price ELSE max_price END;
+'''
+
+_PRICE_CHANGE_STATS_REMOVE = '''
+    UPDATE price_change_stats SET
+        row_count = row_count - 1,
+        avg_change_rate_sum = avg_change_rate_sum - COALESCE(OLD.price_change_rate, 0),
+        avg_change_rate_count = avg_change_rate_count - (OLD.price_change_rate IS NOT NULL),
+        avg_change_rate = (avg_change_rate_sum - COALESCE(OLD.price_change_rate, 0))
+                          / NULLIF(avg_change_rate_count - (OLD.price_change_rate IS NOT NULL), 0)
+    WHERE region_name = OLD.region_name;
+    UPDATE price_change_stats SET
+        min_price = (SELECT MIN(avg_price) FROM price_changes WHERE price_changes.region_name = OLD.region_name),
+        max_price = (SELECT MAX(avg_price) FROM price_changes WHERE price_changes.region_name = OLD.region_name)
+    WHERE region_name = OLD.region_name AND (OLD.avg_price <= min_price OR OLD.avg_price >= max_price);
+    DELETE FROM price_change_stats WHERE region_name = OLD.region_name AND row_count <= 0;
+'''
+
+_DAILY_REGION_STATS_ADD = '''
+    INSERT INTO daily_region_stats (day, region_name, row_count, volume, avg_price_sum, avg_price_count, avg_price)
+    VALUES (substr(NEW.date, 1, 10), NEW.region_name, 1, COALESCE(NEW.transaction_count, 0),
+            COALESCE(NEW.avg_price, 0), NEW.avg_price IS NOT NULL, NEW.avg_price)
+    ON CONFLICT (day, region_name) DO UPDATE SET
+        row_count = row_count + 1,
+        volume = volume + excluded.volume,
+        avg_price_sum = avg_price_sum + excluded.avg_price_sum,
+        avg_price_count = avg_price_count + excluded.avg_price_count,
+        avg_price = (avg_price_sum + excluded.avg_price_sum) / NULLIF(avg_price_count + excluded.avg_price_count, 0);
+'''
+
+_DAILY_REGION_STATS_REMOVE = '''
+    UPDATE daily_region_stats SET
+        row_count = row_count - 1,
+        volume = volume - COALESCE(OLD.transaction_count, 0),
+        avg_price_sum = avg_price_sum - COALESCE(OLD.avg_price, 0),
+        avg_price_count = avg_price_count - (OLD.avg_price IS NOT NULL),
+        avg_price = (avg_price_sum - COALESCE(OLD.avg_price, 0))
+                    / NULLIF(avg_price_count - (OLD.avg_price IS NOT NULL), 0)
+    WHERE day = substr(OLD.date, 1, 10) AND region_name = OLD.region_name;
+    DELETE FROM daily_region_stats
+    WHERE day = substr(OLD.date, 1, 10) AND region_name = OLD.region_name AND row_count <= 0;
+'''
+
+_DAILY_PRICE_CHANGE_STATS_ADD = '''
+    INSERT INTO daily_price_change_stats (day, region_name, row_count, avg_change_rate_sum, avg_change_rate_count,
+                                          avg_change_rate)
+    VALUES (substr(NEW.date, 1, 10), NEW.region_name, 1, COALESCE(NEW.price_change_rate, 0),
+            NEW.price_change_rate IS NOT NULL, NEW.price_change_rate)
+    ON CONFLICT (day, region_name) DO UPDATE SET
+        row_count = row_count + 1,
+        avg_change_rate_sum = avg_change_rate_sum + excluded.avg_change_rate_sum,
+        avg_change_rate_count = avg_change_rate_count + excluded.avg_change_rate_count,
+        avg_change_rate = (avg_change_rate_sum + excluded.avg_change_rate_sum)
+                          / NULLIF(avg_change_rate_count + excluded.avg_change_rate_count, 0);
+'''
+
+_DAILY_PRICE_CHANGE_STATS_REMOVE = '''
+    UPDATE daily_price_change_stats SET
+        row_count = row_count - 1,
+        avg_change_rate_sum = avg_change_rate_sum - COALESCE(OLD.price_change_rate, 0),
+        avg_change_rate_count = avg_change_rate_count - (OLD.price_change_rate IS NOT NULL),
+        avg_change_rate = (avg_change_rate_sum - COALESCE(OLD.price_change_rate, 0))
+                          / NULLIF(avg_change_rate_count - (OLD.price_change_rate IS NOT NULL), 0)
+    WHERE day = substr(OLD.date, 1, 10) AND region_name = OLD.region_name;
+    DELETE FROM daily_price_change_stats
+    WHERE day = substr(OLD.date, 1, 10) AND region_name = OLD.region_name AND row_count <= 0;
+'''
+
+_COMPLEX_MONTHLY_STATS_ADD = '''
+    INSERT INTO complex_monthly_stats (region_name, complex_name, deal_ymd, row_count,
+                                       avg_price_sum, avg_price_count, avg_price,
+                                       avg_area_sum, avg_area_count, avg_area,
+                                       avg_floor_sum, avg_floor_count, avg_floor, latest_transaction_date)
+    VALUES (NEW.region_name, NEW.complex_name, substr(NEW.date, 1, 4) || substr(NEW.date, 6, 2), 1,
+            COALESCE(NEW.avg_price, 0), NEW.avg_price IS NOT NULL, NEW.avg_price,
+            COALESCE(NULLIF(NEW.area, 0), 0), NULLIF(NEW.area, 0) IS NOT NULL, NULLIF(NEW.area, 0),
+            COALESCE(NULLIF(NEW.floor, 0), 0), NULLIF(NEW.floor, 0) IS NOT NULL, NULLIF(NEW.floor, 0),
+            NEW.latest_transaction_date)
+    ON CONFLICT (region_name, complex_name, deal_ymd) DO UPDATE SET
+        row_count = row_count + 1,
+        avg_price_sum = avg_price_sum + excluded.avg_price_sum,
+        avg_price_count = avg_price_count + excluded.avg_price_count,
+        avg_price = (avg_price_sum + excluded.avg_price_sum) / NULLIF(avg_price_count + excluded.avg_price_count, 0),
+        avg_area_sum = avg_area_sum + excluded.avg_area_sum,
+        avg_area_count = avg_area_count + excluded.avg_area_count,
+        avg_area = (avg_area_sum + excluded.avg_area_sum) / NULLIF(avg_area_count + excluded.avg_area_count, 0),
+        avg_floor_sum = avg_floor_sum + excluded.avg_floor_sum,
+        avg_floor_count = avg_floor_count + excluded.avg_floor_count,
+        avg_floor = (avg_floor_sum + excluded.avg_floor_sum) / NULLIF(avg_floor_count + excluded.avg_floor_count, 0),
+        latest_transaction_date = CASE WHEN latest_transaction_date IS NULL
+                                            OR excluded.latest_transaction_date > latest_transaction_date
+                                       THEN excluded.latest_transaction_date ELSE latest_transaction_date END;
+'''
+
+_COMPLEX_MONTHLY_STATS_REMOVE = '''
+    UPDATE complex_monthly_stats SET
+        row_count = row_count - 1,
+        avg_price_sum = avg_price_sum - COALESCE(OLD.avg_price, 0),
+        avg_price_count = avg_price_count - (OLD.avg_price IS NOT NULL),
+        avg_price = (avg_price_sum - COALESCE(OLD.avg_price, 0))
+                    / NULLIF(avg_price_count - (OLD.avg_price IS NOT NULL), 0),
+        avg_area_sum = avg_area_sum - COALESCE(NULLIF(OLD.area, 0), 0),
+        avg_area_count = avg_area_count - (NULLIF(OLD.area, 0) IS NOT NULL),
+        avg_area = (avg_area_sum - COALESCE(NULLIF(OLD.area, 0), 0))
+                   / NULLIF(avg_area_count - (NULLIF(OLD.area, 0) IS NOT NULL), 0),
+        avg_floor_sum = avg_floor_sum - COALESCE(NULLIF(OLD.floor, 0), 0),
+        avg_floor_count = avg_floor_count - (NULLIF(OLD.floor, 0) IS NOT NULL),
+        avg_floor = (avg_floor_sum - COALESCE(NULLIF(OLD.floor, 0), 0))
+                    / NULLIF(avg_floor_count - (NULLIF(OLD.floor, 0) IS NOT NULL), 0)
+    WHERE region_name = OLD.region_name AND complex_name = OLD.complex_name
+      AND deal_ymd = substr(OLD.date, 1, 4) || substr(OLD.date, 6, 2);
+    UPDATE complex_monthly_stats SET
+        latest_transaction_date = (
+            SELECT MAX(latest_transaction_date) FROM transactions
+            WHERE transactions.region_name = OLD.region_name AND transactions.complex_name = OLD.complex_name
+              AND substr(transactions.date, 1, 4) || substr(transactions.date, 6, 2)
+                  = substr(OLD.date, 1, 4) || substr(OLD.date, 6, 2))
+    WHERE region_name = OLD.region_name AND complex_name = OLD.complex_name
+      AND deal_ymd = substr(OLD.date, 1, 4) || substr(OLD.date, 6, 2)
+      AND OLD.latest_transaction_date >= latest_transaction_date;
+    DELETE FROM complex_monthly_stats
+    WHERE region_name = OLD.region_name AND complex_name = OLD.complex_name
+      AND deal_ymd = substr(OLD.date, 1, 4) || substr(OLD.date, 6, 2) AND row_count <= 0;
+'''
+
+# 집계 테이블 -> 원본 트리거 (INSERT, DELETE, UPDATE)
+# UPDATE 트리거는 집계에 쓰는 컬럼이 실제로 바뀐 경우만 실행 (재수집 upsert처럼 값이 그대로인 UPDATE는 건너뜀)
+TRIGGERS_SQL = {
+    'region_stats': [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_region_stats_insert AFTER INSERT ON transactions
+            BEGIN {_REGION_STATS_ADD} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_region_stats_delete AFTER DELETE ON transactions
+            BEGIN {_REGION_STATS_REMOVE} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_region_stats_update
+            AFTER UPDATE OF region_name, transaction_count, avg_price ON transactions
+            WHEN OLD.region_name IS NOT NEW.region_name OR OLD.transaction_count IS NOT NEW.transaction_count
+                 OR OLD.avg_price IS NOT NEW.avg_price
+            BEGIN {_REGION_STATS_REMOVE} {_REGION_STATS_ADD} END''',
+    ],
+    'price_change_stats': [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_price_change_stats_insert AFTER INSERT ON price_changes
+            BEGIN {_PRICE_CHANGE_STATS_ADD} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_price_change_stats_delete AFTER DELETE ON price_changes
+            BEGIN {_PRICE_CHANGE_STATS_REMOVE} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_price_change_stats_update
+            AFTER UPDATE OF region_name, price_change_rate, avg_price ON price_changes
+            WHEN OLD.region_name IS NOT NEW.region_name OR OLD.price_change_rate IS NOT NEW.price_change_rate
+                 OR OLD.avg_price IS NOT NEW.avg_price
+            BEGIN {_PRICE_CHANGE_STATS_REMOVE} {_PRICE_CHANGE_STATS_ADD} END''',
+    ],
+    'daily_region_stats': [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_daily_region_stats_insert AFTER INSERT ON transactions
+            BEGIN {_DAILY_REGION_STATS_ADD} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_daily_region_stats_delete AFTER DELETE ON transactions
+            BEGIN {_DAILY_REGION_STATS_REMOVE} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_daily_region_stats_update
+            AFTER UPDATE OF date, region_name, transaction_count, avg_price ON transactions
+            WHEN OLD.date IS NOT NEW.date OR OLD.region_name IS NOT NEW.region_name
+                 OR OLD.transaction_count IS NOT NEW.transaction_count OR OLD.avg_price IS NOT NEW.avg_price
+            BEGIN {_DAILY_REGION_STATS_REMOVE} {_DAILY_REGION_STATS_ADD} END''',
+    ],
+    'daily_price_change_stats': [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_daily_price_change_stats_insert AFTER INSERT ON price_changes
+            BEGIN {_DAILY_PRICE_CHANGE_STATS_ADD} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_daily_price_change_stats_delete AFTER DELETE ON price_changes
+            BEGIN {_DAILY_PRICE_CHANGE_STATS_REMOVE} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_daily_price_change_stats_update
+            AFTER UPDATE OF date, region_name, price_change_rate ON price_changes
+            WHEN OLD.date IS NOT NEW.date OR OLD.region_name IS NOT NEW.region_name
+                 OR OLD.price_change_rate IS NOT NEW.price_change_rate
+            BEGIN {_DAILY_PRICE_CHANGE_STATS_REMOVE} {_DAILY_PRICE_CHANGE_STATS_ADD} END''',
+    ],
+    'complex_monthly_stats': [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_complex_monthly_stats_insert AFTER INSERT ON transactions
+            BEGIN {_COMPLEX_MONTHLY_STATS_ADD} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_complex_monthly_stats_delete AFTER DELETE ON transactions
+            BEGIN {_COMPLEX_MONTHLY_STATS_REMOVE} END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_complex_monthly_stats_update
+            AFTER UPDATE OF region_name, complex_name, date, avg_price, area, floor, latest_transaction_date
+            ON transactions
+            WHEN OLD.region_name IS NOT NEW.region_name OR OLD.complex_name IS NOT NEW.complex_name
+                 OR OLD.date IS NOT NEW.date OR OLD.avg_price IS NOT NEW.avg_price OR OLD.area IS NOT NEW.area
+                 OR OLD.floor IS NOT NEW.floor OR OLD.latest_transaction_date IS NOT NEW.latest_transaction_date
+            BEGIN {_COMPLEX_MONTHLY_STATS_REMOVE} {_COMPLEX_MONTHLY_STATS_ADD} END''',
+    ],
+}
+
+# 집계 테이블 -> 원본 전체에서 다시 채우는 INSERT ... SELECT
+REBUILD_SQL = {
+    'region_stats': '''
+        INSERT INTO region_stats (region_name, row_count, total_volume, avg_price_sum, avg_price_count, avg_price,
+                                  min_price, max_price)
+        SELECT region_name, COUNT(*), COALESCE(SUM(transaction_count), 0), COALESCE(SUM(avg_price), 0),
+               COUNT(avg_price), AVG(avg_price), MIN(avg_price), MAX(avg_price)
+        FROM transactions
+        GROUP BY region_name
+    ''',
+    'price_change_stats': '''
+        INSERT INTO price_change_stats (region_name, row_count, avg_change_rate_sum, avg_change_rate_count,
+                                        avg_change_rate, min_price, max_price)
+        SELECT region_name, COUNT(*), COALESCE(SUM(price_change_rate), 0), COUNT(price_change_rate),
+               AVG(price_change_rate), MIN(avg_price), MAX(avg_price)
+        FROM price_changes
+        GROUP BY region_name
+    ''',
+    'daily_region_stats': '''
+        INSERT INTO daily_region_stats (day, region_name, row_count, volume, avg_price_sum, avg_price_count, avg_price)
+        SELECT substr(date, 1, 10), region_name, COUNT(*), COALESCE(SUM(transaction_count), 0),
+               COALESCE(SUM(avg_price), 0), COUNT(avg_price), AVG(avg_price)
+        FROM transactions
+        GROUP BY substr(date, 1, 10), region_name
+    ''',
+    'daily_price_change_stats': '''
+        INSERT INTO daily_price_change_stats (day, region_name, row_count, avg_change_rate_sum, avg_change_rate_count,
+                                              avg_change_rate)
+        SELECT substr(date, 1, 10), region_name, COUNT(*), COALESCE(SUM(price_change_rate), 0),
+               COUNT(price_change_rate), AVG(price_change_rate)
+        FROM price_changes
+        GROUP BY substr(date, 1, 10), region_name
+    ''',
+    'complex_monthly_stats': '''
+        INSERT INTO complex_monthly_stats (region_name, complex_name, deal_ymd, row_count,
+                                           avg_price_sum, avg_price_count, avg_price,
+                                           avg_area_sum, avg_area_count, avg_area,
+                                           avg_floor_sum, avg_floor_count, avg_floor, latest_transaction_date)
+        SELECT region_name, complex_name, substr(date, 1, 4) || substr(date, 6, 2), COUNT(*),
+               COALESCE(SUM(avg_price), 0), COUNT(avg_price), AVG(avg_price),
+               COALESCE(SUM(NULLIF(area, 0)), 0), COUNT(NULLIF(area, 0)), AVG(NULLIF(area, 0)),
+               COALESCE(SUM(NULLIF(floor, 0)), 0), COUNT(NULLIF(floor, 0)), AVG(NULLIF(floor, 0)),
+               MAX(latest_transaction_date)
+        FROM transactions
+        GROUP BY region_name, complex_name, substr(date, 1, 4) || substr(date, 6, 2)
+    ''',
+}
+
+
+def ensure_aggregates(cursor):
+    """집계 테이블/인덱스/트리거 생성, 새로 만든 집계 테이블 이름 목록 반환 (채우기는 호출 측에서)"""
+    created = []
+    for table in AGGREGATE_SOURCES:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        if cursor.fetchone() is None:
+            created.append(table)
+    for statement in SCHEMA_SQL:
+        cursor.execute(statement)
+    for statements in TRIGGERS_SQL.values():
+        for statement in statements:
+            cursor.execute(statement)
+    return created
+
+
+def _tables_for(source):
+    """원본 테이블을 집계하는 집계 테이블 목록"""
+    return [table for table, table_source in AGGREGATE_SOURCES.items() if table_source == source]
+
+
+def drop_aggregate_triggers(conn, source):
+    """원본 테이블의 집계 트리거 삭제 (대량 적재 중 행마다 집계를 갱신하지 않도록, 호출 측 트랜잭션 안에서)"""
+    for table in _tables_for(source):
+        for event in ('insert', 'delete', 'update'):
+            conn.execute(f'DROP TRIGGER IF EXISTS trg_{table}_{event}')
+
+
+def restore_aggregate_triggers(conn, source):
+    """drop_aggregate_triggers 이후 원본에서 집계를 다시 계산하고 트리거 재생성 (같은 트랜잭션 안에서)"""
+    for table in _tables_for(source):
+        conn.execute(f'DELETE FROM {table}')
+        conn.execute(REBUILD_SQL[table])
+        for statement in TRIGGERS_SQL[table]:
+            conn.execute(statement)
+
+
+def rebuild_aggregates(tables=None):
+    """집계 테이블을 원본에서 처음부터 다시 계산 (테이블별 한 트랜잭션), {테이블: 행 수} 반환"""
+    conn = get_connection()
+    result = {}
+    for table in tables or AGGREGATE_SOURCES:
+        with conn:
+            conn.execute(f'DELETE FROM {table}')
+            conn.execute(REBUILD_SQL[table])
+        result[table] = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        print(f"📊 집계 재계산: {table} ({AGGREGATE_SOURCES[table]}) {result[table]:,}행")
+    invalidate_market_overview()
+    return result
+
+
+def get_volume_rankings(limit=20):
+    """거래량 순위 [(지역명, 거래량, 평균가, 건수)]"""
+    return get_connection(readonly=True).execute(VOLUME_RANKINGS_SQL, (limit,)).fetchall()
+
+
+def get_price_rankings(limit=20):
+    """평균 가격 순위 [(지역명, 평균가, 거래량, 건수)]"""
+    return get_connection(readonly=True).execute(PRICE_RANKINGS_SQL, (limit,)).fetchall()
+
+
+def get_price_change_rankings(limit=20):
+    """가격변동률 순위 [(지역명, 평균 변동률, 최고가, 최저가)]"""
+    return get_connection(readonly=True).execute(PRICE_CHANGE_RANKINGS_SQL, (limit,)).fetchall()
+
+
+# 시장 개요 캐시: 적재 함수가 무효화하고, 다른 프로세스의 적재는 원본 최대 id 변화로 감지
+# (기존 행만 바뀌는 다른 프로세스 재수집은 TTL 안에서 반영)
+MARKET_OVERVIEW_TTL = int(os.environ.get('MARKET_OVERVIEW_CACHE_SECONDS', 600))
+_market_overview_cache = {'signature': None, 'value': None, 'expires': 0.0}
+_market_overview_lock = threading.Lock()
+
+
+def invalidate_market_overview():
+    """적재 후 시장 개요 캐시 무효화"""
+    with _market_overview_lock:
+        _market_overview_cache['signature'] = None
+
+
+def _ingest_signature(conn):
+    """(오늘 날짜, 거래 최대 id, 가격변동 최대 id) - 날짜가 바뀌면 집계 구간도 바뀜"""
+    return conn.execute('''
+        SELECT date('now'), (SELECT MAX(id) FROM transactions), (SELECT MAX(id) FROM price_changes)
+    ''').fetchone()
+
+
+def compute_market_overview(conn=None):
+    """일자×지역 집계로 시장 개요 계산 (캐시 없이)"""
+    conn = conn or get_connection(readonly=True)
+    total_volume, avg_price, prev_volume, active_regions, price_change = conn.execute(MARKET_OVERVIEW_SQL).fetchone()
+    prev_volume = prev_volume or 1  # 0으로 나누기 방지
+    return {
+        'total_volume': total_volume,
+        'avg_price': avg_price or 0,
+        'price_change': price_change or 0,
+        'volume_change': ((total_volume - prev_volume) / prev_volume) * 100,
+        'active_regions': active_regions or 0
+    }
+
+
+def get_market_overview():
+    """시장 개요 (다음 적재 전까지 프로세스 안에서 캐시), (개요 dict, 캐시 적중 여부) 반환"""
+    conn = get_connection(readonly=True)
+    signature = tuple(_ingest_signature(conn))
+    now = time.monotonic()
+    with _market_overview_lock:
+        cache = _market_overview_cache
+        if cache['signature'] == signature and now < cache['expires']:
+            return cache['value'], True
+
+    value = compute_market_overview(conn)
+    with _market_overview_lock:
+        _market_overview_cache.update(signature=signature, value=value, expires=now + MARKET_OVERVIEW_TTL)
+    return value, False
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import threading
+
+# 모든 라우트/모델이 같은 파일을 사용하도록 경로는 한 곳에서 결정
+DEFAULT_DATABASE_PATH = '/tmp/realstate.db'
+
+# 연결 생성 시 1회 적용하는 PRAGMA
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE = 256 * 1024 * 1024      # 256MB
+CACHE_SIZE_KB = 64 * 1024          # 64MB (음수 값은 KB 단위)
+STATEMENT_CACHE_SIZE = 256         # 연결별 컴파일된 SQL 재사용 개수
+
+_local = threading.local()
+
+
+def database_path():
+    """현재 데이터베이스 파일 경로 (DATABASE_PATH 환경 변수 우선)"""
+    return os.environ.get('DATABASE_PATH', DEFAULT_DATABASE_PATH)
+
+
+def _connect(path, readonly):
+    """새 연결 생성 및 PRAGMA 적용"""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, cached_statements=STATEMENT_CACHE_SIZE)
+    conn.execute(f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}')
+    conn.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+    conn.execute(f'PRAGMA cache_size = -{CACHE_SIZE_KB}')
+    if readonly:
+        # 조회 전용 연결에서는 쓰기 문장을 거부
+        conn.execute('PRAGMA query_only = ON')
+    else:
+        # WAL은 파일에 기록되는 설정이라 쓰기 연결에서 한 번 적용하면 유지됨
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+    return conn
+
+
+def get_connection(readonly=False):
+    """현재 스레드의 재사용 연결 반환
+
+    연결은 스레드별로 캐시되므로 호출 측에서 close() 하지 않는다.
+    쓰기는 `with conn:` 블록으로 커밋/롤백한다.
+    """
+    # gunicorn --preload 등으로 fork된 경우 부모 프로세스의 연결을 쓰지 않음
+    if getattr(_local, 'pid', None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.connections = {}
+
+    key = (database_path(), readonly)
+    conn = _local.connections.get(key)
+    if conn is None:
+        conn = _connect(key[0], readonly)
+        _local.connections[key] = conn
+    return conn
+
+
+def close_connections():
+    """현재 스레드의 캐시된 연결 모두 닫기 (스크립트 종료, 테스트용)"""
+    connections = getattr(_local, 'connections', {})
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
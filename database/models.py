@@ -1,12 +1,19 @@
-import sqlite3
 import os
+import time
 from datetime import datetime
+from functools import lru_cache
 
+from database.aggregates import (drop_aggregate_triggers, ensure_aggregates, invalidate_market_overview,
+                                 rebuild_aggregates, restore_aggregate_triggers)
+from database.connection import get_connection
+from services.region_service import RegionService
+
+# 하위 호환용 (실제 경로는 database.connection.database_path()가 매 호출 시 결정)
 DB_PATH = os.environ.get('DATABASE_PATH', '/tmp/realstate.db')
 
 def init_db():
     """데이터베이스 초기화 및 테이블 생성"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # 지역 테이블
@@ -30,15 +37,23 @@ def init_db():
             avg_price REAL DEFAULT 0,
             source TEXT NOT NULL,
             latest_transaction_date TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            region_code TEXT NOT NULL DEFAULT '',
+            area REAL NOT NULL DEFAULT 0,
+            floor INTEGER NOT NULL DEFAULT 0,
+            jibun TEXT NOT NULL DEFAULT '',
+            dong TEXT NOT NULL DEFAULT ''
         )
     ''')
+    _ensure_transaction_columns(cursor)
+    
+    # 조회 경로별 인덱스 (database.queries 참고)
+    _ensure_transaction_indexes(cursor)
+    conn.commit()
     
-    # 성능 향상을 위한 인덱스 추가
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_region_name ON transactions(region_name)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_date ON transactions(date)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_complex_name ON transactions(complex_name)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_avg_price ON transactions(avg_price)')
+    # 자연키 유니크 인덱스 (기존 DB에 중복이 있으면 1회 정리 후 생성)
+    if not _has_natural_key_index(cursor):
+        dedup_transactions()
     
     # 가격변동률 테이블
     cursor.execute('''
@@ -52,6 +67,15 @@ def init_db():
         )
     ''')
     
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_changes_region_date ON price_changes(region_name, date)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_changes_date ON price_changes(date)')
+    
+    # 순위/시장 개요용 집계 테이블 (트리거로 적재와 같은 트랜잭션에서 갱신, 처음 만들 때만 전체 계산)
+    created_aggregates = ensure_aggregates(cursor)
+    conn.commit()
+    if created_aggregates:
+        rebuild_aggregates(created_aggregates)
+    
     # 기본 지역 데이터 삽입
     default_regions = [
         ('서울특별시', 'SEOUL'),
@@ -81,12 +105,119 @@ def init_db():
         ''', default_regions)
     
     conn.commit()
-    conn.close()
+
+# transactions 적재 컬럼 (INSERT 파라미터 순서)
+TRANSACTION_COLUMNS = ('date', 'region_name', 'complex_name', 'transaction_count', 'avg_price', 'source',
+                       'latest_transaction_date', 'region_code', 'area', 'floor', 'jibun', 'dong')
+
+# 실거래 1건을 식별하는 자연키 (지역코드, 거래일, 단지, 면적, 층, 가격, 지번)
+NATURAL_KEY_COLUMNS = ('region_code', 'date', 'complex_name', 'area', 'floor', 'avg_price', 'jibun')
+NATURAL_KEY_INDEX = 'ux_transactions_natural_key'
+
+# 기존 DB에 없을 수 있는 컬럼 (ALTER TABLE로 추가)
+ADDED_TRANSACTION_COLUMNS = {
+    'region_code': "TEXT NOT NULL DEFAULT ''",
+    'area': 'REAL NOT NULL DEFAULT 0',
+    'floor': 'INTEGER NOT NULL DEFAULT 0',
+    'jibun': "TEXT NOT NULL DEFAULT ''",
+    'dong': "TEXT NOT NULL DEFAULT ''"
+}
+
+def _ensure_transaction_columns(cursor):
+    """이전 스키마의 transactions 테이블에 자연키/상세 컬럼 추가"""
+    cursor.execute('PRAGMA table_info(transactions)')
+    existing = {row[1] for row in cursor.fetchall()}
+    for column, definition in ADDED_TRANSACTION_COLUMNS.items():
+        if column not in existing:
+            cursor.execute(f'ALTER TABLE transactions ADD COLUMN {column} {definition}')
+
+# 조회 경로별 transactions 인덱스 (이름 -> 컬럼)
+TRANSACTION_INDEXES = {
+    # 지역 + 기간 거래 목록 (최신순 정렬까지 인덱스 순서로 처리)
+    'idx_transactions_region_date': ('region_name', 'date'),
+    # 지역 없이 기간만 지정한 거래 목록
+    'idx_date': ('date',),
+    # 지역 + 법정동 거래 목록 (최신순)
+    'idx_transactions_region_dong_date': ('region_name', 'dong', 'date'),
+    # 지역 없이 법정동만 지정한 거래 목록 (최신순)
+    'idx_transactions_dong_date': ('dong', 'date'),
+    # 지역 없이 면적 범위(+층 범위)로 거르는 거래 목록 (층 조건은 인덱스 안에서 확인)
+    'idx_transactions_area_floor_date': ('area', 'floor', 'date'),
+    # 지역 없이 층 범위만 지정한 거래 목록
+    'idx_transactions_floor_date': ('floor', 'date'),
+    # 단지×월 집계에서 삭제/변경된 행이 최근 거래일이었을 때 (지역, 단지) 범위만 읽어 재계산
+    'idx_transactions_region_complex': ('region_name', 'complex_name', 'date', 'avg_price', 'latest_transaction_date'),
+}
+
+# 위 복합 인덱스와 지역별 집계로 대체된 단일 컬럼 인덱스
+# (region_name은 복합 인덱스의 앞 컬럼, complex_name/avg_price 단독 조회 경로는 없음)
+OBSOLETE_TRANSACTION_INDEXES = ('idx_region_name', 'idx_complex_name', 'idx_avg_price')
+
+def _ensure_transaction_indexes(cursor):
+    for name, columns in TRANSACTION_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON transactions({', '.join(columns)})")
+    for name in OBSOLETE_TRANSACTION_INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+def _has_natural_key_index(cursor):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (NATURAL_KEY_INDEX,))
+    return cursor.fetchone() is not None
+
+# 자연키 충돌 시 새 행을 추가하지 않고 기존 행의 부가 정보만 갱신
+_UPSERT_CLAUSE = f"""
+        ON CONFLICT ({', '.join(NATURAL_KEY_COLUMNS)}) DO UPDATE SET
+            region_name = excluded.region_name,
+            transaction_count = excluded.transaction_count,
+            source = excluded.source,
+            latest_transaction_date = excluded.latest_transaction_date,
+            dong = CASE WHEN excluded.dong != '' THEN excluded.dong ELSE dong END
+"""
+
+def _insert_transactions_sql(table='transactions'):
+    """transactions 대상이면 upsert, 스테이징 테이블이면 단순 INSERT"""
+    columns = ', '.join(TRANSACTION_COLUMNS)
+    return f"""
+        INSERT INTO {table} ({columns})
+        VALUES ({', '.join('?' * len(TRANSACTION_COLUMNS))})
+        {_UPSERT_CLAUSE if table == 'transactions' else ''}
+    """
+
+INSERT_TRANSACTION_SQL = _insert_transactions_sql()
+INSERT_STAGING_SQL = _insert_transactions_sql('transactions_staging')
+# 스테이징 병합 (upsert와 SELECT를 함께 쓸 때는 WHERE 절이 있어야 파싱이 모호하지 않음)
+MERGE_STAGING_SQL = f"""
+        INSERT INTO transactions ({', '.join(TRANSACTION_COLUMNS)})
+        SELECT {', '.join(TRANSACTION_COLUMNS)} FROM transactions_staging WHERE true
+        {_UPSERT_CLAUSE}
+"""
+
+@lru_cache(maxsize=None)
+def _region_code_for(region_name):
+    """지역명 -> 법정동 코드 (찾지 못하면 지역명을 그대로 키로 사용해 다른 지역과 섞이지 않게 함)"""
+    return RegionService().get_region_code(region_name) or region_name
+
+def _transaction_row(item):
+    """거래 dict -> INSERT 파라미터 튜플"""
+    # 최근 거래일자 설정 (기본값은 거래일자)
+    latest_date = item.get('latest_transaction_date', item['date'])
+    return (
+        item['date'],
+        item['region_name'],
+        item['complex_name'],
+        item['transaction_count'],
+        item['avg_price'],
+        item['source'],
+        latest_date,
+        item.get('region_code') or _region_code_for(item['region_name']),
+        item.get('area') or 0,
+        item.get('floor') or 0,
+        item.get('jibun') or '',
+        item.get('dong') or ''
+    )
 
 def save_transaction_data(data):
     """거래 데이터 저장"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    conn = get_connection()
     
     # 단일 데이터인지 리스트인지 확인
     if isinstance(data, list):
@@ -94,30 +225,70 @@ def save_transaction_data(data):
     else:
         data_list = [data]
     
+    # 실패 시 롤백해 재사용 연결에 미완료 트랜잭션이 남지 않도록 함
+    with conn:
+        conn.executemany(INSERT_TRANSACTION_SQL, [_transaction_row(item) for item in data_list])
+    invalidate_market_overview()
+
+def _group_by_region_month(data_list):
+    """(지역, 거래월)별 INSERT 파라미터 묶음"""
+    groups = {}
     for item in data_list:
-        # 최근 거래일자 설정 (기본값은 현재 날짜)
-        latest_date = item.get('latest_transaction_date', item['date'])
-        
-        cursor.execute('''
-            INSERT INTO transactions 
-            (date, region_name, complex_name, transaction_count, avg_price, source, latest_transaction_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            item['date'],
-            item['region_name'],
-            item['complex_name'],
-            item['transaction_count'],
-            item['avg_price'],
-            item['source'],
-            latest_date
-        ))
-    
-    conn.commit()
-    conn.close()
+        key = (item['region_name'], item['date'][:7])
+        groups.setdefault(key, []).append(_transaction_row(item))
+    return groups
+
+def save_transactions_bulk(data_list, staging=False):
+    """거래 데이터 일괄 저장 (지역-월 단위로 한 트랜잭션에 executemany)
+
+    staging=True면 임시 스테이징 테이블에 먼저 적재한 뒤 한 번의 INSERT ... SELECT로 병합
+    (본 테이블의 인덱스 갱신과 잠금 구간을 병합 단계 한 번으로 모음)
+    병합 동안 집계 트리거를 내려 두고 같은 트랜잭션 안에서 집계를 원본 전체에서 다시 계산하므로
+    (기존 행 수에 비례하는 비용) 적재량이 기존 데이터에 견줄 만한 초기/대량 적재에만 사용
+    저장 건수, 커밋 수, 초당 처리 행 수를 담은 dict 반환
+    """
+    started = time.perf_counter()
+    conn = get_connection()
+    groups = _group_by_region_month(data_list)
+
+    if staging:
+        columns = ', '.join(TRANSACTION_COLUMNS)
+        conn.execute(f'''
+            CREATE TEMP TABLE IF NOT EXISTS transactions_staging AS
+            SELECT {columns} FROM transactions WHERE 0
+        ''')
+        with conn:
+            conn.execute('DELETE FROM transactions_staging')
+            for rows in groups.values():
+                conn.executemany(INSERT_STAGING_SQL, rows)
+            drop_aggregate_triggers(conn, 'transactions')
+            conn.execute(MERGE_STAGING_SQL)
+            restore_aggregate_triggers(conn, 'transactions')
+            conn.execute('DELETE FROM transactions_staging')
+        commits = 1
+    else:
+        for rows in groups.values():
+            with conn:
+                conn.executemany(INSERT_TRANSACTION_SQL, rows)
+        commits = len(groups)
+    invalidate_market_overview()
+
+    elapsed = time.perf_counter() - started
+    row_count = sum(len(rows) for rows in groups.values())
+    result = {
+        'rows': row_count,
+        'batches': len(groups),
+        'commits': commits,
+        'elapsed_sec': round(elapsed, 3),
+        'rows_per_sec': round(row_count / elapsed, 1) if elapsed > 0 else 0.0
+    }
+    print(f"💾 거래 데이터 일괄 저장: {row_count:,}건, {len(groups)}개 지역-월, "
+          f"{commits}회 커밋, {result['rows_per_sec']:,.0f}행/초")
+    return result
 
 def save_price_change_data(data):
     """가격변동률 데이터 저장"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # 단일 데이터인지 리스트인지 확인
@@ -126,24 +297,23 @@ def save_price_change_data(data):
     else:
         data_list = [data]
     
-    for item in data_list:
-        cursor.execute('''
-            INSERT INTO price_changes 
-            (date, region_name, avg_price, price_change_rate)
-            VALUES (?, ?, ?, ?)
-        ''', (
-            item['date'],
-            item['region_name'],
-            item['avg_price'],
-            item['price_change_rate']
-        ))
-    
-    conn.commit()
-    conn.close()
+    with conn:
+        for item in data_list:
+            cursor.execute('''
+                INSERT INTO price_changes 
+                (date, region_name, avg_price, price_change_rate)
+                VALUES (?, ?, ?, ?)
+            ''', (
+                item['date'],
+                item['region_name'],
+                item['avg_price'],
+                item['price_change_rate']
+            ))
+    invalidate_market_overview()
 
 def get_latest_price_data(region_name, days=30):
     """최근 가격 데이터 조회"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(readonly=True)
     cursor = conn.cursor()
     
     query = '''
@@ -156,13 +326,35 @@ def get_latest_price_data(region_name, days=30):
     
     cursor.execute(query, (region_name, days))
     results = cursor.fetchall()
-    conn.close()
     
     return [{'date': row[0], 'avg_price': row[1]} for row in results]
 
+def get_stored_months(region_codes, since_date, source='molit_api'):
+    """지역 코드별로 저장된 거래년월과 건수 조회, {지역 코드: {YYYYMM: 건수}}
+
+    (region_code, date)로 시작하는 자연키 인덱스를 사용
+    """
+    region_codes = list(region_codes)
+    stored = {region_code: {} for region_code in region_codes}
+    if not region_codes:
+        return stored
+
+    conn = get_connection(readonly=True)
+    placeholders = ', '.join('?' * len(region_codes))
+    rows = conn.execute(f'''
+        SELECT region_code, substr(date, 1, 4) || substr(date, 6, 2) AS deal_ymd, COUNT(*)
+        FROM transactions
+        WHERE region_code IN ({placeholders}) AND date >= ? AND source = ?
+        GROUP BY region_code, deal_ymd
+    ''', (*region_codes, since_date, source)).fetchall()
+
+    for region_code, deal_ymd, count in rows:
+        stored[region_code][deal_ymd] = count
+    return stored
+
 def calculate_price_change_rate(region_name):
     """가격변동률 계산"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(readonly=True)
     cursor = conn.cursor()
     
     # 최근 30일과 이전 30일 평균 가격 비교
@@ -175,8 +367,38 @@ def calculate_price_change_rate(region_name):
     ''', (region_name,))
     
     result = cursor.fetchone()
-    conn.close()
     
     if result[0] and result[1] and result[1] > 0:
         return ((result[0] - result[1]) / result[1]) * 100
-    return 0.0 
\ No newline at end of file
+    return 0.0 
+
+def dedup_transactions():
+    """자연키 기준 중복 거래 정리 후 유니크 인덱스 생성 (1회성 마이그레이션)
+
+    region_code가 비어 있는 기존 행은 지역명으로 채우고, 같은 자연키의 행은 가장 최근 것(id 최대)만 남김
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    with conn:
+        _ensure_transaction_columns(cursor)
+
+        cursor.execute("SELECT DISTINCT region_name FROM transactions WHERE region_code = ''")
+        for (region_name,) in cursor.fetchall():
+            cursor.execute("UPDATE transactions SET region_code = ? WHERE region_code = '' AND region_name = ?",
+                           (_region_code_for(region_name), region_name))
+
+        cursor.execute('SELECT COUNT(*) FROM transactions')
+        before = cursor.fetchone()[0]
+        key = ', '.join(NATURAL_KEY_COLUMNS)
+        cursor.execute(f'''
+            DELETE FROM transactions
+            WHERE id NOT IN (SELECT MAX(id) FROM transactions GROUP BY {key})
+        ''')
+        removed = cursor.rowcount
+        cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {NATURAL_KEY_INDEX} ON transactions({key})')
+
+    invalidate_market_overview()
+
+    result = {'before': before, 'after': before - removed, 'removed': removed}
+    print(f"🧹 거래 데이터 중복 정리: {before:,}건 -> {result['after']:,}건 ({removed:,}건 삭제)")
+    return result
@@ -0,0 +1,200 @@
+"""
+API 라우트 조회 SQL 모듈
+라우트가 실행하는 SELECT 문을 한 곳에 모아 두고, 요청 인자는 모두 바인딩 파라미터로 전달
+각 함수는 (SQL, 파라미터) 를 반환하며 test_query_plans.py가 같은 함수로 실행 계획을 검사
+
+접근 경로별 인덱스 (database.models.init_db에서 생성)
+  transactions(region_name, date)                     지역 + 기간 거래 목록, 최신순 정렬
+  transactions(date)                                  전체 지역 기간 거래 목록
+  transactions(region_name, dong, date)               지역 + 법정동 거래 목록, 최신순 정렬
+  transactions(dong, date)                            법정동만 지정한 거래 목록, 최신순 정렬
+  transactions(area, floor, date)                     지역 없이 면적(+층) 범위 거래 목록
+  transactions(floor, date)                           지역 없이 층 범위 거래 목록
+  transactions(region_name, complex_name, date, ...)  단지×월 집계의 최근 거래일 재계산 (커버링)
+  price_changes(region_name, date)                    지역 가격변동 최신순
+  price_changes(date)                                 전체 가격변동 최신순
+지역 목록/통계/순위/시장 개요/단지 순위는 원본 대신 집계 테이블(database.aggregates)을 읽음
+"""
+
+
+def _where(conditions):
+    """조건 목록 -> WHERE 절 (조건이 없으면 빈 문자열)"""
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+
+# 데이터가 있는 지역 목록 (지역별 집계 행은 거래가 있는 지역에만 존재)
+REGIONS_SQL = 'SELECT region_name FROM region_stats ORDER BY region_name'
+
+
+def regions_query():
+    return REGIONS_SQL, ()
+
+
+def transactions_query(region='', start_date='', end_date='', min_area=None, max_area=None,
+                       min_floor=None, max_floor=None, dong='', limit=None):
+    """거래 목록 (최신순, limit이 있으면 limit건)
+
+    지역/법정동/기간이 있으면 그 인덱스 범위 안에서 면적/층을 거르고,
+    면적/층 범위만 있으면 면적/층 인덱스로 찾은 뒤 최신순 정렬
+    """
+    conditions, params = [], []
+    if region:
+        conditions.append('region_name = ?')
+        params.append(region)
+    if dong:
+        conditions.append('dong = ?')
+        params.append(dong)
+    if start_date:
+        conditions.append('date >= ?')
+        params.append(start_date)
+    if end_date:
+        conditions.append('date <= ?')
+        params.append(end_date)
+    for column, operator, value in (('area', '>=', min_area), ('area', '<=', max_area),
+                                    ('floor', '>=', min_floor), ('floor', '<=', max_floor)):
+        if value is not None:
+            conditions.append(f'{column} {operator} ?')
+            params.append(value)
+    limit_clause = ''
+    if limit is not None:
+        limit_clause = 'LIMIT ?'
+        params.append(limit)
+    return f'''
+        SELECT date, region_name, complex_name, transaction_count, avg_price, source, area, floor, dong, jibun
+        FROM transactions
+        {_where(conditions)}
+        ORDER BY date DESC
+        {limit_clause}
+    ''', params
+
+
+def price_changes_query(region='', limit=30):
+    """가격변동률 목록 (최신순 limit건)"""
+    conditions, params = [], []
+    if region:
+        conditions.append('region_name = ?')
+        params.append(region)
+    params.append(limit)
+    return f'''
+        SELECT date, region_name, avg_price, price_change_rate
+        FROM price_changes
+        {_where(conditions)}
+        ORDER BY date DESC
+        LIMIT ?
+    ''', params
+
+
+def statistics_query(region=''):
+    """(거래 행 수, 평균가, 거래량 합계) - 지역별 집계 합산"""
+    conditions, params = [], []
+    if region:
+        conditions.append('region_name = ?')
+        params.append(region)
+    return f'''
+        SELECT
+            COALESCE(SUM(row_count), 0),
+            SUM(avg_price_sum) / NULLIF(SUM(avg_price_count), 0),
+            SUM(total_volume)
+        FROM region_stats
+        {_where(conditions)}
+    ''', params
+
+
+# 최근 30일 평균 가격변동률 (일자별 집계)
+RECENT_PRICE_CHANGE_SQL = '''
+    SELECT SUM(avg_change_rate_sum) / NULLIF(SUM(avg_change_rate_count), 0)
+    FROM daily_price_change_stats
+    WHERE day >= date('now', '-30 days')
+'''
+
+
+def recent_price_change_query():
+    return RECENT_PRICE_CHANGE_SQL, ()
+
+
+def validate_month(month):
+    """'YYYYMM' 형식 확인, 틀리면 ValueError"""
+    if len(month) != 6 or not month.isdigit() or not 1 <= int(month[4:]) <= 12:
+        raise ValueError(f'월 형식 오류 (YYYYMM): {month}')
+    return month
+
+
+# 단지×월 집계 합산 (단지별로 조건에 맞는 월 행만 읽음)
+_COMPLEX_RANKING_COLUMNS = '''
+    SUM(avg_price_sum) / NULLIF(SUM(avg_price_count), 0) as avg_price,
+    SUM(row_count) as transaction_count,
+    COALESCE(SUM(avg_area_sum) / NULLIF(SUM(avg_area_count), 0), 0) as avg_area,
+    COALESCE(SUM(avg_floor_sum) / NULLIF(SUM(avg_floor_count), 0), 0) as avg_floor,
+    MAX(latest_transaction_date) as latest_transaction_date
+'''
+
+
+def apartment_rankings_query(region='', period=30, month=''):
+    """단지별 평균가 순위 상위 30건
+
+    month(YYYYMM)가 있으면 해당 월, 없으면 최근 period일이 걸친 달부터 이번 달까지 (월 단위 집계 기준)
+    """
+    if month:
+        condition, params = 'deal_ymd = ?', [validate_month(month)]
+    else:
+        condition, params = "deal_ymd >= strftime('%Y%m', 'now', ?)", [f'-{int(period)} days']
+
+    if region:
+        return f'''
+            SELECT complex_name, {_COMPLEX_RANKING_COLUMNS}
+            FROM complex_monthly_stats
+            WHERE region_name = ? AND {condition}
+            GROUP BY complex_name
+            ORDER BY avg_price DESC
+            LIMIT 30
+        ''', [region, *params]
+
+    return f'''
+        SELECT region_name, complex_name, {_COMPLEX_RANKING_COLUMNS}
+        FROM complex_monthly_stats
+        WHERE {condition}
+        GROUP BY region_name, complex_name
+        ORDER BY avg_price DESC
+        LIMIT 30
+    ''', params
+
+
+# 순위 (지역별 집계의 정렬 인덱스에서 상위 N건)
+VOLUME_RANKINGS_SQL = '''
+    SELECT region_name, total_volume, avg_price, row_count
+    FROM region_stats
+    ORDER BY total_volume DESC
+    LIMIT ?
+'''
+
+PRICE_RANKINGS_SQL = '''
+    SELECT region_name, avg_price, total_volume, row_count
+    FROM region_stats
+    ORDER BY avg_price DESC
+    LIMIT ?
+'''
+
+PRICE_CHANGE_RANKINGS_SQL = '''
+    SELECT region_name, avg_change_rate, max_price, min_price
+    FROM price_change_stats
+    ORDER BY avg_change_rate DESC
+    LIMIT ?
+'''
+
+# 시장 개요: 최근 30일과 이전 30일을 최근 60일 일자×지역 집계 행에서 한 번에 계산 (날짜 기준은 UTC)
+# 활성 지역 수는 지역별 집계를 순회하며 (region_name, day) 인덱스로 최근 30일 행 존재 여부만 확인
+MARKET_OVERVIEW_SQL = '''
+    SELECT
+        COALESCE(SUM(CASE WHEN day >= date('now', '-30 days') THEN volume END), 0),
+        SUM(CASE WHEN day >= date('now', '-30 days') THEN avg_price_sum END)
+            / NULLIF(SUM(CASE WHEN day >= date('now', '-30 days') THEN avg_price_count END), 0),
+        SUM(CASE WHEN day < date('now', '-30 days') THEN volume END),
+        (SELECT COUNT(*) FROM region_stats
+         WHERE EXISTS (SELECT 1 FROM daily_region_stats d
+                       WHERE d.region_name = region_stats.region_name AND d.day >= date('now', '-30 days'))),
+        (SELECT SUM(avg_change_rate_sum) / NULLIF(SUM(avg_change_rate_count), 0)
+         FROM daily_price_change_stats
+         WHERE day >= date('now', '-30 days'))
+    FROM daily_region_stats
+    WHERE day >= date('now', '-60 days')
+'''
@@ -9,7 +9,6 @@ import os
 import sys
 import logging
 import json
-import time
 from datetime import datetime
 from pathlib import Path
 
@@ -18,6 +17,8 @@ project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
 from crawlers.molit_api_crawler import MolitAPICrawler
+from services.run_ledger import RunLedger
+from services.response_artifacts import artifact_store
 
 def setup_logging():
     """로깅 설정"""
@@ -49,6 +50,11 @@ def collect_data():
         # Molit API 크롤러 초기화
         crawler = MolitAPICrawler()
         
+        # 페이지 단위 체크포인트 (중단된 실행은 끝나지 않은 작업만 다시 호출)
+        ledger = RunLedger()
+        run_id = ledger.open_run('github_actions')
+        crawler.use_ledger(ledger, run_id)
+        
         # 데이터 저장 디렉토리
         data_dir = "collected_data"
         if not os.path.exists(data_dir):
@@ -96,16 +102,17 @@ def collect_data():
         success_count = 0
         error_count = 0
         
-        # 각 도시별로 데이터 수집
+        # 전체 지역×월 작업을 한 번에 동시 수집 (최근 8개월, 호출 속도는 전역 속도 제한기가 조절)
+        all_regions = [r for regions in regions_to_collect.values() for r in regions]
+        collected = crawler.crawl_regions(all_regions, months=8)
+        
+        # 각 도시별로 결과 저장
         for city, city_regions in regions_to_collect.items():
-            logger.info(f"\n=== {city.upper()} 데이터 수집 시작 ===")
+            logger.info(f"\n=== {city.upper()} 데이터 저장 시작 ===")
             
             for region in city_regions:
                 try:
-                    logger.info(f"{region} 데이터 수집 중...")
-                    
-                    # 최근 2개월 데이터 수집 (months=8)
-                    data = crawler.crawl_region_data(region, months=8)
+                    data = collected[region]
                     
                     if data and len(data) > 0:
                         all_data[region] = data
@@ -131,15 +138,16 @@ def collect_data():
                     logger.error(f"{region} 데이터 수집 중 오류 발생: {e}")
                     all_data[region] = []
                     error_count += 1
-                
-                # API 호출 간격 조절 (1초)
-                time.sleep(1)
         
         # 전체 데이터를 하나의 파일로 저장 (모든 도시 통합)
         all_data_filepath = os.path.join(data_dir, 'all_cities_integrated_data.json')
         with open(all_data_filepath, 'w', encoding='utf-8') as f:
             json.dump(all_data, f, ensure_ascii=False, indent=2)
         
+        # 같은 디렉터리에서 바로 서빙할 때를 위해 통합 데이터 응답 아티팩트 재빌드
+        # (사이드카는 커밋하지 않음, 배포 빌드가 build_response_artifacts.py로 다시 생성)
+        artifact_store.build('all_cities_integrated')
+        
         # 수집 요약 정보 저장
         summary = {
             'collection_date': datetime.now().isoformat(),
@@ -174,6 +182,10 @@ def collect_data():
         logger.info(f"전체 데이터 파일: {all_data_filepath}")
         logger.info(f"요약 파일: {summary_filepath}")
         
+        # 저장까지 끝난 뒤에 실행 종료 처리 (실패 작업이 남으면 다음 실행이 이어서 수집)
+        ledger.finish_run(run_id)
+        logger.info(f"수집 원장: {ledger.summary(run_id)}")
+        
         return True
         
     except Exception as e:
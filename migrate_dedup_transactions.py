@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 데이터 중복 정리 마이그레이션 스크립트
+수집기 재실행으로 쌓인 transactions 중복 행을 자연키 기준으로 정리하고 유니크 인덱스 생성
+이후 수집은 INSERT ... ON CONFLICT로 같은 거래를 다시 추가하지 않음
+"""
+
+from database.connection import database_path, get_connection
+from database.models import init_db, dedup_transactions
+
+def migrate_dedup_transactions():
+    """중복 정리 + 유니크 인덱스 생성"""
+    print(f"=== 거래 데이터 중복 정리: {database_path()} ===")
+
+    # init_db는 인덱스가 없을 때 정리까지 수행하므로, 이미 생성된 경우에도 다시 확인
+    init_db()
+    result = dedup_transactions()
+
+    # 삭제된 페이지 반환
+    if result['removed']:
+        get_connection().execute('VACUUM')
+        print("VACUUM 완료")
+    return result
+
+if __name__ == "__main__":
+    migrate_dedup_transactions()
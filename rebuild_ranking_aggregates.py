@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+순위 집계 재계산 스크립트
+집계 테이블(region_stats, price_change_stats, 일자별 집계, complex_monthly_stats)을
+transactions / price_changes 전체에서 다시 계산
+(평소에는 트리거가 적재와 함께 갱신하므로 트리거 도입 전 데이터 복구나 검증용)
+
+사용법: python rebuild_ranking_aggregates.py [집계 테이블 ...]  (생략하면 전체)
+"""
+
+import sys
+
+from database.aggregates import AGGREGATE_SOURCES, rebuild_aggregates
+from database.connection import database_path
+from database.models import init_db
+
+def rebuild_ranking_aggregates(tables=None):
+    """집계 테이블 재계산"""
+    print(f"=== 순위 집계 재계산: {database_path()} ===")
+    init_db()
+    unknown = [table for table in tables or [] if table not in AGGREGATE_SOURCES]
+    if unknown:
+        raise SystemExit(f"알 수 없는 집계 테이블: {unknown} (가능: {', '.join(AGGREGATE_SOURCES)})")
+    return rebuild_aggregates(tables or None)
+
+if __name__ == "__main__":
+    rebuild_ranking_aggregates(sys.argv[1:])
@@ -0,0 +1,105 @@
+"""
+수집 계획 모듈
+최근 N개의 달력 월(YYYYMM)을 정확히 계산하고, 데이터베이스에 이미 저장된 지역×월과 비교해
+아직 없는 달(missing)과 신고 기한 안이라 바뀔 수 있는 달(mutable)만 수집 작업으로 선정
+저장 건수가 0인 달도 신고 마감 후 0건으로 조회한 기록(수집 실행 원장)이 있으면 저장된 달로 봄
+신고 기한은 API 응답 캐시와 같은 기준(MOLIT_CACHE_LAG_DAYS)을 사용
+"""
+
+import math
+import sqlite3
+from collections import Counter
+from datetime import datetime
+
+from crawlers.response_cache import molit_response_cache
+from database.models import get_stored_months
+
+
+def recent_months(count, today=None):
+    """오늘이 속한 달부터 거슬러 올라간 달력 월 count개 (YYYYMM, 최신순)"""
+    today = today or datetime.now().date()
+    year, month = today.year, today.month
+    months = []
+    for _ in range(count):
+        months.append(f"{year:04d}{month:02d}")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months
+
+
+class CollectionPlanner:
+    def __init__(self, response_cache=None):
+        # 신고 마감 판단은 응답 캐시의 영구 보관 기준과 동일하게 유지
+        self.response_cache = response_cache or molit_response_cache
+
+    def stored_months(self, region_codes, deal_months):
+        """저장된 거래년월과 건수, 데이터베이스가 아직 없으면 빈 결과"""
+        if not deal_months:
+            return {region_code: {} for region_code in region_codes}
+        since_date = f"{deal_months[-1][:4]}-{deal_months[-1][4:]}-01"
+        try:
+            return get_stored_months(region_codes, since_date)
+        except sqlite3.OperationalError as e:
+            print(f"저장된 거래 조회 실패 (전체 월을 수집): {e}")
+            return {region_code: {} for region_code in region_codes}
+
+    def plan(self, region_codes, months, incremental=True, page_size=1000, today=None, ledger=None):
+        """지역×월 수집 작업 계획
+
+        incremental이면 저장된 데이터가 있고 신고가 마감된 달은 제외
+        (ledger가 있으면 신고 마감 후 0건으로 조회된 달도 제외)
+        예상 API 호출 수는 저장된 건수로 추정한 페이지 수 합계 (처음 수집하는 달은 1페이지로 계산)
+        """
+        region_codes = list(dict.fromkeys(region_codes))
+        deal_months = recent_months(months, today)
+        stored = self.stored_months(region_codes, deal_months) if incremental else {}
+        empty = ledger.empty_months(region_codes) if incremental and ledger is not None else {}
+
+        tasks = []
+        reasons = Counter()
+        estimated_calls = 0
+        for region_code in region_codes:
+            region_stored = stored.get(region_code, {})
+            for deal_ymd in deal_months:
+                count = region_stored.get(deal_ymd, 0)
+                if not incremental:
+                    reason = 'full'
+                elif count == 0:
+                    if self._settled_empty(empty.get((region_code, deal_ymd)), deal_ymd):
+                        reasons['stored'] += 1
+                        continue
+                    reason = 'missing'
+                elif not self.response_cache.is_permanent(deal_ymd, today):
+                    reason = 'mutable'
+                else:
+                    reasons['stored'] += 1
+                    continue
+                tasks.append((region_code, deal_ymd))
+                reasons[reason] += 1
+                estimated_calls += max(1, math.ceil(count / page_size))
+
+        return {
+            'tasks': tasks,
+            'months': deal_months,
+            'regions': len(region_codes),
+            'reasons': dict(reasons),
+            'estimated_calls': estimated_calls
+        }
+
+    def _settled_empty(self, fetched_on, deal_ymd):
+        """0건 조회 기록이 신고 마감 이후의 것인지 (마감 전 0건은 이후 신고로 바뀔 수 있음)"""
+        return fetched_on is not None and self.response_cache.is_permanent(deal_ymd, fetched_on)
+
+    def log_plan(self, plan):
+        reasons = plan['reasons']
+        months = plan['months']
+        period = f"({months[-1]}~{months[0]}) " if months else ''
+        print(f"🗓️  수집 계획: {plan['regions']}개 지역 × {len(months)}개월 "
+              f"{period}중 {len(plan['tasks'])}건 수집 "
+              f"(없음 {reasons.get('missing', 0)}, 변동 가능 {reasons.get('mutable', 0)}, "
+              f"전체 {reasons.get('full', 0)}, 저장됨 제외 {reasons.get('stored', 0)}), "
+              f"예상 API 호출 {plan['estimated_calls']:,}회")
+        return plan
+
+
+# 프로세스 전역 수집 계획기
+collection_planner = CollectionPlanner()
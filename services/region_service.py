@@ -1,170 +1,237 @@
 """
 지역 서비스 관리 모듈
 서울, 부산, 인천, 경기, 대구로 서비스 범위 제한
+지역명/코드 조회는 모듈 로드 시 1회 생성한 불변 인덱스로 처리
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
+# 서비스 지원 광역시/도 및 하위 지역
+SUPPORTED_REGIONS = {
+    '서울특별시': {
+        'name': '서울특별시',
+        'code_prefix': '11',
+        'districts': {
+            '강남구': '11680',
+            '강동구': '11740',
+            '강북구': '11305',
+            '강서구': '11500',
+            '관악구': '11620',
+            '광진구': '11215',
+            '구로구': '11530',
+            '금천구': '11545',
+            '노원구': '11350',
+            '도봉구': '11320',
+            '동대문구': '11230',
+            '동작구': '11590',
+            '마포구': '11440',
+            '서대문구': '11410',
+            '서초구': '11650',
+            '성동구': '11200',
+            '성북구': '11290',
+            '송파구': '11710',
+            '양천구': '11470',
+            '영등포구': '11560',
+            '용산구': '11170',
+            '은평구': '11380',
+            '종로구': '11110',
+            '중구': '11140',
+            '중랑구': '11260'
+        }
+    },
+    '부산광역시': {
+        'name': '부산광역시',
+        'code_prefix': '26',
+        'districts': {
+            '강서구': '26440',
+            '금정구': '26410',
+            '기장군': '26710',
+            '남구': '26290',
+            '동구': '26170',
+            '동래구': '26260',
+            '부산진구': '26230',
+            '북구': '26320',
+            '사상구': '26530',
+            '사하구': '26380',
+            '서구': '26140',
+            '수영구': '26500',
+            '연제구': '26470',
+            '영도구': '26200',
+            '중구': '26110',
+            '해운대구': '26350'
+        }
+    },
+    '인천광역시': {
+        'name': '인천광역시',
+        'code_prefix': '28',
+        'districts': {
+            '강화군': '28710',
+            '계양구': '28245',
+            '남동구': '28200',
+            '동구': '28140',
+            '미추홀구': '28177',
+            '부평구': '28237',
+            '서구': '28260',
+            '연수구': '28185',
+            '옹진군': '28720',
+            '중구': '28110'
+        }
+    },
+    '대구광역시': {
+        'name': '대구광역시',
+        'code_prefix': '27',
+        'districts': {
+            '남구': '27200',
+            '달서구': '27290',
+            '달성군': '27710',
+            '동구': '27140',
+            '북구': '27230',
+            '서구': '27260',
+            '수성구': '27245',
+            '중구': '27110',
+            '군위군': '27720'
+        }
+    },
+    '광주광역시': {
+        'name': '광주광역시',
+        'code_prefix': '29',
+        'districts': {
+            '동구': '29110',
+            '서구': '29140',
+            '남구': '29155',
+            '북구': '29200',
+            '광산구': '29210'
+        }
+    },
+    '대전광역시': {
+        'name': '대전광역시',
+        'code_prefix': '30',
+        'districts': {
+            '동구': '30110',
+            '중구': '30140',
+            '서구': '30170',
+            '유성구': '30200',
+            '대덕구': '30230'
+        }
+    },
+    '울산광역시': {
+        'name': '울산광역시',
+        'code_prefix': '31',
+        'districts': {
+            '중구': '31110',
+            '남구': '31140',
+            '동구': '31170',
+            '북구': '31200',
+            '울주군': '31710'
+        }
+    },
+    '경기도': {
+        'name': '경기도',
+        'code_prefix': '41',
+        'districts': {
+            '가평군': '41820',
+            '고양시': '41280',
+            '과천시': '41290',
+            '광명시': '41210',
+            '광주시': '41610',
+            '구리시': '41310',
+            '군포시': '41410',
+            '김포시': '41570',
+            '남양주시': '41360',
+            '동두천시': '41250',
+            '부천시': '41190',
+            '부천시 원미구': '41191',
+            '부천시 소사구': '41192',
+            '부천시 오정구': '41193',
+            '성남시': '41130',
+            '수원시': '41110',
+            '시흥시': '41390',
+            '안산시': '41270',
+            '안성시': '41550',
+            '안양시': '41170',
+            '양주시': '41630',
+            '양평군': '41830',
+            '여주시': '41670',
+            '연천군': '41800',
+            '오산시': '41370',
+            '용인시': '41460',
+            '의왕시': '41430',
+            '의정부시': '41150',
+            '이천시': '41500',
+            '파주시': '41480',
+            '평택시': '41220',
+            '포천시': '41650',
+            '하남시': '41450',
+            '화성시': '41590'
+        }
+    }
+}
+
+
+def _province_short(province_name):
+    """'서울특별시' -> '서울', '경기도' -> '경기'"""
+    return province_name.replace('특별시', '').replace('광역시', '').replace('도', '')
+
+
+def _normalize(region_name):
+    """공백 정리 ('  경기  부천시 소사구 ' -> '경기 부천시 소사구')"""
+    return ' '.join(region_name.split())
+
+
+def _build_indexes(supported_regions):
+    """코드 -> 표준 지역명/광역시도, 별칭 -> 코드 인덱스 생성"""
+    code_to_name = {}
+    code_to_province = {}
+    alias_to_code = {}
+    api_regions = []
+
+    for province_name, province_data in supported_regions.items():
+        short = _province_short(province_name)
+        province_aliases = [province_name, short]
+        if province_name.endswith(('특별시', '광역시')):
+            province_aliases.append(f"{short}시")
+
+        for district_name, code in province_data['districts'].items():
+            canonical = f"{short} {district_name}"
+            code_to_name.setdefault(code, canonical)
+            code_to_province.setdefault(code, province_name)
+            api_regions.append(canonical)
+
+            # '경기 부천시 소사구', '경기도 부천시 소사구' 등 광역시/도 표기 변형
+            for province_alias in province_aliases:
+                alias_to_code.setdefault(f"{province_alias} {district_name}", code)
+            # 광역시/도 없는 구/군명 ('부천시 소사구', '중구')은 먼저 나온 지역 우선 (기존 부분 매칭과 동일)
+            alias_to_code.setdefault(district_name, code)
+
+    return (MappingProxyType(code_to_name), MappingProxyType(code_to_province),
+            MappingProxyType(alias_to_code), tuple(api_regions))
+
+
+CODE_TO_NAME, CODE_TO_PROVINCE, ALIAS_TO_CODE, API_REGIONS = _build_indexes(SUPPORTED_REGIONS)
+
+
+@lru_cache(maxsize=4096)
+def _scan_region_code(normalized_region):
+    """별칭 표에 없는 지역명의 기존 부분 문자열 매칭 (결과는 메모이즈)"""
+    # 먼저 광역시/도 + 구/군 매칭 시도
+    for province_name, province_data in SUPPORTED_REGIONS.items():
+        for district_name, code in province_data['districts'].items():
+            if district_name in normalized_region and _province_short(province_name) in normalized_region:
+                return code
+
+    # 부분 매칭 시도
+    for province_data in SUPPORTED_REGIONS.values():
+        for district_name, code in province_data['districts'].items():
+            if district_name in normalized_region or normalized_region in district_name:
+                return code
+    return None
+
+
 class RegionService:
     def __init__(self):
-        # 서비스 지원 광역시/도 및 하위 지역
-        self.supported_regions = {
-            '서울특별시': {
-                'name': '서울특별시',
-                'code_prefix': '11',
-                'districts': {
-                    '강남구': '11680',
-                    '강동구': '11740',
-                    '강북구': '11305',
-                    '강서구': '11500',
-                    '관악구': '11620',
-                    '광진구': '11215',
-                    '구로구': '11530',
-                    '금천구': '11545',
-                    '노원구': '11350',
-                    '도봉구': '11320',
-                    '동대문구': '11230',
-                    '동작구': '11590',
-                    '마포구': '11440',
-                    '서대문구': '11410',
-                    '서초구': '11650',
-                    '성동구': '11200',
-                    '성북구': '11290',
-                    '송파구': '11710',
-                    '양천구': '11470',
-                    '영등포구': '11560',
-                    '용산구': '11170',
-                    '은평구': '11380',
-                    '종로구': '11110',
-                    '중구': '11140',
-                    '중랑구': '11260'
-                }
-            },
-            '부산광역시': {
-                'name': '부산광역시',
-                'code_prefix': '26',
-                'districts': {
-                    '강서구': '26440',
-                    '금정구': '26410',
-                    '기장군': '26710',
-                    '남구': '26290',
-                    '동구': '26170',
-                    '동래구': '26260',
-                    '부산진구': '26230',
-                    '북구': '26320',
-                    '사상구': '26530',
-                    '사하구': '26380',
-                    '서구': '26140',
-                    '수영구': '26500',
-                    '연제구': '26470',
-                    '영도구': '26200',
-                    '중구': '26110',
-                    '해운대구': '26350'
-                }
-            },
-            '인천광역시': {
-                'name': '인천광역시',
-                'code_prefix': '28',
-                'districts': {
-                    '강화군': '28710',
-                    '계양구': '28245',
-                    '남동구': '28200',
-                    '동구': '28140',
-                    '미추홀구': '28177',
-                    '부평구': '28237',
-                    '서구': '28260',
-                    '연수구': '28185',
-                    '옹진군': '28720',
-                    '중구': '28110'
-                }
-            },
-            '대구광역시': {
-                'name': '대구광역시',
-                'code_prefix': '27',
-                'districts': {
-                    '남구': '27200',
-                    '달서구': '27290',
-                    '달성군': '27710',
-                    '동구': '27140',
-                    '북구': '27230',
-                    '서구': '27260',
-                    '수성구': '27245',
-                    '중구': '27110',
-                    '군위군': '27720'
-                }
-            },
-            '광주광역시': {
-                'name': '광주광역시',
-                'code_prefix': '29',
-                'districts': {
-                    '동구': '29110',
-                    '서구': '29140',
-                    '남구': '29155',
-                    '북구': '29200',
-                    '광산구': '29210'
-                }
-            },
-            '대전광역시': {
-                'name': '대전광역시',
-                'code_prefix': '30',
-                'districts': {
-                    '동구': '30110',
-                    '중구': '30140',
-                    '서구': '30170',
-                    '유성구': '30200',
-                    '대덕구': '30230'
-                }
-            },
-            '울산광역시': {
-                'name': '울산광역시',
-                'code_prefix': '31',
-                'districts': {
-                    '중구': '31110',
-                    '남구': '31140',
-                    '동구': '31170',
-                    '북구': '31200',
-                    '울주군': '31710'
-                }
-            },
-            '경기도': {
-                'name': '경기도',
-                'code_prefix': '41',
-                'districts': {
-                    '가평군': '41820',
-                    '고양시': '41280',
-                    '과천시': '41290',
-                    '광명시': '41210',
-                    '광주시': '41610',
-                    '구리시': '41310',
-                    '군포시': '41410',
-                    '김포시': '41570',
-                    '남양주시': '41360',
-                    '동두천시': '41250',
-                    '부천시': '41190',
-                    '부천시 원미구': '41191',
-                    '부천시 소사구': '41192',
-                    '부천시 오정구': '41193',
-                    '성남시': '41130',
-                    '수원시': '41110',
-                    '시흥시': '41390',
-                    '안산시': '41270',
-                    '안성시': '41550',
-                    '안양시': '41170',
-                    '양주시': '41630',
-                    '양평군': '41830',
-                    '여주시': '41670',
-                    '연천군': '41800',
-                    '오산시': '41370',
-                    '용인시': '41460',
-                    '의왕시': '41430',
-                    '의정부시': '41150',
-                    '이천시': '41500',
-                    '파주시': '41480',
-                    '평택시': '41220',
-                    '포천시': '41650',
-                    '하남시': '41450',
-                    '화성시': '41590'
-                }
-            }
-        }
+        # 서비스 지원 광역시/도 및 하위 지역 (모듈 상수 공유)
+        self.supported_regions = SUPPORTED_REGIONS
     
     def get_supported_provinces(self):
         """지원하는 광역시/도 목록 반환"""
@@ -185,33 +252,66 @@ class RegionService:
     
     def get_region_code(self, region_name):
         """지역명으로 지역코드 찾기"""
-        # 정확한 매칭을 위한 정규화
-        normalized_region = region_name.strip()
+        normalized_region = _normalize(region_name)
         
-        # 먼저 정확한 매칭 시도
-        for province_name, province_data in self.supported_regions.items():
-            for district_name, code in province_data['districts'].items():
-                # "경기 부천시 소사구" -> "경기도" + "부천시 소사구" 매칭
-                if district_name in normalized_region:
-                    # 광역시/도 확인
-                    province_short = province_name.replace('특별시', '').replace('광역시', '').replace('도', '')
-                    if province_short in normalized_region:
-                        return code
+        # 별칭 표 조회 ("경기 부천시 소사구", "경기도 부천시 소사구", "부천시 소사구" 등)
+        code = ALIAS_TO_CODE.get(normalized_region)
+        if code is not None:
+            return code
         
-        # 부분 매칭 시도 (기존 로직)
-        for province_data in self.supported_regions.values():
-            for district_name, code in province_data['districts'].items():
-                if district_name in normalized_region or normalized_region in district_name:
-                    return code
-        return None
+        # 표에 없는 표기는 부분 매칭 (기존 로직)
+        return _scan_region_code(normalized_region)
+    
+    def get_region_codes(self, region_names):
+        """여러 지역명을 한 번에 지역코드로 변환, {지역명: 코드 또는 None}"""
+        return {region_name: self.get_region_code(region_name) for region_name in region_names}
+    
+    def get_region_name(self, region_code):
+        """지역코드로 표준 지역명 찾기 (예: '11680' -> '서울 강남구'), 없으면 None"""
+        return CODE_TO_NAME.get(region_code)
+    
+    def get_region_names(self, region_codes):
+        """여러 지역코드를 한 번에 표준 지역명으로 변환, {코드: 지역명 또는 None}"""
+        return {region_code: CODE_TO_NAME.get(region_code) for region_code in region_codes}
     
+    def get_city_regions(self, city_name):
+        """시 단위 지역의 수집 대상 (하위 구가 등록된 시는 구 목록, 아니면 시 자체)"""
+        code = self.get_region_code(city_name)
+        if code is None:
+            return []
+        province_name = CODE_TO_PROVINCE[code]
+        city = CODE_TO_NAME[code].split(' ', 1)[1]
+        children = [district for district in self.supported_regions[province_name]['districts']
+                    if district.startswith(f"{city} ")]
+        if children:
+            return [self.format_region_name(province_name, district) for district in children]
+        return [CODE_TO_NAME[code]]
+
+    def get_region_set(self, province=None, city=None, regions=None):
+        """수집 대상 지역 집합을 표준 지역명 목록으로 반환 (광역시/도 전체, 시 단위, 또는 지역명 목록)
+
+        같은 코드로 귀결되는 지역은 한 번만 포함하고, 지원하지 않는 지역명은 제외
+        """
+        names = []
+        if province is not None:
+            # 하위 구가 등록된 시는 구 단위로만 수집 (시 코드와 중복 방지)
+            for district in self.get_districts_by_province(province):
+                if ' ' in district:
+                    continue
+                names.extend(self.get_city_regions(self.format_region_name(province, district)))
+        if city is not None:
+            names.extend(self.get_city_regions(city))
+        for region_name, code in self.get_region_codes(regions or []).items():
+            if code is None:
+                print(f"지원하지 않는 지역 제외: {region_name}")
+            else:
+                names.append(CODE_TO_NAME[code])
+        return list(dict.fromkeys(names))
+
     def get_province_by_region_name(self, region_name):
         """지역명으로 소속 광역시/도 찾기"""
-        for province_name, province_data in self.supported_regions.items():
-            for district_name in province_data['districts'].keys():
-                if district_name in region_name or region_name in district_name:
-                    return province_name
-        return None
+        code = self.get_region_code(region_name)
+        return CODE_TO_PROVINCE.get(code) if code is not None else None
     
     def is_supported_region(self, region_name):
         """지원하는 지역인지 확인"""
@@ -224,12 +324,7 @@ class RegionService:
     
     def get_regions_for_api(self):
         """API에서 사용할 지역 목록 반환 (표준 형식)"""
-        regions = []
-        for province_name, province_data in self.supported_regions.items():
-            for district_name in province_data['districts'].keys():
-                formatted_name = self.format_region_name(province_name, district_name)
-                regions.append(formatted_name)
-        return regions
+        return list(API_REGIONS)
     
     def get_sample_regions_by_province(self, province_name, limit=5):
         """특정 광역시/도의 샘플 지역 반환"""
@@ -247,10 +342,8 @@ class RegionService:
         if not regions:
             return True, []
         
-        unsupported = []
-        for region in regions:
-            if not self.is_supported_region(region):
-                unsupported.append(region)
+        codes = self.get_region_codes(regions)
+        unsupported = [region for region in regions if codes[region] is None]
         
         if unsupported:
             return False, unsupported
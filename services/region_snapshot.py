@@ -0,0 +1,282 @@
+"""
+지역 스냅샷 모듈
+지역별 JSON 배열을 미리 직렬화해 연속된 바이트 구간으로 저장하고, 작은 헤더 인덱스에 (오프셋, 길이, 건수) 기록
+서빙 시 파일을 mmap 하고 요청한 지역의 구간만 잘라 응답하므로 다른 지역은 파싱하지 않음
+스냅샷은 빌드 단계(build_response_artifacts.py)에서만 만들고, 헤더의 원본 크기/SHA-256으로 유효성 판단
+gzip_members 스냅샷은 지역마다 '"지역":[...]' 조각을 독립된 gzip 멤버로 저장해
+임의의 지역 조합을 멤버 연결만으로 (재압축 없이) 하나의 gzip 응답으로 조립
+
+파일 형식: MAGIC | 헤더 길이(8바이트 big-endian) | 헤더 JSON | 지역별 구간...
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+from services.dataset_cache import file_digest, file_signature
+from services.region_service import RegionService
+from services.response_encoder import response_encoder
+
+MAGIC = b'RSNAP1\n'
+HEADER_LENGTH = struct.Struct('>Q')
+
+
+def _seoul_district_sources(data_dir):
+    """서울 구별 파일 (파일 하나가 구 하나의 거래 목록)"""
+    districts = RegionService().get_districts_by_province('서울특별시')
+    return [(os.path.join(data_dir, f'서울_{district}_data.json'), district) for district in districts]
+
+
+# 스냅샷 정의: 이름 -> 스냅샷 파일과 원본 목록 [(경로, 지역 키)]
+# 지역 키가 None이면 원본 파일 자체가 {지역: 거래 목록} dict
+SNAPSHOT_SPECS = {
+    'busan': {
+        'snapshot': 'busan_all_data.snap',
+        'sources': lambda data_dir: [(os.path.join(data_dir, 'busan_all_data.json'), None)]
+    },
+    'seoul_districts': {
+        'snapshot': 'seoul_districts.snap',
+        'sources': _seoul_district_sources
+    },
+    # /api/regions-bundle 용 지역별 gzip 멤버 (통합 데이터의 'data' 필드)
+    'integrated_members': {
+        'snapshot': 'all_cities_integrated_data.members.snap',
+        'sources': lambda data_dir: [(os.path.join(data_dir, 'all_cities_integrated_data.json'), None)],
+        'field': 'data',
+        'gzip_members': True
+    }
+}
+
+# 지역 멤버 사이에 들어가는 ',' gzip 멤버
+GZIP_COMMA = response_encoder.compress(b',', level=9)
+
+
+def write_region_snapshot(path, regions, sources, gzip_members=False):
+    """(지역, 값) 목록을 스냅샷 파일로 기록, 기록한 지역 수 반환
+
+    값은 직렬화한 바이트만 남기고 바로 버리므로 원본 파싱 결과를 한꺼번에 들고 있지 않음
+    """
+    index = {}
+    bodies = []
+    offset = 0
+    for name, value in regions:
+        if gzip_members:
+            fragment = response_encoder.serialize(name) + b':' + response_encoder.serialize(value)
+            body = response_encoder.compress(fragment, level=9)
+        else:
+            body = response_encoder.serialize(value)
+        count = len(value) if isinstance(value, list) else 0
+        index[name] = [offset, len(body), count]
+        bodies.append(body)
+        offset += len(body)
+
+    header = json.dumps({'sources': sources, 'gzip_members': gzip_members, 'regions': index},
+                        ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    # 워커마다 다른 임시 파일에 쓴 뒤 교체 (동시에 빌드해도 잘린 파일이 자리를 차지하지 않음)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            for body in bodies:
+                f.write(body)
+        # mkstemp는 0600으로 만들므로 일반 파일 권한으로 맞춤
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(index)
+
+
+class RegionSnapshot:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"스냅샷 형식이 아닙니다: {path}")
+        header_start = len(MAGIC) + HEADER_LENGTH.size
+        (header_length,) = HEADER_LENGTH.unpack(self._mmap[len(MAGIC):header_start])
+        header = json.loads(self._mmap[header_start:header_start + header_length].decode('utf-8'))
+
+        # [파일 이름, 지역 키, 크기, SHA-256] (이전 형식 스냅샷은 빈 목록 -> 원본과 불일치)
+        self.sources = header.get('sources', [])
+        self.gzip_members = header.get('gzip_members', False)
+        self.regions = header['regions']
+        self._body_start = header_start + header_length
+
+    def __contains__(self, region):
+        return region in self.regions
+
+    def region_bytes(self, region):
+        """지역의 JSON 배열(gzip_members면 gzip 멤버) 바이트 구간 (mmap 메모리뷰, 복사/파싱 없음)"""
+        offset, length, _ = self.regions[region]
+        start = self._body_start + offset
+        return memoryview(self._mmap)[start:start + length]
+
+    def region_length(self, region):
+        return self.regions[region][1]
+
+    def transaction_count(self, region):
+        return self.regions[region][2]
+
+
+class RegionSnapshotStore:
+    def __init__(self, data_dir='collected_data', specs=None):
+        self.data_dir = data_dir
+        self.specs = specs if specs is not None else SNAPSHOT_SPECS
+        # 이름 -> (확인할 때의 원본 시그니처, 스냅샷 또는 None)
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def _sources(self, name):
+        """존재하는 원본 파일 [(경로, 지역 키)]"""
+        return [(path, key) for path, key in self.specs[name]['sources'](self.data_dir) if os.path.exists(path)]
+
+    def _source_signatures(self, name):
+        """존재하는 원본 파일의 [경로, 지역 키, 시그니처] 목록 (프로세스 안에서 확인 결과를 재사용하는 키)"""
+        signatures = []
+        for path, key in self._sources(name):
+            signature = file_signature(path)
+            if signature is not None:
+                signatures.append([os.path.basename(path), key, list(signature)])
+        return signatures
+
+    def _source_entries(self, name):
+        """스냅샷 헤더에 기록할 원본 [파일 이름, 지역 키, 크기, SHA-256] 목록"""
+        return [[os.path.basename(path), key, os.path.getsize(path), file_digest(path)]
+                for path, key in self._sources(name)]
+
+    def _matches_sources(self, name, snapshot):
+        """스냅샷을 만든 원본과 현재 원본의 내용이 같은지 (크기를 먼저 비교하고 같을 때만 해시 비교)"""
+        current = self._sources(name)
+        if len(current) != len(snapshot.sources):
+            return False
+        for (path, key), (basename, recorded_key, size, _) in zip(current, snapshot.sources):
+            if os.path.basename(path) != basename or key != recorded_key or os.path.getsize(path) != size:
+                return False
+        return all(file_digest(path) == entry[3] for (path, _), entry in zip(current, snapshot.sources))
+
+    def build(self, name):
+        """원본 JSON을 파싱해 스냅샷 파일 생성 (원본이 하나도 없으면 None, 빌드 단계용)
+
+        데이터셋 캐시를 거치지 않고 원본 파일을 하나씩 읽어 기록한 뒤 버림
+        """
+        sources = self._source_entries(name)
+        if not sources:
+            return None
+
+        spec = self.specs[name]
+
+        def iter_regions():
+            for path, key in self._sources(name):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"지역 스냅샷 원본 로드 실패 ({path}): {e}")
+                    continue
+                if spec.get('field'):
+                    data = data.get(spec['field'], {})
+                if key is None:
+                    yield from data.items()
+                else:
+                    yield key, data
+
+        snapshot_path = os.path.join(self.data_dir, spec['snapshot'])
+        count = write_region_snapshot(snapshot_path, iter_regions(), sources, spec.get('gzip_members', False))
+        print(f"🗂️  지역 스냅샷 생성: {snapshot_path} ({count}개 지역)")
+        return RegionSnapshot(snapshot_path)
+
+    def _load(self, name):
+        """디스크 스냅샷이 현재 원본 내용과 같으면 열어서 반환, 없거나 다르면 None"""
+        snapshot_path = os.path.join(self.data_dir, self.specs[name]['snapshot'])
+        if not os.path.exists(snapshot_path):
+            print(f"⚠️  지역 스냅샷 없음: {name} - 원본 파일로 응답 (빌드 단계에서 build_response_artifacts.py 실행 필요)")
+            return None
+        try:
+            snapshot = RegionSnapshot(snapshot_path)
+        except (OSError, ValueError) as e:
+            print(f"지역 스냅샷 로드 실패 ({snapshot_path}): {e}")
+            return None
+        try:
+            matches = self._matches_sources(name, snapshot)
+        except OSError:
+            matches = False
+        if not matches:
+            print(f"⚠️  지역 스냅샷이 원본과 다름: {name} - 원본 파일로 응답 (build_response_artifacts.py 실행 필요)")
+            return None
+        return snapshot
+
+    def get(self, name):
+        """원본과 내용이 같은 스냅샷 반환, 원본이나 유효한 스냅샷이 없으면 None
+
+        요청 경로에서는 스냅샷을 만들지 않음 (호출 측이 원본 파일로 대체)
+        """
+        signatures = self._source_signatures(name)
+        if not signatures:
+            return None
+
+        cached = self._snapshots.get(name)
+        if cached is not None and cached[0] == signatures:
+            return cached[1]
+
+        with self._lock:
+            cached = self._snapshots.get(name)
+            if cached is None or cached[0] != signatures:
+                cached = (signatures, self._load(name))
+                self._snapshots[name] = cached
+            return cached[1]
+
+    def build_all(self):
+        """모든 스냅샷 생성 (배포/수집 후 빌드 단계용)"""
+        built = {}
+        for name in self.specs:
+            snapshot = self.build(name)
+            if snapshot is not None:
+                with self._lock:
+                    self._snapshots[name] = (self._source_signatures(name), snapshot)
+                built[name] = snapshot
+        return built
+
+
+def gzip_bundle(snapshot, regions, head, tail):
+    """gzip_members 스냅샷에서 {head..., "data": {지역...}, tail...} gzip 응답을 (전체 길이, 멤버 생성기)로 반환
+
+    지역 멤버는 mmap 메모리뷰를 그대로 내보내고 요청마다 달라지는 head/tail만 새로 압축
+    전체 길이는 헤더의 멤버 길이로 계산하므로 응답 본문을 미리 모으지 않음
+    """
+    head_member = response_encoder.compress(b'{' + response_encoder.fields(head) + b',"data":{')
+    tail_member = response_encoder.compress(b'},' + response_encoder.fields(tail) + b'}')
+    length = (len(head_member) + len(tail_member) + len(GZIP_COMMA) * (len(regions) - 1)
+              + sum(snapshot.region_length(region) for region in regions))
+
+    def members():
+        yield head_member
+        for i, region in enumerate(regions):
+            if i:
+                yield GZIP_COMMA
+            yield snapshot.region_bytes(region)
+        yield tail_member
+
+    return length, members()
+
+
+def iter_chunks(parts, chunk_size=64 * 1024):
+    """bytes/메모리뷰 조각을 WSGI 서버가 받는 bytes로 생성 (메모리뷰는 chunk_size씩만 복사)"""
+    for part in parts:
+        if isinstance(part, bytes):
+            yield part
+            continue
+        for start in range(0, len(part), chunk_size):
+            yield bytes(part[start:start + chunk_size])
+
+
+# 프로세스 전역 스냅샷 저장소
+region_snapshot_store = RegionSnapshotStore()
@@ -0,0 +1,299 @@
+"""
+응답 아티팩트 모듈
+정적 스냅샷의 JSON 응답을 미리 직렬화/압축한 사이드카(.json.gz, 선택적으로 .json.br/.json.zst)로 저장
+콘텐츠 해시를 ETag로 기록해 엔드포인트가 압축 바이트를 그대로 전송하고 If-None-Match에는 304로 응답
+
+사이드카는 빌드 단계(build_response_artifacts.py)에서 최대 압축으로 만들고, 매니페스트는 원본 스냅샷의
+크기와 SHA-256으로 유효성을 판단 (체크아웃/배포 후 mtime/inode가 달라져도 그대로 재사용)
+매니페스트가 없거나 맞지 않으면 요청 경로에서는 기본 레벨 gzip만 메모리에 만들어 사용
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from flask import Response, has_app_context, send_file
+
+from services.dataset_cache import dataset_cache, file_digest, file_signature
+from services.response_encoder import response_encoder
+
+# 선택적 압축 라이브러리 (설치된 경우에만 사이드카 생성)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content-Encoding -> 사이드카 확장자 (클라이언트 선호 시 앞쪽 우선)
+ENCODING_SUFFIXES = {
+    'br': '.json.br',
+    'zstd': '.json.zst',
+    'gzip': '.json.gz'
+}
+
+
+def _integrated_full_envelope(data, source_path):
+    """api/integrated_data.py 전체 데이터 응답"""
+    return {
+        'status': 'success',
+        'data': data,
+        'type': 'full',
+        'metadata': {
+            'collection_date': '2025-08-11 17:40:25',
+            'total_cities': len(data),
+            'data_size_mb': round(os.path.getsize(source_path) / (1024 * 1024), 2)
+        }
+    }
+
+
+# 아티팩트 정의: 이름 -> 원본 스냅샷 파일과 응답 envelope 생성 함수
+ARTIFACT_SPECS = {
+    'busan_incheon_seoul_daegu_bucheon': {
+        'source': 'busan_incheon_seoul_daegu_bucheon_all_data.json',
+        'envelope': lambda data, source_path: {
+            'status': 'success',
+            'data': data,
+            'message': '저장된 부산+인천+서울+대구+부천 데이터를 성공적으로 로드했습니다.'
+        }
+    },
+    'all_cities_integrated': {
+        'source': 'all_cities_integrated_data.json',
+        'envelope': _integrated_full_envelope
+    }
+}
+
+
+def _compress(body, encoding):
+    """인코딩별 최대 압축 (빌드 시 1회만 수행)"""
+    if encoding == 'gzip':
+        return response_encoder.compress(body, level=9)
+    if encoding == 'br':
+        return brotli.compress(body, quality=11)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=19).compress(body)
+    raise ValueError(f"지원하지 않는 인코딩: {encoding}")
+
+
+def available_encodings():
+    """현재 환경에서 생성 가능한 압축 인코딩 목록"""
+    encodings = ['gzip']
+    if brotli is not None:
+        encodings.append('br')
+    if zstandard is not None:
+        encodings.append('zstd')
+    return encodings
+
+
+def _write_atomic(path, payload):
+    """임시 파일에 쓴 뒤 교체 (서빙 중인 파일이 깨지지 않도록)
+
+    임시 파일 이름은 호출마다 달라 여러 워커가 동시에 빌드해도 잘린 파일로 교체되지 않음
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        # mkstemp는 0600으로 만들므로 일반 파일 권한으로 맞춤
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ResponseArtifactStore:
+    def __init__(self, data_dir='collected_data', specs=None):
+        self.data_dir = data_dir
+        self.specs = specs if specs is not None else ARTIFACT_SPECS
+        # 이름 -> 로드된 아티팩트 (source_signature가 바뀌면 매니페스트를 다시 확인)
+        self._artifacts = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, name):
+        """원본 스냅샷과 사이드카 경로"""
+        source = self.specs[name]['source']
+        source_path = os.path.join(self.data_dir, source)
+        base = os.path.join(self.data_dir, source[:-len('.json')] if source.endswith('.json') else source)
+        return source_path, base
+
+    def _serialize(self, name, source_path, signature):
+        """스냅샷 -> (응답 본문, 아티팩트 기본 정보), 스냅샷이 없거나 비었으면 (None, None)"""
+        data = dataset_cache.get(source_path)
+        if not data:
+            return None, None
+        body = response_encoder.serialize(self.specs[name]['envelope'](data, source_path))
+        return body, {
+            'name': name,
+            'content_hash': hashlib.sha256(body).hexdigest()[:32],
+            'source_signature': list(signature),
+            'source_size': signature[1],
+            'raw_size': len(body),
+            'built_at': datetime.now().isoformat(),
+            'files': {},
+            'bodies': {}
+        }
+
+    def build(self, name):
+        """스냅샷을 응답 본문으로 직렬화하고 최대 압축 사이드카 + 매니페스트 기록 (빌드 단계용)"""
+        source_path, base = self._paths(name)
+        signature = file_signature(source_path)
+        if signature is None:
+            return None
+
+        body, artifact = self._serialize(name, source_path, signature)
+        if artifact is None:
+            return None
+        artifact['source_sha256'] = file_digest(source_path)
+
+        for encoding in available_encodings():
+            payload = _compress(body, encoding)
+            path = base + '.response' + ENCODING_SUFFIXES[encoding]
+            try:
+                _write_atomic(path, payload)
+                artifact['files'][encoding] = path
+            except OSError as e:
+                # 읽기 전용 파일시스템(서버리스 등)에서는 메모리에만 보관
+                print(f"아티팩트 저장 실패 ({path}): {e}")
+                artifact['bodies'][encoding] = payload
+
+        manifest = {key: value for key, value in artifact.items() if key != 'bodies'}
+        try:
+            _write_atomic(base + '.response.manifest.json',
+                          json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+        except OSError as e:
+            print(f"아티팩트 매니페스트 저장 실패: {e}")
+
+        print(f"📦 응답 아티팩트 생성: {name} ({len(body) / 1024 / 1024:.2f}MB, "
+              f"인코딩: {', '.join(available_encodings())}, ETag: {artifact['content_hash']})")
+        return artifact
+
+    def _load_manifest(self, name, signature):
+        """디스크의 매니페스트가 현재 스냅샷 내용(크기 + SHA-256)과 일치하면 그대로 사용"""
+        source_path, base = self._paths(name)
+        try:
+            with open(base + '.response.manifest.json', 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # 크기가 다르면 해시 계산 없이 바로 불일치
+        if manifest.get('source_size') != signature[1] or not manifest.get('source_sha256'):
+            return None
+        if not all(os.path.exists(path) for path in manifest.get('files', {}).values()):
+            return None
+        try:
+            if file_digest(source_path) != manifest['source_sha256']:
+                return None
+        except OSError:
+            return None
+        # 이 프로세스에서는 현재 파일 시그니처로 기억해 다음 요청부터 해시를 다시 계산하지 않음
+        manifest['source_signature'] = list(signature)
+        manifest['bodies'] = {}
+        return manifest
+
+    def _build_fallback(self, name, signature):
+        """매니페스트가 없을 때 요청 경로용 아티팩트 (기본 레벨 gzip만, 메모리에만 보관)"""
+        source_path, _ = self._paths(name)
+        body, artifact = self._serialize(name, source_path, signature)
+        if artifact is None:
+            return None
+        artifact['bodies']['gzip'] = response_encoder.compress(body)
+        print(f"⚠️  응답 아티팩트 매니페스트 없음: {name} - 기본 gzip으로 대체 "
+              f"(빌드 단계에서 build_response_artifacts.py 실행 필요)")
+        return artifact
+
+    def get(self, name):
+        """최신 아티팩트 반환 (스냅샷이 없으면 None)
+
+        빌드된 사이드카가 현재 스냅샷과 맞으면 사용하고, 아니면 기본 레벨 gzip으로 대체
+        (최대 레벨 압축은 요청 경로에서 하지 않음)
+        """
+        source_path, _ = self._paths(name)
+        signature = file_signature(source_path)
+        if signature is None:
+            return None
+
+        artifact = self._artifacts.get(name)
+        if artifact is not None and tuple(artifact['source_signature']) == signature:
+            return artifact
+
+        with self._lock:
+            artifact = self._artifacts.get(name)
+            if artifact is not None and tuple(artifact['source_signature']) == signature:
+                return artifact
+            artifact = self._load_manifest(name, signature) or self._build_fallback(name, signature)
+            if artifact is not None:
+                self._artifacts[name] = artifact
+            return artifact
+
+    def build_all(self):
+        """모든 아티팩트 빌드 (배포/수집 후 빌드 단계용)"""
+        built = {}
+        for name in self.specs:
+            artifact = self.build(name)
+            if artifact is not None:
+                with self._lock:
+                    self._artifacts[name] = artifact
+                built[name] = artifact
+        return built
+
+
+def etag_matches(if_none_match, content_hash):
+    """If-None-Match 헤더가 아티팩트 해시와 일치하는지 확인"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        # ETag는 "해시.인코딩" 형식
+        if tag.strip('"').split('.')[0] == content_hash:
+            return True
+    return False
+
+
+def choose_encoding(accept_encoding, artifact):
+    """클라이언트가 허용하는 가장 효율적인 인코딩 선택 (기본 gzip)"""
+    accepted = {token.split(';')[0].strip() for token in (accept_encoding or '').lower().split(',')}
+    for encoding in ENCODING_SUFFIXES:
+        if encoding in accepted and (encoding in artifact['files'] or encoding in artifact['bodies']):
+            return encoding
+    return 'gzip'
+
+
+def artifact_response(artifact, request):
+    """아티팩트를 그대로 전송하는 응답 생성 (ETag 일치 시 304)"""
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'), artifact)
+    etag = f'"{artifact["content_hash"]}.{encoding}"'
+
+    if etag_matches(request.headers.get('If-None-Match'), artifact['content_hash']):
+        response = Response(status=304)
+    else:
+        path = artifact['files'].get(encoding)
+        if path and has_app_context():
+            # 파일을 그대로 전송 (gunicorn 등에서 sendfile 사용)
+            response = send_file(os.path.abspath(path), mimetype='application/json', conditional=False, etag=False)
+            response.headers.pop('Content-Disposition', None)
+        elif path:
+            with open(path, 'rb') as f:
+                response = Response(f.read(), mimetype='application/json')
+        else:
+            response = Response(artifact['bodies'][encoding], mimetype='application/json')
+        response.headers['Content-Encoding'] = encoding
+
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+# 프로세스 전역 아티팩트 저장소
+artifact_store = ResponseArtifactStore()
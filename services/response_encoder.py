@@ -0,0 +1,121 @@
+"""
+응답 인코더 모듈
+JSON 직렬화를 요청당 한 번만 수행하고, 재사용 버퍼에 gzip을 청크 단위로 압축
+orjson이 설치되어 있으면 사용하고 없으면 표준 json으로 대체
+"""
+
+import io
+import json
+import os
+import threading
+import time
+import zlib
+
+try:
+    import orjson  # 선택적 의존성 (빠른 JSON 백엔드)
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+# gzip 헤더를 포함하는 zlib wbits 값
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class ResponseEncoder:
+    def __init__(self, level=None, chunk_size=256 * 1024):
+        # 압축 레벨 (1=빠름 ~ 9=최대 압축, 기본은 환경 변수 또는 6)
+        if level is None:
+            level = int(os.environ.get('RESPONSE_GZIP_LEVEL', 6))
+        self.level = level
+        self.chunk_size = chunk_size
+        # 스레드별 압축 출력 버퍼 (요청마다 새로 할당하지 않도록 재사용)
+        self._local = threading.local()
+
+    def serialize(self, data):
+        """JSON 바이트로 1회 직렬화"""
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _buffer(self):
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = io.BytesIO()
+        buffer.seek(0)
+        buffer.truncate()
+        return buffer
+
+    def compress(self, body, level=None):
+        """직렬화된 바이트를 청크 단위로 gzip 압축"""
+        compressor = zlib.compressobj(self.level if level is None else level, zlib.DEFLATED, GZIP_WBITS)
+        buffer = self._buffer()
+        view = memoryview(body)
+        for start in range(0, len(view), self.chunk_size):
+            buffer.write(compressor.compress(view[start:start + self.chunk_size]))
+        buffer.write(compressor.flush())
+        return buffer.getvalue()
+
+    def encode(self, data, level=None):
+        """직렬화 + 압축, 단계별 소요 시간과 크기를 함께 반환"""
+        started = time.perf_counter()
+        body = self.serialize(data)
+        serialized = time.perf_counter()
+        compressed = self.compress(body, level)
+        finished = time.perf_counter()
+
+        timings = {
+            'backend': JSON_BACKEND,
+            'serialize_ms': round((serialized - started) * 1000, 2),
+            'compress_ms': round((finished - serialized) * 1000, 2),
+            'raw_bytes': len(body),
+            'compressed_bytes': len(compressed)
+        }
+        return compressed, timings
+
+    def fields(self, values):
+        """dict를 중괄호 없는 JSON 필드 나열 바이트로 직렬화 (응답 envelope 조립용)"""
+        return b','.join(self.serialize(key) + b':' + self.serialize(value) for key, value in values.items())
+
+    def iter_envelope(self, head, key, items, tail=None):
+        """{head..., key: {항목...}, tail...} 형태의 JSON을 항목 단위 바이트 청크로 생성
+
+        items는 (이름, 값) 이터러블이며 값 하나씩만 직렬화하므로 전체 문자열을 만들지 않는다.
+        """
+        yield b'{'
+        for field, value in head.items():
+            yield self.serialize(field) + b':' + self.serialize(value) + b','
+        yield self.serialize(key) + b':{'
+        first = True
+        for name, value in items:
+            prefix = b'' if first else b','
+            first = False
+            yield prefix + self.serialize(name) + b':' + self.serialize(value)
+        yield b'}'
+        for field, value in (tail or {}).items():
+            yield b',' + self.serialize(field) + b':' + self.serialize(value)
+        yield b'}'
+
+    def gzip_stream(self, chunks, level=None):
+        """바이트 청크 이터러블을 스트리밍 gzip 압축 (메모리는 압축 윈도우 크기로 제한)"""
+        compressor = zlib.compressobj(self.level if level is None else level, zlib.DEFLATED, GZIP_WBITS)
+        first = True
+        for chunk in chunks:
+            output = compressor.compress(chunk)
+            if first:
+                # 첫 청크는 바로 플러시해서 클라이언트가 즉시 첫 바이트를 받도록 함
+                output += compressor.flush(zlib.Z_SYNC_FLUSH)
+                first = False
+            if output:
+                yield output
+        yield compressor.flush()
+
+
+def server_timing_header(timings):
+    """Server-Timing 헤더 값 생성 (브라우저 개발자 도구에서 확인 가능)"""
+    return (f"serialize;dur={timings['serialize_ms']};desc=\"{timings['backend']}\", "
+            f"compress;dur={timings['compress_ms']}")
+
+
+# 프로세스 전역 기본 인코더
+response_encoder = ResponseEncoder()
@@ -0,0 +1,138 @@
+"""
+행 인덱스 모듈
+지역별 거래 목록(dict)을 평탄화하지 않고 지역 오프셋 + 전체 행 수로 페이지를 계산
+스냅샷 버전마다 1회 생성하며, 지역/기간 필터용 날짜 정렬 순열은 처음 필요할 때 생성
+"""
+
+import base64
+import binascii
+import json
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+def _row_date(row):
+    """정렬/필터 기준 거래일 (YYYY-MM-DD)"""
+    if not isinstance(row, dict):
+        return ''
+    return row.get('date') or row.get('latest_transaction_date') or ''
+
+
+class RowIndex:
+    def __init__(self, regions):
+        # 지역 순서는 원본 dict 순서를 그대로 유지 (기존 페이지 순서와 동일)
+        self.region_names = []
+        self._rows = []
+        self.offsets = array('q')
+        total = 0
+        for name, rows in regions.items():
+            if not isinstance(rows, list):
+                continue
+            self.region_names.append(name)
+            self._rows.append(rows)
+            self.offsets.append(total)
+            total += len(rows)
+        self.total = total
+        self._region_positions = {name: i for i, name in enumerate(self.region_names)}
+
+        # 날짜 정렬 순열 (키: None=전체, 지역 번호) -> (정렬된 날짜 목록, 전역 위치 배열)
+        self._date_orders = {}
+        self._lock = threading.Lock()
+
+    def has_region(self, region):
+        return region in self._region_positions
+
+    def _row_at(self, position):
+        """전역 위치의 행 (지역 오프셋 이진 탐색)"""
+        region_pos = bisect_right(self.offsets, position) - 1
+        return self._rows[region_pos][position - self.offsets[region_pos]]
+
+    def _region_bounds(self, region):
+        """지역의 전역 위치 범위 [start, end)"""
+        if region is None:
+            return 0, self.total
+        region_pos = self._region_positions[region]
+        start = self.offsets[region_pos]
+        return start, start + len(self._rows[region_pos])
+
+    def _date_order(self, region):
+        """(정렬된 날짜 목록, 날짜순 전역 위치 배열)"""
+        key = None if region is None else self._region_positions[region]
+        order = self._date_orders.get(key)
+        if order is not None:
+            return order
+        with self._lock:
+            order = self._date_orders.get(key)
+            if order is None:
+                start, end = self._region_bounds(region)
+                keyed = sorted((_row_date(self._row_at(pos)), pos) for pos in range(start, end))
+                order = ([date for date, _ in keyed], array('q', (pos for _, pos in keyed)))
+                self._date_orders[key] = order
+            return order
+
+    def count(self, region=None, start_date='', end_date=''):
+        """필터 조건에 맞는 행 수"""
+        if not start_date and not end_date:
+            start, end = self._region_bounds(region)
+            return end - start
+        dates, _ = self._date_order(region)
+        lo, hi = self._date_range(dates, start_date, end_date)
+        return hi - lo
+
+    @staticmethod
+    def _date_range(dates, start_date, end_date):
+        lo = bisect_left(dates, start_date) if start_date else 0
+        # end_date는 해당 일자 포함
+        hi = bisect_right(dates, end_date + '\uffff') if end_date else len(dates)
+        return lo, max(lo, hi)
+
+    def page(self, offset, limit, region=None, start_date='', end_date=''):
+        """offset부터 limit개 행 반환 (비용은 O(limit))
+
+        기간 필터가 없으면 원본 순서, 있으면 최신 거래일 순서
+        """
+        if not start_date and not end_date:
+            start, end = self._region_bounds(region)
+            first = start + offset
+            last = min(end, first + limit)
+            rows = []
+            position = first
+            while position < last:
+                region_pos = bisect_right(self.offsets, position) - 1
+                region_rows = self._rows[region_pos]
+                local = position - self.offsets[region_pos]
+                take = min(last - position, len(region_rows) - local)
+                rows.extend(region_rows[local:local + take])
+                position += take
+            return rows
+
+        dates, positions = self._date_order(region)
+        lo, hi = self._date_range(dates, start_date, end_date)
+        # 최신순: 범위 끝에서부터 offset만큼 건너뜀
+        top = hi - offset
+        bottom = max(lo, top - limit)
+        return [self._row_at(positions[i]) for i in range(top - 1, bottom - 1, -1)]
+
+
+def encode_cursor(version, offset, region='', start_date='', end_date=''):
+    """스냅샷 버전 + 위치 + 필터를 담은 불투명 커서"""
+    payload = json.dumps({'v': version, 'o': offset, 'r': region, 's': start_date, 'e': end_date},
+                         ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 해석, 형식이 잘못되면 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        return {
+            'version': str(payload['v']),
+            'offset': int(payload['o']),
+            'region': payload.get('r') or '',
+            'start_date': payload.get('s') or '',
+            'end_date': payload.get('e') or ''
+        }
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise ValueError('잘못된 커서입니다')
@@ -0,0 +1,227 @@
+"""
+수집 실행 원장 모듈
+수집 실행(run)마다 (지역 코드, 거래년월, 페이지) 작업의 상태(pending/done/failed), 행 수, 해시를
+로컬 SQLite 파일에 기록하고 완료된 페이지의 결과 행도 함께 저장
+중단된 실행을 다시 시작하면 끝나지 않은 작업만 호출하고, 완료된 페이지는 원장에서 읽어 재조립
+실행이 끝나면 결과 행은 지우고 작업별 행 수/해시만 감사용으로 남김 (같은 이름의 이전 완료 실행은 삭제)
+거래가 0건으로 확인된 지역×월은 실행과 별도로 조회 날짜를 남겨 수집 계획에서 다시 호출하지 않도록 함
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import uuid
+import zlib
+from datetime import date, datetime, timedelta
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def rows_hash(rows):
+    """결과 행 목록의 내용 해시 (같은 응답인지 비교용)"""
+    payload = json.dumps(rows, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class RunLedger:
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get('COLLECTION_LEDGER_PATH', 'collection_ledger.db')
+        self.path = path
+        # 수집 스레드들이 함께 쓰므로 연결 하나를 잠금으로 직렬화 (기록량이 작아 충분)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'running',
+                    created_at TEXT NOT NULL,
+                    finished_at TEXT
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS tasks (
+                    run_id TEXT NOT NULL,
+                    region_code TEXT NOT NULL,
+                    deal_ymd TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    row_count INTEGER NOT NULL DEFAULT 0,
+                    row_hash TEXT,
+                    total_count INTEGER,
+                    payload BLOB,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (run_id, region_code, deal_ymd, page)
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(run_id, status)')
+            # 1페이지 totalCount가 0이었던 지역×월과 마지막 조회 날짜 (실행 정리와 무관하게 유지)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS empty_months (
+                    region_code TEXT NOT NULL,
+                    deal_ymd TEXT NOT NULL,
+                    fetched_on TEXT NOT NULL,
+                    PRIMARY KEY (region_code, deal_ymd)
+                )
+            ''')
+
+    def open_run(self, name, resume=True, max_age_hours=None):
+        """같은 이름의 끝나지 않은 최근 실행이 있으면 이어서 사용, 없으면 새 실행 생성
+
+        max_age_hours보다 오래된 미완료 실행은 재개하지 않음 (기본 COLLECTION_RESUME_HOURS 또는 24시간)
+        """
+        if max_age_hours is None:
+            max_age_hours = float(os.environ.get('COLLECTION_RESUME_HOURS', 24))
+        since = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+        with self._lock:
+            if resume:
+                row = self._conn.execute(
+                    "SELECT run_id FROM runs WHERE name = ? AND status = 'running' AND created_at >= ? "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (name, since)
+                ).fetchone()
+                if row is not None:
+                    print(f"📒 수집 실행 재개: {name} ({row[0]})")
+                    return row[0]
+
+            run_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+            with self._conn:
+                self._conn.execute('INSERT INTO runs (run_id, name, created_at) VALUES (?, ?, ?)',
+                                   (run_id, name, datetime.now().isoformat()))
+            print(f"📒 새 수집 실행: {name} ({run_id})")
+            return run_id
+
+    def add_tasks(self, run_id, tasks):
+        """(지역 코드, 거래년월, 페이지) 작업을 pending으로 등록 (이미 있는 작업은 유지)"""
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO tasks (run_id, region_code, deal_ymd, page, updated_at) VALUES (?, ?, ?, ?, ?)',
+                [(run_id, region_code, deal_ymd, page, now) for region_code, deal_ymd, page in tasks]
+            )
+
+    def get_done(self, run_id, region_code, deal_ymd, page):
+        """완료된 작업이면 (결과 행, totalCount), 아니면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT payload, total_count FROM tasks '
+                'WHERE run_id = ? AND region_code = ? AND deal_ymd = ? AND page = ? AND status = ?',
+                (run_id, region_code, deal_ymd, page, DONE)
+            ).fetchone()
+        if row is None:
+            return None
+        rows = json.loads(zlib.decompress(row[0]).decode('utf-8')) if row[0] else []
+        return rows, row[1]
+
+    def mark_done(self, run_id, region_code, deal_ymd, page, rows, total_count=None):
+        """작업 완료 기록 (결과 행은 압축해 함께 저장)"""
+        payload = zlib.compress(json.dumps(rows, ensure_ascii=False).encode('utf-8'))
+        self._upsert(run_id, region_code, deal_ymd, page, DONE, len(rows), rows_hash(rows), total_count, payload, None)
+        if page == 1 and total_count is not None:
+            self._record_month(region_code, deal_ymd, empty=total_count == 0 and not rows)
+
+    def _record_month(self, region_code, deal_ymd, empty):
+        """빈 달이면 조회 날짜 기록, 거래가 생긴 달이면 기록 삭제"""
+        with self._lock, self._conn:
+            if empty:
+                self._conn.execute('''
+                    INSERT INTO empty_months (region_code, deal_ymd, fetched_on) VALUES (?, ?, ?)
+                    ON CONFLICT (region_code, deal_ymd) DO UPDATE SET fetched_on = excluded.fetched_on
+                ''', (region_code, deal_ymd, datetime.now().date().isoformat()))
+            else:
+                self._conn.execute('DELETE FROM empty_months WHERE region_code = ? AND deal_ymd = ?',
+                                   (region_code, deal_ymd))
+
+    def empty_months(self, region_codes):
+        """거래 0건으로 조회된 지역×월 {(지역 코드, 거래년월): 조회 날짜(date)}"""
+        region_codes = list(region_codes)
+        if not region_codes:
+            return {}
+        placeholders = ', '.join('?' for _ in region_codes)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT region_code, deal_ymd, fetched_on FROM empty_months WHERE region_code IN ({placeholders})',
+                region_codes
+            ).fetchall()
+        return {(region_code, deal_ymd): date.fromisoformat(fetched_on) for region_code, deal_ymd, fetched_on in rows}
+
+    def mark_failed(self, run_id, region_code, deal_ymd, page, error):
+        self._upsert(run_id, region_code, deal_ymd, page, FAILED, 0, None, None, None, str(error)[:500])
+
+    def _upsert(self, run_id, region_code, deal_ymd, page, status, row_count, row_hash, total_count, payload, error):
+        with self._lock, self._conn:
+            self._conn.execute('''
+                INSERT INTO tasks (run_id, region_code, deal_ymd, page, status, row_count, row_hash,
+                                   total_count, payload, error, attempts, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+                ON CONFLICT (run_id, region_code, deal_ymd, page) DO UPDATE SET
+                    status = excluded.status,
+                    row_count = excluded.row_count,
+                    row_hash = excluded.row_hash,
+                    total_count = excluded.total_count,
+                    payload = excluded.payload,
+                    error = excluded.error,
+                    attempts = tasks.attempts + 1,
+                    updated_at = excluded.updated_at
+            ''', (run_id, region_code, deal_ymd, page, status, row_count, row_hash, total_count, payload, error,
+                  datetime.now().isoformat()))
+
+    def unfinished_tasks(self, run_id):
+        """pending/failed 작업 목록 [(지역 코드, 거래년월, 페이지, 상태)]"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT region_code, deal_ymd, page, status FROM tasks WHERE run_id = ? AND status != ? '
+                'ORDER BY region_code, deal_ymd, page',
+                (run_id, DONE)
+            ).fetchall()
+
+    def summary(self, run_id):
+        """상태별 작업 수와 완료 행 수"""
+        with self._lock:
+            counts = dict(self._conn.execute(
+                'SELECT status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY status', (run_id,)
+            ).fetchall())
+            rows = self._conn.execute(
+                'SELECT COALESCE(SUM(row_count), 0) FROM tasks WHERE run_id = ? AND status = ?', (run_id, DONE)
+            ).fetchone()[0]
+        return {
+            'run_id': run_id,
+            'done': counts.get(DONE, 0),
+            'failed': counts.get(FAILED, 0),
+            'pending': counts.get(PENDING, 0),
+            'rows': rows
+        }
+
+    def finish_run(self, run_id):
+        """모든 작업이 완료된 경우에만 실행 종료 처리 (실패 작업이 있으면 다음 실행에서 재시도)
+
+        종료한 실행의 결과 행(payload)은 비우고, 같은 이름의 이전 완료 실행은 작업까지 삭제
+        """
+        summary = self.summary(run_id)
+        if summary['failed'] or summary['pending']:
+            print(f"📒 미완료 작업 {summary['failed'] + summary['pending']}건: 다음 실행에서 해당 작업만 재시도")
+            return False
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE runs SET status = 'finished', finished_at = ? WHERE run_id = ?",
+                               (datetime.now().isoformat(), run_id))
+            # 재개할 일이 없으므로 결과 행은 버리고 row_count/row_hash만 유지
+            self._conn.execute('UPDATE tasks SET payload = NULL WHERE run_id = ?', (run_id,))
+            old_runs = [row[0] for row in self._conn.execute(
+                "SELECT old.run_id FROM runs old JOIN runs cur ON cur.run_id = ? "
+                "WHERE old.name = cur.name AND old.status = 'finished' AND old.created_at < cur.created_at",
+                (run_id,)
+            ).fetchall()]
+            self._conn.executemany('DELETE FROM tasks WHERE run_id = ?', [(old,) for old in old_runs])
+            self._conn.executemany('DELETE FROM runs WHERE run_id = ?', [(old,) for old in old_runs])
+        print(f"📒 수집 실행 완료: {run_id} (작업 {summary['done']}건, {summary['rows']:,}행"
+              f"{f', 이전 실행 {len(old_runs)}건 정리' if old_runs else ''})")
+        return True
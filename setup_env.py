@@ -57,10 +57,14 @@ def test_api_connection():
     try:
         from crawlers.molit_api_crawler import MolitAPICrawler
         
+        from crawlers.service_keys import MissingServiceKeyError
+        
         crawler = MolitAPICrawler()
         
-        if not crawler.service_key:
-            print("❌ API 키가 설정되지 않았습니다.")
+        try:
+            crawler.key_pool.load_keys()
+        except MissingServiceKeyError as e:
+            print(f"❌ {e}")
             return False
         
         print("✅ API 키 확인됨")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 계획 테스트
+달력 월 계산, 저장된 지역×월과 신고 마감 기준의 작업 선정(missing/mutable/stored),
+0건 조회 기록이 있는 마감된 달 제외, 빈 계획 로그를 고정된 '오늘'과 임시 데이터베이스/원장으로 확인
+"""
+
+import os
+import tempfile
+from datetime import date
+
+from crawlers.response_cache import ResponseCache
+from database.connection import close_connections
+from database.models import init_db, save_transactions_bulk
+from services.collection_planner import CollectionPlanner, recent_months
+
+TODAY = date(2024, 6, 15)
+
+_state = {}
+
+
+def setup_module(module=None):
+    _state['tmpdir'] = tempfile.TemporaryDirectory()
+    _state['previous_path'] = os.environ.get('DATABASE_PATH')
+    os.environ['DATABASE_PATH'] = os.path.join(_state['tmpdir'].name, 'planner.db')
+    init_db()
+    # 11110: 2024-01(마감), 2024-05(신고 기한 안) 저장 / 26350: 저장 없음
+    save_transactions_bulk([
+        {'date': f'2024-{month:02d}-10', 'region_name': '서울특별시 종로구', 'region_code': '11110',
+         'complex_name': f'단지{i}', 'transaction_count': 1, 'avg_price': 50000, 'source': 'molit_api',
+         'jibun': str(i), 'dong': '청운동'}
+        for month in (1, 5) for i in range(3)
+    ])
+
+
+def teardown_module(module=None):
+    close_connections()
+    if _state.get('previous_path') is None:
+        os.environ.pop('DATABASE_PATH', None)
+    else:
+        os.environ['DATABASE_PATH'] = _state['previous_path']
+    _state['tmpdir'].cleanup()
+
+
+class EmptyMonths:
+    """RunLedger.empty_months만 흉내 내는 원장"""
+
+    def __init__(self, months):
+        self.months = months
+
+    def empty_months(self, region_codes):
+        return {key: fetched_on for key, fetched_on in self.months.items() if key[0] in region_codes}
+
+
+def _planner():
+    return CollectionPlanner(ResponseCache(cache_dir=os.path.join(_state['tmpdir'].name, 'cache'), lag_days=60))
+
+
+def test_recent_months():
+    assert recent_months(3, date(2024, 2, 29)) == ['202402', '202401', '202312']
+    assert recent_months(0, TODAY) == []
+
+
+def test_plan_reasons():
+    """full은 전체, incremental은 없는 달 + 신고 기한 안의 달만"""
+    planner = _planner()
+    full = planner.plan(['11110', '26350'], 6, incremental=False, today=TODAY)
+    assert full['reasons'] == {'full': 12} and len(full['tasks']) == 12
+
+    plan = planner.plan(['11110', '26350', '11110'], 6, incremental=True, today=TODAY)
+    tasks = set(plan['tasks'])
+    # 2024-01은 저장되어 있고 마감됨, 2024-05는 저장되어 있지만 신고 기한 안
+    assert ('11110', '202401') not in tasks
+    assert ('11110', '202405') in tasks
+    assert {('26350', month) for month in recent_months(6, TODAY)} <= tasks
+    assert plan['reasons'] == {'stored': 1, 'mutable': 1, 'missing': 10}
+    assert plan['regions'] == 2
+
+
+def test_settled_empty_months_are_stored():
+    """마감 이후 0건으로 조회된 달만 저장된 달로 보고, 마감 전 0건 기록은 다시 수집"""
+    planner = _planner()
+    ledger = EmptyMonths({
+        ('26350', '202401'): date(2024, 6, 1),    # 마감(1/31 + 60일) 이후 조회
+        ('26350', '202403'): date(2024, 4, 10),   # 마감 전 조회
+        ('26350', '202406'): date(2024, 6, 14),   # 이번 달
+    })
+    plan = planner.plan(['26350'], 6, incremental=True, today=TODAY, ledger=ledger)
+    assert ('26350', '202401') not in plan['tasks']
+    assert ('26350', '202403') in plan['tasks'] and ('26350', '202406') in plan['tasks']
+    assert plan['reasons'] == {'stored': 1, 'missing': 5}
+
+    # 원장 없이 계획하면 기존처럼 모두 수집
+    assert planner.plan(['26350'], 6, incremental=True, today=TODAY)['reasons'] == {'missing': 6}
+
+
+def test_log_plan_without_months():
+    planner = _planner()
+    for plan in (planner.plan(['11110'], 0, today=TODAY), planner.plan([], 3, today=TODAY)):
+        assert planner.log_plan(plan) is plan
+        assert plan['tasks'] == [] and plan['estimated_calls'] == 0
+
+
+if __name__ == '__main__':
+    setup_module()
+    try:
+        test_recent_months()
+        test_plan_reasons()
+        test_settled_empty_months_are_stored()
+        test_log_plan_without_months()
+    finally:
+        teardown_module()
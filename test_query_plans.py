@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API 라우트 SQL 실행 계획 회귀 테스트
+합성 거래 데이터(기본 100만 건, QUERY_PLAN_TEST_ROWS로 변경)를 넣은 데이터베이스에서
+database.queries / database.aggregates의 모든 라우트 SQL에 EXPLAIN QUERY PLAN을 실행해
+원본 테이블 전체 스캔이나 임시 B-tree 정렬이 나오면 실패
+"""
+
+import os
+import re
+import tempfile
+import time
+from datetime import date, timedelta
+
+from database import aggregates, queries
+from database.connection import close_connections, get_connection
+from database.models import init_db
+
+ROW_COUNT = int(os.environ.get('QUERY_PLAN_TEST_ROWS', 1_000_000))
+
+# 전체 스캔을 허용하지 않는 원본 테이블
+SOURCE_TABLES = ('transactions', 'price_changes')
+
+# 지역당 한 행인 집계 테이블은 지역 수만큼만 읽으므로 스캔 허용
+REGION_TABLES = aggregates.REGION_TABLES
+
+_state = {}
+
+
+# 허용 예외
+#   aggregate_order: 집계 결과(AVG 등)로 정렬하는 순위 쿼리의 ORDER BY 임시 B-tree (그룹 수만큼의 정렬은 불가피)
+#   index_order_limit: ORDER BY ... LIMIT을 인덱스 순서로 처리하는 인덱스 스캔 (LIMIT 건수만 읽고 멈춤)
+#   range_order: 면적/층 범위 인덱스 검색 결과의 최신순 정렬 임시 B-tree (범위 조건 뒤 date는 인덱스 순서 불가)
+AGGREGATE_ORDER = 'aggregate_order'
+INDEX_ORDER_LIMIT = 'index_order_limit'
+RANGE_ORDER = 'range_order'
+
+def _days_ago(*days):
+    today = date.today()
+    return tuple((today - timedelta(days=n)).isoformat() for n in days)
+
+
+def _month_ago(months):
+    today = date.today()
+    index = today.year * 12 + today.month - 1 - months
+    return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+
+def _route_queries():
+    """(이름, SQL, 파라미터, 허용 예외)
+
+    지역/기간 조건과 limit이 모두 없는 /api/transactions는 테이블 전체 내보내기라 제외
+    """
+    return [
+        ('regions', *queries.regions_query(), ()),
+        ('transactions region', *queries.transactions_query('R7'), ()),
+        ('transactions region+period', *queries.transactions_query('R7', *_days_ago(90, 0)), ()),
+        ('transactions period', *queries.transactions_query('', *_days_ago(14, 7)), ()),
+        ('transactions since', *queries.transactions_query('', _days_ago(7)[0]), ()),
+        ('transactions region+dong', *queries.transactions_query('R7', dong='D1', limit=200), ()),
+        ('transactions region+area+floor',
+         *queries.transactions_query('R7', *_days_ago(365, 0), min_area=60, max_area=85, min_floor=5, max_floor=15,
+                                     limit=200), ()),
+        ('transactions dong', *queries.transactions_query(dong='D1', limit=200), ()),
+        ('transactions area', *queries.transactions_query(min_area=80, max_area=90, limit=200), (RANGE_ORDER,)),
+        ('transactions area+floor',
+         *queries.transactions_query(min_area=60, max_area=85, min_floor=5, max_floor=15, limit=200), (RANGE_ORDER,)),
+        ('transactions floor', *queries.transactions_query(min_floor=5, max_floor=15, limit=200), (RANGE_ORDER,)),
+        ('price changes region', *queries.price_changes_query('R7', 30), ()),
+        ('price changes', *queries.price_changes_query('', 30), (INDEX_ORDER_LIMIT,)),
+        ('statistics region', *queries.statistics_query('R7'), ()),
+        ('statistics', *queries.statistics_query(), ()),
+        ('recent price change', *queries.recent_price_change_query(), ()),
+        ('apartment rankings region', *queries.apartment_rankings_query('R7', 90), (AGGREGATE_ORDER,)),
+        ('apartment rankings region month', *queries.apartment_rankings_query('R7', month=_month_ago(1)),
+         (AGGREGATE_ORDER,)),
+        ('apartment rankings', *queries.apartment_rankings_query('', 90), (AGGREGATE_ORDER,)),
+        ('apartment rankings month', *queries.apartment_rankings_query('', month=_month_ago(1)), (AGGREGATE_ORDER,)),
+        ('volume rankings', queries.VOLUME_RANKINGS_SQL, (20,), ()),
+        ('price rankings', queries.PRICE_RANKINGS_SQL, (20,), ()),
+        ('price change rankings', queries.PRICE_CHANGE_RANKINGS_SQL, (20,), ()),
+        ('market overview', queries.MARKET_OVERVIEW_SQL, (), ()),
+    ]
+
+
+def setup_module(module=None):
+    """합성 데이터베이스 생성 (지역 250개 × 단지 40개, 오늘부터 3년 전까지의 거래일)"""
+    _state['tmpdir'] = tempfile.TemporaryDirectory()
+    _state['previous_path'] = os.environ.get('DATABASE_PATH')
+    os.environ['DATABASE_PATH'] = os.path.join(_state['tmpdir'].name, 'query_plans.db')
+    init_db()
+
+    started = time.perf_counter()
+    conn = get_connection()
+    with conn:
+        conn.execute('''
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+            INSERT INTO transactions (date, region_name, complex_name, transaction_count, avg_price, source,
+                                      latest_transaction_date, region_code, area, floor, jibun, dong)
+            SELECT date('now', '-' || (n * 7919 % 1095) || ' days'),
+                   'R' || (n % 250),
+                   'C' || (n * 31 % 40),
+                   1,
+                   10000 + (n * 104729 % 200000),
+                   'molit_api',
+                   date('now', '-' || (n * 7919 % 1095) || ' days'),
+                   'R' || (n % 250),
+                   59 + (n % 3) * 25,
+                   n % 30,
+                   CAST(n AS TEXT),
+                   'D' || (n * 13 % 20)
+            FROM seq
+        ''', (ROW_COUNT,))
+        conn.execute('''
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+            INSERT INTO price_changes (date, region_name, avg_price, price_change_rate)
+            SELECT date('now', '-' || (n % 1095) || ' days'), 'R' || (n % 250),
+                   10000 + n % 5000, (n % 200 - 100) / 10.0
+            FROM seq
+        ''', (ROW_COUNT // 10,))
+    conn.execute('ANALYZE')
+    print(f"합성 데이터 {ROW_COUNT:,}건 생성: {time.perf_counter() - started:.1f}초")
+
+
+def teardown_module(module=None):
+    close_connections()
+    if _state.get('previous_path') is None:
+        os.environ.pop('DATABASE_PATH', None)
+    else:
+        os.environ['DATABASE_PATH'] = _state['previous_path']
+    _state['tmpdir'].cleanup()
+
+
+def plan_problems(details, allowed=()):
+    """실행 계획 detail 목록에서 문제 항목만 반환"""
+    problems = []
+    for detail in details:
+        scan = re.match(r'SCAN (\w+)( USING (COVERING )?INDEX)?', detail)
+        if scan:
+            table, using_index = scan.group(1), scan.group(2)
+            if table in REGION_TABLES:
+                continue
+            if table in SOURCE_TABLES and using_index and INDEX_ORDER_LIMIT in allowed:
+                continue
+            problems.append(detail)
+        elif 'USE TEMP B-TREE' in detail:
+            order_allowed = AGGREGATE_ORDER in allowed or RANGE_ORDER in allowed
+            if not (order_allowed and detail == 'USE TEMP B-TREE FOR ORDER BY'):
+                problems.append(detail)
+    return problems
+
+
+def test_route_query_plans():
+    """모든 라우트 SQL이 인덱스/집계 테이블만으로 실행되는지 확인"""
+    conn = get_connection(readonly=True)
+    failures = []
+    for name, sql, params, allowed in _route_queries():
+        details = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', tuple(params)).fetchall()]
+        problems = plan_problems(details, allowed)
+        print(f"{'❌' if problems else '✅'} {name}: {' / '.join(details)}")
+        if problems:
+            failures.append(f"{name}: {problems}")
+    assert not failures, '\n'.join(failures)
+
+
+def test_route_queries_run():
+    """라우트 SQL이 합성 데이터에서 결과를 반환하는지 확인 (인덱스만 쓰고 결과가 빈 쿼리 방지)"""
+    conn = get_connection(readonly=True)
+    for name, sql, params, _ in _route_queries():
+        rows = conn.execute(sql, tuple(params)).fetchall()
+        assert rows and rows[0][0] is not None, name
+
+
+if __name__ == '__main__':
+    setup_module()
+    try:
+        test_route_query_plans()
+        test_route_queries_run()
+    finally:
+        teardown_module()
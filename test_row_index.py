@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+행 인덱스 페이지네이션 테스트
+작은 지역별 거래 데이터로 RowIndex를 끝까지 페이지 조회해 (전체/지역/기간 필터) 중복이나 누락이 없는지 확인하고,
+/api/integrated-data-chunked 커서가 데이터 파일이 바뀐 뒤에는 409를 반환하는지 확인
+"""
+
+import json
+import os
+import tempfile
+
+from services.row_index import RowIndex, decode_cursor, encode_cursor
+
+_state = {}
+
+
+def _fixture():
+    """지역 3개(빈 지역 포함) + 목록이 아닌 값, 같은 거래일이 여러 건인 행"""
+    regions = {}
+    row_id = 0
+    for name, count in (('서울 강남구', 23), ('부산 해운대구', 0), ('대구 수성구', 17), ('인천 연수구', 9)):
+        rows = []
+        for i in range(count):
+            row_id += 1
+            rows.append({'id': row_id, 'date': f"2024-{i % 6 + 1:02d}-{i % 3 * 10 + 1:02d}", 'region_name': name})
+        regions[name] = rows
+    regions['metadata'] = {'note': '목록이 아닌 값은 건너뜀'}
+    return regions
+
+
+def _page_all(index, limit, **filters):
+    """offset을 늘려가며 빈 페이지가 나올 때까지 조회"""
+    rows = []
+    offset = 0
+    while True:
+        page = index.page(offset, limit, **filters)
+        if not page:
+            return rows
+        assert len(page) <= limit
+        rows.extend(page)
+        offset += len(page)
+
+
+def test_page_unfiltered_exhaustive():
+    """필터 없이 끝까지 조회하면 원본 순서 그대로 모든 행이 한 번씩 나옴"""
+    regions = _fixture()
+    index = RowIndex(regions)
+    expected = [row['id'] for rows in regions.values() if isinstance(rows, list) for row in rows]
+    assert index.count() == len(expected) == 49
+    for limit in (1, 4, 7, 49, 100):
+        assert [row['id'] for row in _page_all(index, limit)] == expected, limit
+
+    for name in ('서울 강남구', '부산 해운대구', '인천 연수구'):
+        assert [row['id'] for row in _page_all(index, 5, region=name)] == [row['id'] for row in regions[name]]
+    assert index.page(index.count(), 10) == []
+
+
+def test_page_date_filtered_exhaustive():
+    """기간 필터로 끝까지 조회하면 범위 안의 행만 최신순으로 한 번씩 나옴 (end_date 당일 포함)"""
+    regions = _fixture()
+    index = RowIndex(regions)
+    all_rows = [row for rows in regions.values() if isinstance(rows, list) for row in rows]
+    for region, start_date, end_date in ((None, '2024-02-01', '2024-04-11'), (None, '2024-03-21', ''),
+                                         (None, '', '2024-01-01'), ('대구 수성구', '2024-02-11', '2024-05-21'),
+                                         (None, '2025-01-01', '')):
+        expected = [row for row in all_rows
+                    if (region is None or row['region_name'] == region)
+                    and (not start_date or row['date'] >= start_date) and (not end_date or row['date'] <= end_date)]
+        filters = {'region': region, 'start_date': start_date, 'end_date': end_date}
+        assert index.count(**filters) == len(expected)
+        for limit in (1, 3, 10):
+            ids = [row['id'] for row in _page_all(index, limit, **filters)]
+            assert len(ids) == len(set(ids)), (filters, limit)
+            assert sorted(ids) == sorted(row['id'] for row in expected), (filters, limit)
+            dates = [row['date'] for row in _page_all(index, limit, **filters)]
+            assert dates == sorted(dates, reverse=True)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor('v1', 40, '서울 강남구', '2024-01-01', '2024-03-31')
+    assert decode_cursor(cursor) == {'version': 'v1', 'offset': 40, 'region': '서울 강남구',
+                                     'start_date': '2024-01-01', 'end_date': '2024-03-31'}
+    for bad in ('', 'not-a-cursor', encode_cursor('v1', 0)[:-3]):
+        try:
+            decode_cursor(bad)
+        except ValueError:
+            continue
+        raise AssertionError(bad)
+
+
+def setup_module(module=None):
+    """임시 데이터 디렉터리/데이터베이스로 앱 로드"""
+    _state['tmpdir'] = tempfile.TemporaryDirectory()
+    _state['previous_path'] = os.environ.get('DATABASE_PATH')
+    os.environ['DATABASE_PATH'] = os.path.join(_state['tmpdir'].name, 'row_index.db')
+    import app as app_module
+    _state['app'] = app_module
+    _state['previous_data_dir'] = app_module.DATA_DIR
+    app_module.DATA_DIR = _state['tmpdir'].name
+    _write_dataset(_fixture())
+
+
+def teardown_module(module=None):
+    from database.connection import close_connections
+    _state['app'].DATA_DIR = _state['previous_data_dir']
+    close_connections()
+    if _state.get('previous_path') is None:
+        os.environ.pop('DATABASE_PATH', None)
+    else:
+        os.environ['DATABASE_PATH'] = _state['previous_path']
+    _state['tmpdir'].cleanup()
+
+
+def _write_dataset(regions):
+    path = os.path.join(_state['tmpdir'].name, 'all_cities_integrated_data.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'data': regions, 'metadata': {}}, f, ensure_ascii=False)
+
+
+def _get_chunk(client, **params):
+    response = client.get('/api/integrated-data-chunked', query_string=params)
+    return response.status_code, response.get_json()
+
+
+def test_chunked_route_cursor_and_dataset_change():
+    """커서로 끝까지 조회하면 모든 행이 한 번씩 나오고, 데이터 파일이 바뀐 뒤의 커서는 409"""
+    regions = _fixture()
+    client = _state['app'].app.test_client()
+
+    ids = []
+    status, body = _get_chunk(client, chunk_size=6)
+    while True:
+        assert status == 200, body
+        ids.extend(row['id'] for row in body['data'])
+        cursor = body['pagination']['next_cursor']
+        if cursor is None:
+            break
+        status, body = _get_chunk(client, chunk_size=6, cursor=cursor)
+    assert ids == [row['id'] for rows in regions.values() if isinstance(rows, list) for row in rows]
+
+    status, body = _get_chunk(client, chunk_size=6)
+    cursor = body['pagination']['next_cursor']
+    version = body['pagination']['snapshot_version']
+
+    regions['서울 강남구'].append({'id': 999, 'date': '2024-07-01', 'region_name': '서울 강남구'})
+    _write_dataset(regions)
+    status, body = _get_chunk(client, chunk_size=6, cursor=cursor)
+    assert status == 409, body
+    assert body['snapshot_version'] != version
+
+    status, body = _get_chunk(client, chunk_size=6, cursor='not-a-cursor')
+    assert status == 400
+
+
+if __name__ == '__main__':
+    test_page_unfiltered_exhaustive()
+    test_page_date_filtered_exhaustive()
+    test_cursor_round_trip()
+    setup_module()
+    try:
+        test_chunked_route_cursor_and_dataset_change()
+    finally:
+        teardown_module()
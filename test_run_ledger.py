@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+수집 실행 원장 재개 테스트
+API 호출을 대신하는 가짜 페이지 조회로 일부 페이지가 실패한 실행을 다시 열어,
+실패한 페이지만 다시 호출하고 완료된 페이지는 원장에서 읽어 같은 결과를 재조립하는지 확인
+"""
+
+import os
+import tempfile
+
+from crawlers.molit_api_crawler import MAX_NUM_OF_ROWS, MolitAPICrawler
+from crawlers.service_keys import ServiceKeyPool
+from services.run_ledger import RunLedger
+
+# (지역 코드, 거래년월) -> 전체 건수 (2,500건이면 3페이지)
+TOTALS = {('11110', '202401'): 2500, ('11110', '202402'): 0, ('26350', '202401'): 10}
+
+
+def _page(region_code, deal_date, page_no):
+    total = TOTALS[(region_code, deal_date)]
+    start = (page_no - 1) * MAX_NUM_OF_ROWS
+    return [{'id': f'{region_code}-{deal_date}-{i}', 'date': f'{deal_date[:4]}-{deal_date[4:]}-01'}
+            for i in range(start, min(total, start + MAX_NUM_OF_ROWS))], total
+
+
+class FakeFetch:
+    """fetch_page 대체 (failing에 든 페이지는 호출 실패로 응답)"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def __call__(self, region_code, deal_date, page_no=1, num_of_rows=MAX_NUM_OF_ROWS):
+        self.calls.append((region_code, deal_date, page_no))
+        if (region_code, deal_date, page_no) in self.failing:
+            return [], None
+        return _page(region_code, deal_date, page_no)
+
+
+def _crawler(ledger, run_id, fetch, usage_path):
+    crawler = MolitAPICrawler()
+    crawler.fetch_page = fetch
+    crawler.key_pool = ServiceKeyPool('TESTLEDGER', [('test-key', 100)], usage_path)
+    crawler.use_ledger(ledger, run_id)
+    return crawler
+
+
+def test_resume_fetches_only_unfinished_pages():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        usage_path = os.path.join(tmpdir, 'usage.db')
+        ledger = RunLedger(os.path.join(tmpdir, 'ledger.db'))
+        tasks = list(TOTALS)
+
+        run_id = ledger.open_run('test')
+        first = FakeFetch(failing={('11110', '202401', 2)})
+        partial = _crawler(ledger, run_id, first, usage_path).crawl_tasks(tasks)
+        assert len(partial['11110']) == 1500
+        assert ledger.unfinished_tasks(run_id) == [('11110', '202401', 2, 'failed')]
+        assert not ledger.finish_run(run_id)
+
+        # 같은 이름으로 다시 열면 미완료 실행을 이어서 사용
+        assert ledger.open_run('test') == run_id
+        second = FakeFetch()
+        resumed = _crawler(ledger, run_id, second, usage_path).crawl_tasks(tasks)
+        assert second.calls == [('11110', '202401', 2)]
+        for region_code in ('11110', '26350'):
+            expected = sorted(f'{region_code}-{deal_date}-{i}' for (code, deal_date), total in TOTALS.items()
+                              if code == region_code for i in range(total))
+            assert sorted(row['id'] for row in resumed[region_code]) == expected
+
+        # 모두 완료되면 실행 종료, 다음에는 새 실행
+        assert ledger.finish_run(run_id)
+        assert ledger.summary(run_id)['done'] == 5
+        assert ledger.open_run('test') != run_id
+
+        # 0건으로 끝난 달은 실행 정리와 무관하게 기록
+        assert set(ledger.empty_months(['11110', '26350'])) == {('11110', '202402')}
+
+
+if __name__ == '__main__':
+    test_resume_fetches_only_unfinished_pages()
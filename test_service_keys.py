@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+서비스 키 풀 테스트
+환경 변수 파싱, 남은 한도 기준 키 배정, 한도 초과/미등록 키 제외, 실행 간 사용량 누적을 임시 사용량 파일로 확인
+"""
+
+import os
+import tempfile
+
+from crawlers.service_keys import (MissingServiceKeyError, QuotaExhaustedError, ServiceKeyPool, keys_from_env,
+                                   parse_keys)
+
+QUOTA_RESPONSE = '<OpenAPI_ServiceResponse><returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR' \
+                 '</returnAuthMsg></OpenAPI_ServiceResponse>'
+INVALID_RESPONSE = '<OpenAPI_ServiceResponse><returnAuthMsg>SERVICE_KEY_IS_NOT_REGISTERED_ERROR' \
+                   '</returnAuthMsg></OpenAPI_ServiceResponse>'
+
+ENV_NAMES = ('TESTPOOL_SERVICE_KEYS', 'TESTPOOL_SERVICE_KEY_DECODED', 'TESTPOOL_DAILY_LIMIT')
+
+
+def _with_env(values, func):
+    previous = {name: os.environ.pop(name, None) for name in ENV_NAMES}
+    os.environ.update(values)
+    try:
+        return func()
+    finally:
+        for name in ENV_NAMES:
+            os.environ.pop(name, None)
+            if previous[name] is not None:
+                os.environ[name] = previous[name]
+
+
+def test_parse_keys():
+    assert parse_keys(' a, b:5 ,,c:', 100) == [('a', 100), ('b', 5), ('c', 100)]
+
+
+def test_missing_keys_fail_clearly():
+    """키 환경 변수가 없으면 변수 이름을 담은 MissingServiceKeyError (지연 생성한 풀은 첫 호출 때)"""
+    def check():
+        for create in (lambda: ServiceKeyPool.from_env('TESTPOOL'), lambda: ServiceKeyPool('TESTPOOL').acquire()):
+            try:
+                create()
+            except MissingServiceKeyError as e:
+                assert 'TESTPOOL_SERVICE_KEYS' in str(e)
+            else:
+                raise AssertionError('MissingServiceKeyError가 발생하지 않음')
+    _with_env({}, check)
+    assert _with_env({'TESTPOOL_SERVICE_KEY_DECODED': 'only', 'TESTPOOL_DAILY_LIMIT': '7'},
+                     lambda: keys_from_env('TESTPOOL')) == [('only', 7)]
+    assert _with_env({'TESTPOOL_SERVICE_KEYS': 'a,b:3', 'TESTPOOL_SERVICE_KEY_DECODED': 'only'},
+                     lambda: keys_from_env('TESTPOOL')) == [('a', 10000), ('b', 3)]
+
+
+def test_acquire_balances_and_exhausts():
+    """남은 한도가 가장 많은 키부터 배정하고, 모든 한도를 쓰면 QuotaExhaustedError"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pool = ServiceKeyPool('TESTPOOL', [('a', 3), ('b', 1)], os.path.join(tmpdir, 'usage.db'))
+        # 남은 한도가 같으면 먼저 등록한 키
+        assert [pool.acquire() for _ in range(4)] == ['a', 'a', 'a', 'b']
+        try:
+            pool.acquire()
+        except QuotaExhaustedError:
+            pass
+        else:
+            raise AssertionError('QuotaExhaustedError가 발생하지 않음')
+        assert pool.stats()['remaining'] == 0
+        # 임시 디렉터리를 지우기 전에 기록 (종료 시 flush가 지워진 파일에 쓰지 않도록)
+        pool.flush()
+
+
+def test_report_and_usage_persist_across_runs():
+    """한도 초과 키는 같은 날 다른 실행에서도 제외되고, 미등록 키는 이번 실행에서만 제외"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        usage_path = os.path.join(tmpdir, 'usage.db')
+        pool = ServiceKeyPool('TESTPOOL', [('a', 100), ('b', 50), ('c', 10)], usage_path)
+        key = pool.acquire()
+        assert key == 'a'
+        assert pool.report(key, 200, QUOTA_RESPONSE) == 'quota'
+        assert pool.report('b', 200, INVALID_RESPONSE) == 'invalid'
+        assert pool.report('c', 200, '<response><resultCode>000</resultCode></response>') is None
+        assert {pool.acquire() for _ in range(5)} == {'c'}
+        pool.flush()
+
+        rerun = ServiceKeyPool('TESTPOOL', [('a', 100), ('b', 50), ('c', 10)], usage_path)
+        stats = rerun.stats()
+        assert [entry['state'] for entry in stats['keys']] == ['exhausted', 'ok', 'ok']
+        assert [entry['used'] for entry in stats['keys']] == [1, 0, 5]
+        assert stats['remaining'] == 50 + 5
+
+
+if __name__ == '__main__':
+    test_parse_keys()
+    test_missing_keys_fail_clearly()
+    test_acquire_balances_and_exhausts()
+    test_report_and_usage_persist_across_runs()